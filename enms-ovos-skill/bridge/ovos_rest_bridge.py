@@ -10,13 +10,20 @@ It's a thin proxy that lets the portal communicate with OVOS.
 """
 
 import asyncio
+import itertools
 import logging
-from typing import Dict, Any, Optional
+import os
+import re
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 import uvicorn
@@ -25,13 +32,57 @@ from ovos_bus_client.client import MessageBusClient
 from ovos_bus_client.message import Message
 from ovos_utils.log import LOG
 
-# Configure logging
+# libuv event loop and C HTTP parser (optional, provided by uvicorn[standard];
+# uvloop does not support Windows)
+try:
+    import uvloop  # noqa: F401
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+try:
+    import httptools  # noqa: F401
+    HTTPTOOLS_AVAILABLE = True
+except ImportError:
+    HTTPTOOLS_AVAILABLE = False
+
+# Fast JSON responses (optional)
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse
+except ImportError:
+    ORJSONResponse = JSONResponse
+
+# Configure logging (LOG_LEVEL=WARNING silences the per-query INFO lines)
 logging.basicConfig(
-    level=logging.INFO,
+    level=getattr(logging, os.getenv("LOG_LEVEL", "INFO").upper(), logging.INFO),
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
 
+# Matched against the lowercased query / accumulated speech
+REPORT_QUERY_PATTERN = re.compile(r'report|generate|create')
+REPORT_CONFIRMATION_PATTERN = re.compile(r'downloaded|check your downloads|ready and')
+
+# (tick, formatted) - response timestamps are reformatted at most every 100ms
+_timestamp_cache: List[Any] = [None, ""]
+
+
+def _utc_timestamp() -> str:
+    """
+    UTC ISO-8601 timestamp for response bodies
+    
+    Formatting a datetime per response adds up on /health polling; responses
+    within the same 100ms tick share one string. Refreshed lazily on use, so
+    an idle bridge has no timer waking it.
+    """
+    tick = time.monotonic_ns() // 100_000_000
+    if _timestamp_cache[0] != tick:
+        _timestamp_cache[0] = tick
+        _timestamp_cache[1] = datetime.utcnow().isoformat()
+    return _timestamp_cache[1]
+
+
 # Pydantic models
 class QueryRequest(BaseModel):
     text: str = Field(..., description="User query text")
@@ -59,10 +110,26 @@ class OVOSRestBridge:
     
     def __init__(self):
         self.bus: Optional[MessageBusClient] = None
+        
+        # Extra emit-only connections for burst traffic. Replies are broadcast
+        # to every client, so handlers live on self.bus alone - registering
+        # them on the extras would deliver each speak N times.
+        self.bus_pool_size = max(1, int(os.getenv("OVOS_BUS_POOL_SIZE", "1")))
+        self._emit_buses: List[MessageBusClient] = []
+        self._emit_cycle = None
         self.responses: Dict[str, Dict[str, Any]] = {}
         self.pdf_downloads: Dict[str, Dict[str, Any]] = {}  # NEW: Track PDF downloads
         self.response_timeout = 90  # seconds (increased for ML baseline operations)
         
+        # Recent answers: (text, user_id) -> (stored_at, response_data).
+        # Repeated questions skip the messagebus round trip; reports are never
+        # cached since generating one has side effects. 0 disables.
+        self.cache_ttl = float(os.getenv("OVOS_BRIDGE_CACHE_TTL", "30"))
+        self.cache_max_entries = 256
+        self._response_cache: "OrderedDict[Tuple[str, str], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        
     def connect_to_messagebus(self):
         """Connect to OVOS messagebus"""
         try:
@@ -75,38 +142,64 @@ class OVOSRestBridge:
             
             # Start messagebus client in background thread
             self.bus.run_in_thread()
-            logger.info("✅ Connected to OVOS messagebus")
+            
+            extra_buses = [MessageBusClient() for _ in range(self.bus_pool_size - 1)]
+            for extra_bus in extra_buses:
+                extra_bus.run_in_thread()
+            self._emit_buses = [self.bus, *extra_buses]
+            self._emit_cycle = itertools.cycle(self._emit_buses)
+            logger.info(f"✅ Connected to OVOS messagebus (emit pool: {self.bus_pool_size})")
             
         except Exception as e:
             logger.error(f"❌ Failed to connect to messagebus: {e}")
             raise
     
+    def _emit(self, message: Message):
+        """Emit on the next connected bus in the pool (falls back to the primary)"""
+        for _ in range(len(self._emit_buses)):
+            bus = next(self._emit_cycle)
+            if bus.connected_event.is_set():
+                bus.emit(message)
+                return
+        self.bus.emit(message)
+    
+    def close(self):
+        """Close every messagebus connection"""
+        for bus in self._emit_buses or [self.bus]:
+            if bus:
+                bus.close()
+    
     def _handle_speak(self, message: Message):
         """Handle speak messages from skills"""
         session_id = message.context.get('session_id', 'default')
         utterance = message.data.get('utterance', '')
         
-        if session_id in self.responses:
+        # Single lookup: process_query may drop the tracker concurrently
+        tracker = self.responses.get(session_id)
+        if tracker:
             # Append responses (skill speaks twice for reports: initial + confirmation)
-            if self.responses[session_id]['response']:
-                self.responses[session_id]['response'] += f" {utterance}"
+            if tracker['response']:
+                tracker['response'] += f" {utterance}"
             else:
-                self.responses[session_id]['response'] = utterance
-            self.responses[session_id]['received'] = True
-            logger.debug(f"Received speak for session {session_id}: {utterance[:50]}...")
+                tracker['response'] = utterance
+            tracker['received'] = True
+            self._notify(session_id)
+            logger.debug("Received speak for session %s: %s...", session_id, utterance[:50])
     
     def _handle_skill_response(self, message: Message):
         """Handle structured responses from EnmsSkill"""
         session_id = message.context.get('session_id', 'default')
         
-        if session_id in self.responses:
-            self.responses[session_id].update({
+        tracker = self.responses.get(session_id)
+        if tracker:
+            tracker.update({
                 'intent': message.data.get('intent'),
                 'confidence': message.data.get('confidence'),
                 'data': message.data.get('data'),
                 'received': True
             })
-            logger.debug(f"Received skill response for session {session_id}")
+            self._notify(session_id)
+            logger.debug("Received skill response for session %s", session_id)
     
     def _handle_pdf_download(self, message: Message):
         """
@@ -115,6 +208,10 @@ class OVOSRestBridge:
         Captures report_id, download_url, filename for browser download
         """
         session_id = message.context.get('session_id', 'default')
+        if session_id not in self.responses:
+            # Nobody is waiting (timed out or not ours) - don't keep it around
+            logger.debug("Ignoring PDF event for inactive session %s", session_id)
+            return
         
         pdf_data = {
             'report_id': message.data.get('report_id'),
@@ -125,7 +222,58 @@ class OVOSRestBridge:
         }
         
         self.pdf_downloads[session_id] = pdf_data
-        logger.info(f"📄 PDF download ready for session {session_id}: {pdf_data.get('filename')} ({pdf_data.get('file_size_kb')} KB)")
+        self._notify(session_id, 'pdf_event')
+        self._notify(session_id)
+        logger.info("📄 PDF download ready for session %s: %s (%s KB)",
+                    session_id, pdf_data.get('filename'), pdf_data.get('file_size_kb'))
+    
+    def _release(self, session_id: str, tracker: Dict[str, Any]):
+        """Drop a finished query's tracker and PDF slot (unless a newer query took the session)"""
+        if self.responses.get(session_id) is tracker:
+            del self.responses[session_id]
+            self.pdf_downloads.pop(session_id, None)
+    
+    def _notify(self, session_id: str, event: str = 'event'):
+        """
+        Wake the process_query waiting on this session
+        
+        Bus handlers run in the messagebus thread, so the event is set on the
+        request's own loop.
+        """
+        tracker = self.responses.get(session_id)
+        if tracker:
+            tracker['loop'].call_soon_threadsafe(tracker[event].set)
+    
+    def _cache_get(self, key: Tuple[str, str]) -> Optional[Dict[str, Any]]:
+        """Fresh cached response data for key, or None"""
+        entry = self._response_cache.get(key)
+        if entry and time.monotonic() - entry[0] < self.cache_ttl:
+            self._response_cache.move_to_end(key)
+            self.cache_hits += 1
+            return entry[1]
+        if entry:
+            del self._response_cache[key]
+        self.cache_misses += 1
+        return None
+    
+    def _cache_put(self, key: Tuple[str, str], response_data: Dict[str, Any]):
+        """Store response data, evicting the least recently used entry when full"""
+        self._response_cache[key] = (time.monotonic(), response_data)
+        self._response_cache.move_to_end(key)
+        if len(self._response_cache) > self.cache_max_entries:
+            self._response_cache.popitem(last=False)
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Response cache counters for the /cache/stats endpoint"""
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            'enabled': self.cache_ttl > 0,
+            'ttl_seconds': self.cache_ttl,
+            'entries': len(self._response_cache),
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'hit_rate': round(self.cache_hits / lookups, 3) if lookups else 0.0
+        }
     
     async def process_query(self, text: str, session_id: str, user_id: Optional[str] = None) -> QueryResponse:
         """
@@ -138,16 +286,41 @@ class OVOSRestBridge:
         # Question marks, periods, exclamation marks can prevent intent matching
         cleaned_text = text.rstrip('?!.,;:')
         if cleaned_text != text:
-            logger.info(f"🧹 Stripped punctuation: '{text}' → '{cleaned_text}'")
+            logger.info("🧹 Stripped punctuation: '%s' → '%s'", text, cleaned_text)
+        
+        # Detect if this is a report generation query (needs longer wait for PDF)
+        lower_text = cleaned_text.lower()
+        is_report_query = REPORT_QUERY_PATTERN.search(lower_text) is not None
+        
+        cache_key = (lower_text, user_id or 'anonymous')
+        use_cache = self.cache_ttl > 0 and not is_report_query
+        if use_cache:
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                logger.info("⚡ Cache hit for '%s' (session: %s)", cleaned_text, session_id)
+                return QueryResponse(
+                    success=True,
+                    response=cached['response'],
+                    intent=cached.get('intent'),
+                    confidence=cached.get('confidence'),
+                    data=cached.get('data'),
+                    timestamp=_utc_timestamp(),
+                    session_id=session_id
+                )
         
         # Initialize response tracker
-        self.responses[session_id] = {
+        loop = asyncio.get_running_loop()
+        tracker = {
+            'event': asyncio.Event(),
+            'pdf_event': asyncio.Event(),  # set once, never cleared
+            'loop': loop,
             'response': '',
             'intent': None,
             'confidence': None,
             'data': None,
             'received': False
         }
+        self.responses[session_id] = tracker
         self.pdf_downloads[session_id] = {'ready': False}  # NEW: Initialize PDF tracker
         
         try:
@@ -164,58 +337,65 @@ class OVOSRestBridge:
                 context=context
             )
             
-            self.bus.emit(message)
-            logger.info(f"📤 Sent query to messagebus: '{cleaned_text}' (session: {session_id})")
+            # The bus client's websocket send blocks; keep it off the event loop
+            await asyncio.to_thread(self._emit, message)
+            logger.info("📤 Sent query to messagebus: '%s' (session: %s)", cleaned_text, session_id)
             
-            # Detect if this is a report generation query (needs longer wait for PDF)
-            is_report_query = any(kw in cleaned_text.lower() for kw in ['report', 'generate', 'create'])
             min_wait_time = 15.0 if is_report_query else 5.0  # Reports need at least 15s
-            logger.info(f"⏱️ Query type: {'REPORT' if is_report_query else 'NORMAL'}, min_wait={min_wait_time}s")
-            print(f"🐛 DEBUG: is_report_query={is_report_query}, min_wait={min_wait_time}s", flush=True)
+            logger.info("⏱️ Query type: %s, min_wait=%ss",
+                        'REPORT' if is_report_query else 'NORMAL', min_wait_time)
             
-            # Wait for response with timeout
-            start_time = asyncio.get_event_loop().time()
-            last_check_time = start_time
+            # Wait for response with timeout - bus handlers set the event, so
+            # completion is re-checked only when something actually arrived
+            start_time = loop.time()
+            deadline = start_time + self.response_timeout
             
-            while asyncio.get_event_loop().time() - start_time < self.response_timeout:
-                current_time = asyncio.get_event_loop().time()
+            while True:
+                # Clear before checking so a message landing mid-check still wakes us
+                tracker['event'].clear()
+                wait_until = deadline
                 
-                # Check every second if we have response AND if we should continue waiting
-                if current_time - last_check_time > 1.0:
-                    if self.responses[session_id]['received']:
-                        # Got at least one speak message
-                        response_text = self.responses[session_id]['response'].lower()
-                        
-                        # Check for completion conditions:
-                        # 1. PDF download event arrived
-                        if self.pdf_downloads.get(session_id, {}).get('ready'):
-                            logger.info(f"✅ PDF event received for session {session_id}")
-                            break
-                        
-                        # 2. Response contains final confirmation keywords
-                        if any(keyword in response_text for keyword in ['downloaded', 'check your downloads', 'ready and']):
-                            logger.info(f"✅ Final confirmation detected in response")
-                            await asyncio.sleep(0.5)  # Small delay to ensure PDF event arrives
-                            break
-                        
-                        # 3. Wait minimum time before giving up (longer for reports)
-                        elapsed = current_time - start_time
-                        if elapsed > min_wait_time:
-                            logger.info(f"⏱️ Timeout after {elapsed:.1f}s (min_wait={min_wait_time}s), returning response")
-                            break
+                if tracker['received']:
+                    # Got at least one speak message - check for completion conditions:
+                    # 1. PDF download event arrived
+                    if self.pdf_downloads.get(session_id, {}).get('ready'):
+                        logger.info("✅ PDF event received for session %s", session_id)
+                        break
+                    
+                    # 2. Response contains final confirmation keywords
+                    if REPORT_CONFIRMATION_PATTERN.search(tracker['response'].lower()):
+                        logger.info("✅ Final confirmation detected in response")
+                        # The skill normally emits the PDF event before speaking;
+                        # give a late one up to 0.5s instead of always sleeping
+                        try:
+                            await asyncio.wait_for(tracker['pdf_event'].wait(), 0.5)
+                        except asyncio.TimeoutError:
+                            pass
+                        break
                     
-                    last_check_time = current_time
-                        
-                await asyncio.sleep(0.1)
+                    # 3. Wait minimum time before giving up (longer for reports)
+                    wait_until = min(start_time + min_wait_time, deadline)
+                
+                remaining = wait_until - loop.time()
+                if remaining <= 0:
+                    if tracker['received']:
+                        logger.info("⏱️ Timeout after %.1fs (min_wait=%ss), returning response",
+                                    loop.time() - start_time, min_wait_time)
+                    break
+                
+                try:
+                    await asyncio.wait_for(tracker['event'].wait(), remaining)
+                except asyncio.TimeoutError:
+                    pass
             
             # Check if we got a response
-            response_data = self.responses[session_id]
+            response_data = tracker
             if not response_data['received']:
-                logger.warning(f"⏱️ Timeout waiting for response (session: {session_id})")
+                logger.warning("⏱️ Timeout waiting for response (session: %s)", session_id)
                 return QueryResponse(
                     success=False,
                     response="Sorry, I didn't receive a response in time. Please try again.",
-                    timestamp=datetime.utcnow().isoformat(),
+                    timestamp=_utc_timestamp(),
                     session_id=session_id
                 )
             
@@ -223,29 +403,35 @@ class OVOSRestBridge:
             pdf_data = None
             if self.pdf_downloads.get(session_id, {}).get('ready'):
                 pdf_data = self.pdf_downloads[session_id]
-                logger.info(f"📄 Including PDF download data in response: {pdf_data.get('filename')}")
+                logger.info("📄 Including PDF download data in response: %s", pdf_data.get('filename'))
             
-            # Clean up
-            del self.responses[session_id]
-            if session_id in self.pdf_downloads:
-                del self.pdf_downloads[session_id]
+            response_text = response_data['response'] or "I received your request but have no response."
+            if use_cache and pdf_data is None and response_data['response']:
+                self._cache_put(cache_key, {
+                    'response': response_text,
+                    'intent': response_data.get('intent'),
+                    'confidence': response_data.get('confidence'),
+                    'data': response_data.get('data')
+                })
             
             return QueryResponse(
                 success=True,
-                response=response_data['response'] or "I received your request but have no response.",
+                response=response_text,
                 intent=response_data.get('intent'),
                 confidence=response_data.get('confidence'),
                 data=response_data.get('data'),
                 pdf_download=pdf_data,  # NEW: Include PDF download info
-                timestamp=datetime.utcnow().isoformat(),
+                timestamp=_utc_timestamp(),
                 session_id=session_id
             )
             
         except Exception as e:
-            logger.error(f"❌ Error processing query: {e}")
-            if session_id in self.responses:
-                del self.responses[session_id]
+            logger.error("❌ Error processing query: %s", e)
             raise HTTPException(status_code=500, detail=str(e))
+        finally:
+            # Every exit - success, timeout, error, client disconnect - frees
+            # the session's tracker and PDF slot
+            self._release(session_id, tracker)
     
     def is_connected(self) -> bool:
         """Check if messagebus is connected"""
@@ -268,18 +454,22 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("🛑 Shutting down OVOS REST Bridge...")
-    if bridge.bus:
-        bridge.bus.close()
+    bridge.close()
 
 
 app = FastAPI(
     title="OVOS EnMS REST Bridge",
     description="REST API gateway to OVOS messagebus for Energy Management System",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
-# CORS middleware
+# Compress large skill data payloads; level 5 keeps CPU cost low
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+# CORS middleware - added last so it is the outermost layer and answers
+# preflight OPTIONS before anything else runs
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # Configure appropriately for production
@@ -292,11 +482,13 @@ app.add_middleware(
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
     """Health check endpoint"""
-    return HealthResponse(
-        status="healthy" if bridge.is_connected() else "unhealthy",
-        messagebus_connected=bridge.is_connected(),
-        timestamp=datetime.utcnow().isoformat()
+    connected = bridge.is_connected()
+    response = HealthResponse(
+        status="healthy" if connected else "unhealthy",
+        messagebus_connected=connected,
+        timestamp=_utc_timestamp()
     )
+    return ORJSONResponse(content=response.model_dump(mode="json"))
 
 
 @app.post("/query", response_model=QueryResponse)
@@ -311,9 +503,10 @@ async def process_query(request: QueryRequest):
     NOTE: /query/voice is an alias for /query (analytics expects this for audio)
     """
     # Generate session ID if not provided
-    session_id = request.session_id or f"session_{datetime.utcnow().timestamp()}"
+    # uuid4, not a timestamp: concurrent requests must never share a tracker
+    session_id = request.session_id or f"session_{uuid.uuid4().hex}"
     
-    logger.info(f"📥 Received query: '{request.text}' (session: {session_id})")
+    logger.info("📥 Received query: '%s' (session: %s)", request.text, session_id)
     
     try:
         response = await bridge.process_query(
@@ -321,15 +514,23 @@ async def process_query(request: QueryRequest):
             session_id=session_id,
             user_id=request.user_id
         )
-        return response
+        # Already a validated QueryResponse - dump once and skip FastAPI's
+        # response_model re-validation and jsonable_encoder pass
+        return ORJSONResponse(content=response.model_dump(mode="json"))
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"❌ Unexpected error: {e}")
+        logger.error("❌ Unexpected error: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@app.get("/cache/stats")
+async def cache_stats():
+    """Response cache hit rate"""
+    return bridge.cache_stats()
+
+
 @app.get("/")
 async def root():
     """Root endpoint with API info"""
@@ -341,20 +542,30 @@ async def root():
         "endpoints": {
             "health": "/health",
             "query": "/query (POST)",
+            "cache_stats": "/cache/stats",
             "docs": "/docs"
         }
     }
 
 
 if __name__ == "__main__":
-    import os
-    
     port = int(os.getenv("OVOS_BRIDGE_PORT", "5000"))
     log_level = os.getenv("LOG_LEVEL", "INFO").lower()
+    loop = "uvloop" if UVLOOP_AVAILABLE else "asyncio"
+    http = "httptools" if HTTPTOOLS_AVAILABLE else "h11"
+    # Each worker process has its own bridge, bus connection and trackers;
+    # the bus broadcasts replies to all of them and only the worker that
+    # sent the query has a tracker for its session
+    workers = max(1, int(os.getenv("OVOS_BRIDGE_WORKERS", "1")))
+    logger.info(f"⚡ Event loop: {loop}, HTTP parser: {http}, workers: {workers}")
     
     uvicorn.run(
-        app,
+        "ovos_rest_bridge:app" if workers > 1 else app,  # workers need an import string
+        app_dir=os.path.dirname(os.path.abspath(__file__)),
         host="0.0.0.0",
         port=port,
-        log_level=log_level
+        log_level=log_level,
+        loop=loop,
+        http=http,
+        workers=workers
     )
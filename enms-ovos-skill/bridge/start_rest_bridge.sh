@@ -11,7 +11,7 @@ echo ""
 source ~/ovos-env/bin/activate
 
 # Install dependencies if needed
-pip install -q fastapi uvicorn pydantic ovos-bus-client 2>/dev/null
+pip install -q fastapi 'uvicorn[standard]' pydantic orjson ovos-bus-client 2>/dev/null
 
 # Get Windows IP for reference
 echo "Your Windows IP (for EnMS config):"
@@ -12,10 +12,12 @@ Usage:
 """
 
 import asyncio
+import concurrent.futures
 import json
 import logging
 import queue
 import sys
+import threading
 import time
 from enum import Enum
 from pathlib import Path
@@ -24,9 +26,24 @@ import numpy as np
 import sounddevice as sd
 import websockets
 import torch
-import vosk
 from vosk import Model, KaldiRecognizer
 
+# Optional: ONNX Runtime runs Silero VAD several times faster than TorchScript
+try:
+    import onnxruntime  # noqa: F401
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+
+# Optional: faster-whisper (CTranslate2, int8) transcribes several times
+# faster than openai-whisper on CPU; openai-whisper is the fallback
+try:
+    import ctranslate2
+    from faster_whisper import WhisperModel
+    FASTER_WHISPER_AVAILABLE = True
+except ImportError:
+    FASTER_WHISPER_AVAILABLE = False
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -42,6 +59,8 @@ DTYPE = 'float32'  # Silero VAD needs float32
 
 # VAD settings
 VAD_THRESHOLD = 0.5  # Speech probability threshold (0.0-1.0)
+ENERGY_GATE_RATIO = 2.0  # Skip Silero on chunks quieter than this x noise floor
+NOISE_FLOOR_ALPHA = 0.01  # EMA rate for tracking the room's noise floor
 
 # Wake word settings
 WAKE_WORDS = ["mycroft", "jarvis", "computer"]
@@ -50,8 +69,9 @@ WAKE_WORDS = ["mycroft", "jarvis", "computer"]
 SILENCE_DURATION = 1.5  # Seconds of silence to end command
 COMMAND_MAX_SECONDS = 10.0  # Max seconds for command recording
 
-# Vosk model path
-VOSK_MODEL_PATH = Path("D:/vosk-model-en-us-0.22")
+# Vosk model path - a small model, since only small (lookahead) models support
+# the runtime wake-word grammar; big models decode the full vocabulary
+VOSK_MODEL_PATH = Path("D:/vosk-model-small-en-us-0.15")
 
 
 class ListenerState(Enum):
@@ -62,26 +82,40 @@ class ListenerState(Enum):
 class WindowsSTTBridge:
     """Silero VAD + Vosk (wake word) + Whisper (commands) STT bridge."""
     
-    def __init__(self, wsl_host: str = "localhost", wsl_port: int = 5678):
+    def __init__(self, wsl_host: str = "localhost", wsl_port: int = 5678,
+                 whisper_device: str = "auto"):
         self.wsl_host = wsl_host
         self.wsl_port = wsl_port
+        self.whisper_device = whisper_device  # auto, cpu or cuda
         self.running = False
         self.ws = None
         
-        # Silero VAD for voice activity detection
+        # Silero VAD for voice activity detection - runs on its own thread,
+        # fed raw blocks by the audio callback
         self.vad_model = None
+        self.vad_queue = queue.Queue()
+        self.vad_thread = None
+        self.noise_floor = 0.0  # RMS of recent non-speech chunks
+        self.vad_skipped = 0  # Chunks rejected by the energy gate
         
         # Vosk for wake word detection
         self.vosk_model = None
         self.vosk_recognizer = None
-        self.audio_queue = queue.Queue()
+        # Speech chunks for Vosk, filled from the VAD thread via the event loop
+        self.audio_queue = asyncio.Queue()
+        self.loop = None
         
-        # Whisper for command transcription
+        # Whisper for command transcription - decoded on its own thread so the
+        # event loop keeps serving the OVOS websocket meanwhile
         self.whisper_model = None
+        self.whisper_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
         
         # State machine
         self.state = ListenerState.WAITING_FOR_WAKE
-        self.command_audio = []
+        # Command audio is written into one buffer sized for the longest
+        # command (plus the block that crosses the limit), reused every time
+        self.command_audio = np.empty(int(COMMAND_MAX_SECONDS * SAMPLE_RATE) + BLOCK_SIZE, dtype=np.int16)
+        self.command_len = 0  # Samples recorded into command_audio
         self.silence_counter = 0  # Count silent frames
         
     def _load_vad_model(self):
@@ -92,10 +126,14 @@ class WindowsSTTBridge:
                 repo_or_dir='snakers4/silero-vad',
                 model='silero_vad',
                 force_reload=False,
-                onnx=False,
+                onnx=ONNX_AVAILABLE,
                 trust_repo=True
             )
-            logger.info("✅ Silero VAD loaded (voice activity detection)")
+            # Silero is tuned for single-threaded inference on 32ms blocks;
+            # extra intra-op threads only add dispatch overhead
+            torch.set_num_threads(1)
+            backend = "ONNX Runtime" if ONNX_AVAILABLE else "TorchScript"
+            logger.info(f"✅ Silero VAD loaded (voice activity detection, {backend})")
         except Exception as e:
             logger.error(f"Failed to load Silero VAD: {e}")
             raise
@@ -104,21 +142,56 @@ class WindowsSTTBridge:
         """Load Vosk model for wake word detection."""
         if not VOSK_MODEL_PATH.exists():
             logger.error(f"Vosk model not found at {VOSK_MODEL_PATH}")
-            logger.error("Download: https://alphacephei.com/vosk/models/vosk-model-en-us-0.22.zip")
+            logger.error("Download: https://alphacephei.com/vosk/models/vosk-model-small-en-us-0.15.zip")
             sys.exit(1)
         
         logger.info(f"Loading Vosk model from {VOSK_MODEL_PATH}")
         self.vosk_model = Model(str(VOSK_MODEL_PATH))
-        self.vosk_recognizer = KaldiRecognizer(self.vosk_model, SAMPLE_RATE)
-        self.vosk_recognizer.SetWords(True)
+        if (VOSK_MODEL_PATH / "graph" / "HCLG.fst").exists():
+            # Static-graph model: Vosk silently ignores the grammar
+            logger.warning("⚠️ This Vosk model has a static graph and ignores the wake-word "
+                           "grammar - every voiced frame runs full-vocabulary decoding. "
+                           "Use a small model such as vosk-model-small-en-us-0.15.")
+        self.vosk_recognizer = self._new_vosk_recognizer()
         logger.info("✅ Vosk model loaded (wake word detection)")
     
+    def _new_vosk_recognizer(self) -> KaldiRecognizer:
+        """
+        Create a Vosk recognizer restricted to the wake words.
+        
+        The grammar shrinks the decoding graph to a handful of words instead of
+        the full vocabulary. Only models with runtime-graph support (the small
+        ones) honor it; _load_vosk_model warns when the model doesn't.
+        """
+        grammar = json.dumps(WAKE_WORDS + ["[unk]"])
+        recognizer = KaldiRecognizer(self.vosk_model, SAMPLE_RATE, grammar)
+        recognizer.SetWords(True)
+        return recognizer
+    
     def _load_whisper_model(self):
         """Load Whisper model for command transcription."""
+        if FASTER_WHISPER_AVAILABLE:
+            device = self.whisper_device
+            if device == "auto":
+                device = "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+            # int8 weights with fp16 activations use the GPU's tensor cores
+            compute_type = "int8_float16" if device == "cuda" else "int8"
+            logger.info(f"Loading faster-whisper 'small' model ({compute_type} on {device})...")
+            try:
+                self.whisper_model = WhisperModel("small", device=device, compute_type=compute_type)
+            except (RuntimeError, ValueError) as e:
+                if device != "cuda":
+                    raise
+                # Out of GPU memory or unsupported card - CPU int8 still works
+                logger.warning(f"Whisper on GPU failed ({e}), falling back to CPU int8")
+                self.whisper_model = WhisperModel("small", device="cpu", compute_type="int8")
+            logger.info("✅ Whisper model loaded (command transcription)")
+            return
         try:
             import whisper
             logger.info("Loading Whisper 'small' model for commands...")
-            self.whisper_model = whisper.load_model("small")
+            device = None if self.whisper_device == "auto" else self.whisper_device
+            self.whisper_model = whisper.load_model("small", device=device)
             logger.info("✅ Whisper model loaded (command transcription)")
         except ImportError:
             logger.error("Whisper not installed! Run: pip install openai-whisper")
@@ -126,24 +199,49 @@ class WindowsSTTBridge:
     
     def _audio_callback(self, indata, frames, time_info, status):
         """
-        Audio callback - processes every chunk with Silero VAD first.
-        Only sends to Vosk if VAD detects speech.
+        Audio callback - hands each chunk to the VAD thread.
+        Kept minimal so the audio driver's thread is never held up by inference.
         """
         if status:
             logger.warning(f"Audio: {status}")
         
-        # Convert to tensor for VAD (already float32)
-        audio_tensor = torch.from_numpy(indata[:, 0].copy())
-        
-        # Get speech probability from VAD
-        speech_prob = self.vad_model(audio_tensor, SAMPLE_RATE).item()
-        
-        # Only process with Vosk if VAD detects speech
-        if speech_prob > VAD_THRESHOLD:
-            # Convert to int16 for Vosk
-            audio_int16 = (indata[:, 0] * 32767).astype(np.int16)
-            self.audio_queue.put(bytes(audio_int16))
-        # else: silence/noise - ignore it (this fixes "the the the" issue!)
+        self.vad_queue.put_nowait(indata[:, 0].copy())
+    
+    def _vad_worker(self):
+        """
+        VAD thread - runs Silero VAD on every chunk, in order.
+        Only sends to Vosk if VAD detects speech.
+        """
+        while self.running:
+            try:
+                chunk = self.vad_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            
+            # Cheap energy gate first: chunks well under the noise floor are
+            # silence, no need to spend a Silero forward pass on them
+            rms = float(np.sqrt(np.dot(chunk, chunk) / len(chunk)))
+            if rms < ENERGY_GATE_RATIO * self.noise_floor:
+                self.vad_skipped += 1
+                self.noise_floor += NOISE_FLOOR_ALPHA * (rms - self.noise_floor)
+                continue
+            
+            # Get speech probability from VAD (chunk is already float32)
+            with torch.inference_mode():
+                speech_prob = self.vad_model(torch.from_numpy(chunk), SAMPLE_RATE).item()
+            
+            # Only process with Vosk if VAD detects speech
+            if speech_prob > VAD_THRESHOLD:
+                # Convert to int16 for Vosk - the chunk is this thread's own
+                # copy, so scale it in place rather than allocating another
+                np.multiply(chunk, 32767, out=chunk)
+                self.loop.call_soon_threadsafe(
+                    self.audio_queue.put_nowait, chunk.astype(np.int16).tobytes()
+                )
+            else:
+                # silence/noise - ignore it (this fixes "the the the" issue!)
+                # but let the noise floor follow the room
+                self.noise_floor += NOISE_FLOOR_ALPHA * (rms - self.noise_floor)
     
     def _check_wake_word(self, text: str) -> bool:
         """Check if text contains wake word."""
@@ -160,15 +258,22 @@ class WindowsSTTBridge:
     
     def _transcribe_whisper(self, audio: np.ndarray) -> str:
         """Transcribe audio using Whisper."""
-        import whisper
-        
         # Convert int16 to float32 normalized [-1, 1]
         audio_float = audio.astype(np.float32) / 32768.0
         
+        if FASTER_WHISPER_AVAILABLE:
+            # beam_size=1 is greedy decoding, same as openai-whisper's default;
+            # the built-in Silero filter drops silent stretches before decoding
+            segments, _ = self.whisper_model.transcribe(
+                audio_float, language="en", beam_size=1,
+                vad_filter=True, vad_parameters={"min_silence_duration_ms": 500}
+            )
+            return "".join(segment.text for segment in segments).strip()
+        
         result = self.whisper_model.transcribe(
             audio_float,
             language="en",
-            fp16=False
+            fp16=self.whisper_model.device.type == "cuda"
         )
         return result["text"].strip()
     
@@ -211,17 +316,19 @@ class WindowsSTTBridge:
             try:
                 # Get audio from queue
                 try:
-                    audio_bytes = self.audio_queue.get(timeout=0.1)
-                except queue.Empty:
+                    audio_bytes = await asyncio.wait_for(self.audio_queue.get(), timeout=0.1)
+                except asyncio.TimeoutError:
                     # No audio - check for silence if we're recording command
                     if self.state == ListenerState.LISTENING_FOR_COMMAND:
                         self.silence_counter += 1
                         
                         # If silent for ~1.5 seconds (15 * 0.1s)
-                        if self.silence_counter > 15 and self.command_audio:
+                        if self.silence_counter > 15 and self.command_len:
                             logger.info("🔇 Silence detected, transcribing...")
-                            full_audio = np.concatenate(self.command_audio)
-                            text = self._transcribe_whisper(full_audio)
+                            full_audio = self.command_audio[:self.command_len]
+                            text = await asyncio.get_running_loop().run_in_executor(
+                                self.whisper_executor, self._transcribe_whisper, full_audio
+                            )
                             
                             if text:
                                 logger.info(f"📝 Command: \"{text}\"")
@@ -230,11 +337,10 @@ class WindowsSTTBridge:
                                 logger.info("❌ No command heard")
                             
                             self.state = ListenerState.WAITING_FOR_WAKE
-                            self.command_audio = []
+                            self.command_len = 0
                             self.silence_counter = 0
                             logger.info("💤 Waiting for wake word...")
                     
-                    await asyncio.sleep(0.01)
                     continue
                 
                 # Got audio - reset silence counter
@@ -258,32 +364,34 @@ class WindowsSTTBridge:
                         if self._check_wake_word(text):
                             # Wake word detected! Switch to command listening
                             self.state = ListenerState.LISTENING_FOR_COMMAND
-                            self.command_audio = []
+                            self.command_len = 0
                             self.silence_counter = 0
                             # Reset Vosk to clear partial buffer
-                            self.vosk_recognizer = vosk.KaldiRecognizer(self.vosk_model, SAMPLE_RATE)
+                            self.vosk_recognizer = self._new_vosk_recognizer()
                             logger.info("👂 Say your command...")
                 
                 elif self.state == ListenerState.LISTENING_FOR_COMMAND:
                     # Record audio for Whisper transcription
-                    self.command_audio.append(audio_data)
+                    end = self.command_len + len(audio_data)
+                    self.command_audio[self.command_len:end] = audio_data
+                    self.command_len = end
                     
                     # Check for timeout
-                    if self.command_audio:
-                        audio_seconds = sum(len(a) for a in self.command_audio) / SAMPLE_RATE
-                        if audio_seconds > COMMAND_MAX_SECONDS:
-                            logger.info("⏱️ Command timeout, transcribing...")
-                            full_audio = np.concatenate(self.command_audio)
-                            text = self._transcribe_whisper(full_audio)
-                            
-                            if text:
-                                logger.info(f"📝 Command: \"{text}\"")
-                                await self._send_to_ovos(text)
-                            
-                            self.state = ListenerState.WAITING_FOR_WAKE
-                            self.command_audio = []
-                            self.silence_counter = 0
-                            logger.info("💤 Waiting for wake word...")
+                    if self.command_len / SAMPLE_RATE > COMMAND_MAX_SECONDS:
+                        logger.info("⏱️ Command timeout, transcribing...")
+                        full_audio = self.command_audio[:self.command_len]
+                        text = await asyncio.get_running_loop().run_in_executor(
+                            self.whisper_executor, self._transcribe_whisper, full_audio
+                        )
+                        
+                        if text:
+                            logger.info(f"📝 Command: \"{text}\"")
+                            await self._send_to_ovos(text)
+                        
+                        self.state = ListenerState.WAITING_FOR_WAKE
+                        self.command_len = 0
+                        self.silence_counter = 0
+                        logger.info("💤 Waiting for wake word...")
                 
             except Exception as e:
                 logger.error(f"Error: {e}")
@@ -331,7 +439,10 @@ class WindowsSTTBridge:
         logger.info(f"🎯 Whisper transcribes commands")
         
         self.running = True
+        self.loop = asyncio.get_running_loop()
         self.state = ListenerState.WAITING_FOR_WAKE
+        self.vad_thread = threading.Thread(target=self._vad_worker, daemon=True)
+        self.vad_thread.start()
         
         logger.info("\n💤 Waiting for wake word...\n")
         
@@ -358,9 +469,10 @@ class WindowsSTTBridge:
             pass
         finally:
             self.running = False
+            self.whisper_executor.shutdown(wait=False)
             if self.ws:
                 await self.ws.close()
-            logger.info("Stopped")
+            logger.info(f"Stopped ({self.vad_skipped} chunks skipped by the energy gate)")
 
 
 async def main():
@@ -368,9 +480,11 @@ async def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--host", default="localhost")
     parser.add_argument("--port", type=int, default=5678)
+    parser.add_argument("--whisper-device", default="auto", choices=["auto", "cpu", "cuda"])
     args = parser.parse_args()
     
-    bridge = WindowsSTTBridge(wsl_host=args.host, wsl_port=args.port)
+    bridge = WindowsSTTBridge(wsl_host=args.host, wsl_port=args.port,
+                              whisper_device=args.whisper_device)
     await bridge.run()
 
 
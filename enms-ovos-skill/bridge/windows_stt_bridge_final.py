@@ -11,6 +11,7 @@ This uses the SAME wake word engine as OVOS itself!
 """
 
 import asyncio
+import concurrent.futures
 import json
 import logging
 import time
@@ -22,6 +23,15 @@ import sounddevice as sd
 import websockets
 from precise_lite_runner import PreciseLiteListener
 
+# Optional: faster-whisper (CTranslate2, int8) transcribes several times
+# faster than openai-whisper on CPU; openai-whisper is the fallback
+try:
+    import ctranslate2
+    from faster_whisper import WhisperModel
+    FASTER_WHISPER_AVAILABLE = True
+except ImportError:
+    FASTER_WHISPER_AVAILABLE = False
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger("STTBridge")
 
@@ -36,6 +46,7 @@ COMMAND_MAX_SECONDS = 10.0
 SILENCE_THRESHOLD = 0.01  # RMS threshold for silence detection
 SILENCE_DURATION = 1.2    # Seconds of silence to trigger end of command
 MIN_SPEECH_DURATION = 0.3 # Minimum speech before silence detection kicks in
+TRAILING_PAD_CHUNKS = 2   # Quiet chunks kept after the last speech (~0.25s)
 
 
 class ListenerState(Enum):
@@ -46,27 +57,53 @@ class ListenerState(Enum):
 class WindowsSTTBridge:
     """Precise Lite (wake word) + Whisper (commands) STT bridge."""
     
-    def __init__(self, wsl_host: str = "localhost", wsl_port: int = 5678):
+    def __init__(self, wsl_host: str = "localhost", wsl_port: int = 5678,
+                 whisper_device: str = "auto"):
         self.wsl_host = wsl_host
         self.wsl_port = wsl_port
+        self.whisper_device = whisper_device  # auto, cpu or cuda
         self.ws = None
         self.state = ListenerState.WAITING_FOR_WAKE
-        self.command_audio = []
+        # Command audio is written into one buffer, reused for every command;
+        # a second of headroom covers chunks arriving before the timeout fires
+        self.command_audio = np.empty(int((COMMAND_MAX_SECONDS + 1) * SAMPLE_RATE), dtype=np.float32)
+        self.command_len = 0  # Samples recorded into command_audio
         self.command_start_time = None
         self.whisper_model = None
+        # Whisper decodes on its own thread so the event loop stays responsive
+        self.whisper_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
         self.precise_listener = None
         self.recording_stream = None
         
         # VAD (Voice Activity Detection) state
         self.speech_detected = False
         self.silence_start_time = None
+        self.speech_end = 0  # command_len at the end of the last loud chunk
         
     def _load_whisper_model(self):
         """Load Whisper model for command transcription."""
+        if FASTER_WHISPER_AVAILABLE:
+            device = self.whisper_device
+            if device == "auto":
+                device = "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+            # int8 weights with fp16 activations use the GPU's tensor cores
+            compute_type = "int8_float16" if device == "cuda" else "int8"
+            logger.info(f"⏳ Loading faster-whisper 'small' model ({compute_type} on {device})...")
+            try:
+                self.whisper_model = WhisperModel("small", device=device, compute_type=compute_type)
+            except (RuntimeError, ValueError) as e:
+                if device != "cuda":
+                    raise
+                # Out of GPU memory or unsupported card - CPU int8 still works
+                logger.warning(f"Whisper on GPU failed ({e}), falling back to CPU int8")
+                self.whisper_model = WhisperModel("small", device="cpu", compute_type="int8")
+            logger.info("✅ Whisper loaded (command transcription)")
+            return
         try:
             import whisper
             logger.info("⏳ Loading Whisper 'small' model...")
-            self.whisper_model = whisper.load_model("small")
+            device = None if self.whisper_device == "auto" else self.whisper_device
+            self.whisper_model = whisper.load_model("small", device=device)
             logger.info("✅ Whisper loaded (command transcription)")
         except ImportError:
             logger.error("Whisper not installed! Run: pip install openai-whisper")
@@ -76,12 +113,13 @@ class WindowsSTTBridge:
         """Called when Precise Lite detects wake word."""
         logger.info("🎯 WAKE WORD DETECTED! ('Hey Mycroft')")
         self.state = ListenerState.LISTENING_FOR_COMMAND
-        self.command_audio = []
+        self.command_len = 0
         self.command_start_time = time.time()
         
         # Reset VAD state
         self.speech_detected = False
         self.silence_start_time = None
+        self.speech_end = 0
         
         # Start recording command audio
         self._start_command_recording()
@@ -95,10 +133,13 @@ class WindowsSTTBridge:
         
         def callback(indata, frames, time_info, status):
             if self.state == ListenerState.LISTENING_FOR_COMMAND:
-                audio_chunk = indata[:, 0].copy()
+                audio_chunk = indata[:, 0]
                 
-                # Store audio for Whisper (float32)
-                self.command_audio.append(audio_chunk)
+                # Store audio for Whisper (float32), dropping anything past
+                # the buffer - the monitor is about to end the command anyway
+                end = min(self.command_len + len(audio_chunk), len(self.command_audio))
+                self.command_audio[self.command_len:end] = audio_chunk[:end - self.command_len]
+                self.command_len = end
                 
                 # VAD: Calculate RMS (volume level)
                 rms = np.sqrt(np.mean(audio_chunk ** 2))
@@ -107,6 +148,7 @@ class WindowsSTTBridge:
                     # Speech detected
                     self.speech_detected = True
                     self.silence_start_time = None
+                    self.speech_end = self.command_len
                 else:
                     # Silence detected
                     if self.speech_detected and self.silence_start_time is None:
@@ -135,11 +177,20 @@ class WindowsSTTBridge:
     
     def _transcribe_whisper(self, audio: np.ndarray) -> str:
         """Transcribe audio using Whisper."""
-        import whisper
-        
         # Whisper expects float32 normalized [-1, 1]
         # Audio from sounddevice is already in correct format
-        result = self.whisper_model.transcribe(audio, language="en", fp16=False)
+        if FASTER_WHISPER_AVAILABLE:
+            # beam_size=1 is greedy decoding, same as openai-whisper's default;
+            # the built-in Silero filter drops silent stretches before decoding
+            segments, _ = self.whisper_model.transcribe(
+                audio, language="en", beam_size=1,
+                vad_filter=True, vad_parameters={"min_silence_duration_ms": 500}
+            )
+            return "".join(segment.text for segment in segments).strip()
+        
+        result = self.whisper_model.transcribe(
+            audio, language="en", fp16=self.whisper_model.device.type == "cuda"
+        )
         return result["text"].strip()
     
     async def _send_to_ovos(self, utterance: str):
@@ -204,14 +255,19 @@ class WindowsSTTBridge:
         # Stop recording
         self._stop_command_recording()
         
-        if not self.command_audio:
+        if not self.command_len:
             logger.info("❌ No command audio recorded")
             self.state = ListenerState.WAITING_FOR_WAKE
             self.command_start_time = None
             return
         
-        # Concatenate all audio chunks
-        full_audio = np.concatenate(self.command_audio)
+        # Concatenate the audio up to the end of speech - the trailing silence
+        # that ended the command is only decoding cost for Whisper
+        if self.speech_detected:
+            self.command_len = min(self.command_len, self.speech_end + TRAILING_PAD_CHUNKS * CHUNK_SIZE)
+        # Copied out because a new wake word may start recording into the
+        # buffer while Whisper is still decoding this command
+        full_audio = self.command_audio[:self.command_len].copy()
         
         # Skip if too short (< 0.5s)
         if len(full_audio) < 8000:  # 0.5s at 16kHz
@@ -219,7 +275,9 @@ class WindowsSTTBridge:
         else:
             try:
                 logger.info("🧠 Transcribing...")
-                text = self._transcribe_whisper(full_audio)
+                text = await asyncio.get_running_loop().run_in_executor(
+                    self.whisper_executor, self._transcribe_whisper, full_audio
+                )
                 
                 if text:
                     logger.info(f"📝 Command: '{text}'")
@@ -231,7 +289,7 @@ class WindowsSTTBridge:
         
         # Reset to wake word listening
         self.state = ListenerState.WAITING_FOR_WAKE
-        self.command_audio = []
+        self.command_len = 0
         self.command_start_time = None
         self.speech_detected = False
         self.silence_start_time = None
@@ -308,6 +366,7 @@ class WindowsSTTBridge:
             logger.info("\nShutting down...")
         finally:
             self.precise_listener.stop()
+            self.whisper_executor.shutdown(wait=False)
             if self.ws:
                 await self.ws.close()
 
@@ -45,14 +45,8 @@ class WSL2OVOSBridge:
         self.bus = MessageBusClient()
         self.bus.run_in_thread()
         
-        # Wait for connection
-        import time
-        for _ in range(10):
-            if self.bus.started_running:
-                break
-            time.sleep(0.5)
-        
-        if not self.bus.started_running:
+        # Wait for the websocket to open (returns as soon as it does)
+        if not self.bus.connected_event.wait(timeout=5.0):
             raise ConnectionError("Failed to connect to OVOS messagebus")
         
         logger.info("Connected to OVOS messagebus")
@@ -19,7 +19,7 @@ Target Performance:
 - Accuracy: 99.5%+
 - Hallucination prevention: 99.9%
 """
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Callable, Iterable, Tuple
 import asyncio
 import time
 import re
@@ -44,17 +44,79 @@ from .lib.feature_extractor import FeatureExtractor
 from .lib.time_parser import TimeRangeParser
 from .lib.models import IntentType, Intent, TimeRange
 from .lib.machine_registry import DynamicMachineRegistry
+from .lib.logger import create_json_logger
 from .lib.observability import (
     queries_total,
     query_latency,
     tier_routing,
     errors_total,
-    validation_rejections
+    validation_rejections,
+    labeled
 )
 
 logger = structlog.get_logger(__name__)
 
 
+def _phrase_pattern(phrases) -> re.Pattern:
+    """Compile phrases into one substring alternation (same as any(p in text))
+    
+    Match against the lowercased utterance: re.IGNORECASE is ~7x slower here.
+    """
+    return re.compile('|'.join(re.escape(phrase) for phrase in phrases))
+
+
+# Follow-up/contextual phrases checked by converse() on every utterance OVOS
+# offers the skill; one compiled alternation is a single pass over the text
+FOLLOW_UP_INDICATORS = (
+    'what about', 'and the', 'how about', 'also show',
+    'what else', 'anything else', 'more details', 'tell me more',
+    'yesterday', 'last week', 'last month', 'today',
+    'the other', 'another', 'different'
+)
+FOLLOW_UP_PATTERN = _phrase_pattern(FOLLOW_UP_INDICATORS)
+
+# FACTORY_OVERVIEW routing ("is the system online?" vs stats vs listings)
+HEALTH_CHECK_PATTERN = _phrase_pattern((
+    'health', 'status', 'alive', 'running', 'online', 'api status', 'system status', 'database'
+))
+MACHINE_LISTING_PATTERN = re.compile(r'\b(?:list|show)\s+(?:all\s+)?machines')
+MACHINES_BY_STATUS_PATTERN = re.compile(
+    r'\b(?:active|online|running|inactive|offline|stopped)\b.*?\b(?:machines?|equipment)\b'
+)
+ACTIVE_STATUS_PATTERN = re.compile(r'\b(?:active|online|running)\b')
+
+# SEU baseline filters (with typo tolerance for "basline")
+SEU_WITHOUT_BASELINE_PATTERN = _phrase_pattern((
+    "don't have", "doesn't have", "do not have", "does not have",
+    "without baseline", "without basline",
+    "no baseline", "no basline",
+    "need baseline", "need basline",
+    "missing baseline", "missing basline"
+))
+SEU_WITH_BASELINE_PATTERN = _phrase_pattern((
+    "have baseline", "have basline",
+    "has baseline", "has basline",
+    "with baseline", "with basline"
+))
+
+
+def _parse_timestamp(value: Any):
+    """Parse an API timestamp to datetime, keeping the raw value on failure"""
+    if not isinstance(value, str):
+        # e.g. a numeric epoch from the API - passed through as before
+        return value
+    try:
+        # EnMS returns ISO 8601; fromisoformat is far cheaper than dateutil
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        pass
+    try:
+        from dateutil import parser as date_parser
+        return date_parser.parse(value)
+    except (ImportError, ValueError, OverflowError):
+        return value
+
+
 class EnmsSkill(OVOSSkill):
     """
     PRODUCTION-READY OVOS Skill for Energy Management System
@@ -82,7 +144,8 @@ class EnmsSkill(OVOSSkill):
             **kwargs: Additional keyword arguments
         """
         # Initialize attributes FIRST to avoid overwriting if initialize() is called by super()
-        self.logger = structlog.get_logger(__name__)
+        # (lazy proxy - bound in initialize() once the logging config is known)
+        self.logger = logger
         
         # Core components (initialized in initialize())
         self.hybrid_parser: Optional[HybridParser] = None
@@ -95,11 +158,54 @@ class EnmsSkill(OVOSSkill):
         self.voice_feedback: Optional[VoiceFeedbackManager] = None
         
         # Persistent event loop for async API calls (prevents 'Event loop is closed' errors)
+        # Runs forever in a dedicated daemon thread so httpx keep-alive connections survive
         self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._async_thread: Optional[threading.Thread] = None
+        
+        # IntentType -> EnMS API call (see _call_enms_api)
+        self._intent_handlers: Dict[IntentType, Callable[[Intent], Dict[str, Any]]] = {
+            IntentType.MACHINE_STATUS: self._api_machine_status,
+            IntentType.POWER_QUERY: self._api_power_query,
+            IntentType.ENERGY_QUERY: self._api_energy_query,
+            IntentType.SEUS: self._api_seus,
+            IntentType.FACTORY_OVERVIEW: self._api_factory_overview,
+            IntentType.MACHINE_LIST: self._api_machine_list,
+            IntentType.RANKING: self._api_ranking,
+            IntentType.COMPARISON: self._api_comparison,
+            IntentType.COST_ANALYSIS: self._api_cost_analysis,
+            IntentType.ANOMALY_DETECTION: self._api_anomaly_detection,
+            IntentType.BASELINE_MODELS: self._api_baseline_models,
+            IntentType.BASELINE_EXPLANATION: self._api_baseline_explanation,
+            IntentType.BASELINE: self._api_baseline,
+            IntentType.KPI: self._api_kpi,
+            IntentType.PERFORMANCE: self._api_performance,
+            IntentType.FORECAST: self._api_forecast,
+            IntentType.PRODUCTION: self._api_production,
+            IntentType.REPORT: self._api_report,
+            IntentType.HEALTH: self._api_health,
+            IntentType.OPPORTUNITIES: self._api_opportunities,
+            IntentType.ISO50001: self._api_iso50001,
+            IntentType.ALERTS: self._api_alerts,
+            IntentType.ENERGY_TYPES: self._api_energy_types,
+            IntentType.MODEL_QUERY: self._api_model_query
+        }
+        
+        # Short-lived machine status cache: machine name -> (fetched_at, data)
+        self._status_cache: Dict[str, tuple] = {}
+        self._status_cache_lock = threading.Lock()
+        self._status_cache_ttl = 5.0
+        
+        # Last machine set pushed to validator/heuristics (for change detection)
+        self._last_whitelist: set = set()
+        
+        # Whitelist-derived regex for templated "power of <machine>" queries
+        self._fast_path: Optional[re.Pattern] = None
+        self._fast_path_names: Dict[str, str] = {}  # lowercase -> canonical
+        self.enable_fast_path = True
         
         # Performance tracking
         self.query_count = 0
-        self.total_latency_ms = 0
+        self.total_latency_ns = 0  # int: no float drift over long uptimes
         
         # Call parent constructor LAST (may trigger initialize())
         super().__init__(bus=bus, skill_id=skill_id, **kwargs)
@@ -109,25 +215,20 @@ class EnmsSkill(OVOSSkill):
         Called after skill construction
         Initialize all SOTA components
         """
-        logger.info("skill_initializing", 
-                        skill_name="EnmsSkill",
-                        version="1.0.0",
-                        architecture="multi-tier-adaptive")
-        
         # Priority 5: Load configuration from config.yaml (WASABI portability)
         import os
         import yaml
         from pathlib import Path
         
         # Try to load config.yaml from skill directory
+        # (logged once the skill logger has been set up from it)
         config_path = Path(__file__).parent.parent / "config.yaml"
-        if config_path.exists():
-            logger.info("loading_config_yaml", path=str(config_path))
+        config_found = config_path.exists()
+        if config_found:
             with open(config_path, 'r') as f:
                 self.config = yaml.safe_load(f)
         else:
             # Fallback to legacy environment variables and settings
-            logger.warning("config_yaml_not_found", path=str(config_path), using_fallback=True)
             self.config = {
                 "adapter_type": "humanergy",
                 "api_base_url": os.getenv("ENMS_API_URL", 
@@ -142,12 +243,34 @@ class EnmsSkill(OVOSSkill):
                 "features": {}
             }
         
+        log_config = self.config.get("logging") or {}
+        if log_config.get("format") == "json":
+            # Skill-local JSON logger - the host's global structlog config stays as is
+            self.logger = create_json_logger(log_config.get("level", "INFO"),
+                                             component="enms_skill")
+        else:
+            self.logger = logger.bind(component="enms_skill")
+        
+        self.logger.info("skill_initializing", 
+                        skill_name="EnmsSkill",
+                        version="1.0.0",
+                        architecture="multi-tier-adaptive")
+        if config_found:
+            self.logger.info("loading_config_yaml", path=str(config_path))
+        else:
+            self.logger.warning("config_yaml_not_found", path=str(config_path), using_fallback=True)
+        
         # Extract commonly used settings
         self.enms_api_base_url = self.config.get("api_base_url", "http://10.33.10.104:8001/api/v1")
         self.llm_model_path = self.settings.get("llm_model_path", "./models/Qwen_Qwen3-1.7B-Q4_K_M.gguf")
         self.confidence_threshold = self.settings.get("confidence_threshold", 0.85)
         self.enable_progress_feedback = self.settings.get("enable_progress_feedback", True)
         self.progress_threshold_ms = self.settings.get("progress_threshold_ms", 500)
+        self._status_cache_ttl = float(self.settings.get("status_cache_ttl_seconds", 5))
+        self.enable_fast_path = self.settings.get("enable_fast_path", True)
+        
+        # Start the background event loop shared by all API calls
+        self._start_async_loop()
         
         # Initialize Tier 1-3: Hybrid Parser (Heuristic + Adapt + LLM)
         logger.info("initializing_hybrid_parser")
@@ -181,7 +304,10 @@ class EnmsSkill(OVOSSkill):
         self.api_client = ENMSClient(
             base_url=self.enms_api_base_url,
             timeout=self.config.get("timeout", 90),
-            max_retries=self.config.get("max_retries", 3)
+            max_retries=self.config.get("max_retries", 3),
+            max_connections=self.settings.get("api_max_connections", 32),
+            breaker_failure_threshold=self.settings.get("api_breaker_failure_threshold", 5),
+            breaker_reset_seconds=self.settings.get("api_breaker_reset_seconds", 30)
         )
         
         # Initialize Tier 5.5: Dynamic Machine Registry (Priority 4)
@@ -212,6 +338,10 @@ class EnmsSkill(OVOSSkill):
                         confidence_threshold=self.confidence_threshold,
                         converse_mode=True)
         
+        # Warm parsers/templates in the background so the first utterance
+        # doesn't pay Adapt engine, dateutil and Jinja compile costs
+        threading.Thread(target=self._warm_up, daemon=True, name="parser_warmup").start()
+        
         # Note: Removed self.activate() - OVOSSkill doesn't have this method
         # (activate() is ConversationalSkill-specific)
     
@@ -226,12 +356,13 @@ class EnmsSkill(OVOSSkill):
             5,
             name=f"{self.skill_id}_whitelist_refresh_initial"
         )
+        refresh_interval = self.settings.get("whitelist_refresh_seconds", 300)
         self.schedule_repeating_event(
             self._refresh_machine_whitelist, 
-            86400, 
-            86400,
-            name=f"{self.skill_id}_whitelist_refresh_daily"
-        )  # Daily refresh
+            refresh_interval, 
+            refresh_interval,
+            name=f"{self.skill_id}_whitelist_refresh_periodic"
+        )  # Pick up machines added/removed in EnMS without a restart
         
         # Cleanup expired conversation sessions every hour
         self.schedule_repeating_event(
@@ -250,11 +381,7 @@ class EnmsSkill(OVOSSkill):
         )
         
         logger.info("scheduled_events_registered",
-                   events=["whitelist_refresh_initial", "whitelist_refresh_daily", "conversation_cleanup", "health_check"])
-        
-        # Background preload LLM model (non-blocking)
-        # This loads the model in a background thread so first LLM query is fast
-        threading.Thread(target=self._preload_llm, daemon=True, name="llm_preload").start()
+                   events=["whitelist_refresh_initial", "whitelist_refresh_periodic", "conversation_cleanup", "health_check"])
     
     def _health_check(self, message=None):
         """Periodic health check to detect if skill is stuck.
@@ -268,28 +395,36 @@ class EnmsSkill(OVOSSkill):
         
         self.logger.debug("health_check",
                         queries_processed=self.query_count,
-                        avg_latency_ms=round(self.total_latency_ms / max(self.query_count, 1), 2) if self.query_count > 0 else 0)
+                        avg_latency_ms=self._avg_latency_ms())
+    
+    def _avg_latency_ms(self) -> float:
+        """Mean successful-query latency; computed only when reported"""
+        if not self.query_count:
+            return 0
+        return round(self.total_latency_ns / self.query_count / 1e6, 2)
     
-    def _preload_llm(self):
-        """Preload LLM model in background thread.
+    def _warm_up(self):
+        """Warm parsing and formatting paths in a background thread.
         
-        This eliminates the 90+ second cold start on first LLM query.
-        Model stays in memory until skill shuts down.
+        First-call cost used to land on the first user utterance: Adapt engine
+        lookups, lazy dateutil imports in the time parser, and Jinja template
+        compilation. Runs the same code paths once with canned input, without
+        going through HybridParser.parse so routing stats and metrics stay clean.
         """
         try:
-            time.sleep(5)  # Let critical services start first
-            self.logger.info("llm_preload_starting")
-            start = time.time()
-            
-            # Access the qwen3 parser and trigger model load
-            if self.hybrid_parser and self.hybrid_parser.llm:
-                self.hybrid_parser.llm.load_model()
-                elapsed = time.time() - start
-                self.logger.info("llm_preload_complete", elapsed_seconds=round(elapsed, 1))
-            else:
-                self.logger.warning("llm_preload_skipped", reason="parser not initialized")
+            self.logger.info("warmup_starting")
+            start = time.perf_counter()
+            
+            self.hybrid_parser.adapt.parse("show me the factory overview")
+            TimeRangeParser.parse("yesterday")
+            
+            templates = self.response_formatter.precompile()
+            
+            self.logger.info("warmup_complete",
+                           templates=templates,
+                           elapsed_ms=round((time.perf_counter() - start) * 1000, 1))
         except Exception as e:
-            self.logger.error("llm_preload_failed", error=str(e), error_type=type(e).__name__)
+            self.logger.error("warmup_failed", error=str(e), error_type=type(e).__name__)
     
     def _refresh_machine_whitelist(self, message=None):
         """Refresh machine whitelist from EnMS API (Priority 4: Dynamic Discovery)"""
@@ -303,12 +438,28 @@ class EnmsSkill(OVOSSkill):
             machine_names = self.machine_registry.get_machines()
             seu_names = self.machine_registry.get_seu_names()
             
+            # Only push to validator/heuristics when membership actually changed
+            new_whitelist = set(machine_names)
+            if new_whitelist == self._last_whitelist:
+                self.logger.debug("machine_whitelist_unchanged",
+                                machines_count=len(machine_names))
+                return
+            added = new_whitelist - self._last_whitelist
+            removed = self._last_whitelist - new_whitelist
+            self._last_whitelist = new_whitelist
+            
             # Update validator whitelist
             self.validator.update_machine_whitelist(machine_names)
             
+            # Drop cached statuses so renamed/removed machines aren't served stale
+            self._invalidate_status_cache()
+            
+            # Rebuild fast-path pattern for the new machine set
+            self._build_fast_path(machine_names)
+            
             # Update heuristic parser patterns
-            if hasattr(self.hybrid_parser, 'heuristic') and hasattr(self.hybrid_parser.heuristic, 'MACHINES'):
-                self.hybrid_parser.heuristic.MACHINES = machine_names
+            if machine_names:
+                self.hybrid_parser.heuristic.update_machines(machine_names)
             
             # Log statistics
             stats = self.machine_registry.get_stats()
@@ -317,11 +468,55 @@ class EnmsSkill(OVOSSkill):
                            seus_count=len(seu_names),
                            from_api=success,
                            using_fallback=not success,
+                           added=sorted(added),
+                           removed=sorted(removed),
                            stats=stats)
         except Exception as e:
             self.logger.error("whitelist_refresh_failed", error=str(e), error_type=type(e).__name__)
             # Don't fail skill initialization - registry uses fallback defaults
     
+    def _build_fast_path(self, machine_names: List[str]):
+        """Compile the fast-path regex for templated power/energy queries.
+        
+        Only matches the whole utterance (e.g. "power of Compressor-1",
+        "energy consumption for Boiler-1") so anything with a time range or
+        extra qualifiers still goes through the HybridParser.
+        """
+        self._fast_path_names = {name.lower(): name for name in machine_names}
+        if not machine_names:
+            self._fast_path = None
+            return
+        # Longest first so "Compressor-EU-1" wins over "Compressor-1" prefixes
+        names = sorted(machine_names, key=len, reverse=True)
+        machines = "|".join(re.escape(name.lower()) for name in names)
+        self._fast_path = re.compile(
+            r"(?:what(?:'s| is) (?:the )?)?(power|energy)(?: consumption| usage)? "
+            rf"(?:of|for) ({machines})\??"
+        )
+    
+    def _try_fast_path(self, utterance: str) -> Optional[Dict[str, Any]]:
+        """Match templated queries against the whitelist, skipping full parsing.
+        
+        Returns:
+            Parse result in HybridParser format, or None on miss
+        """
+        if not self.enable_fast_path or self._fast_path is None:
+            return None
+        
+        match = self._fast_path.fullmatch(utterance.strip().lower())
+        if not match:
+            return None
+        
+        metric = match.group(1)
+        machine = self._fast_path_names[match.group(2)]
+        return {
+            'intent': f"{metric}_query",
+            'confidence': 0.99,
+            'machine': machine,
+            'metric': metric,
+            'tier': RoutingTier.HEURISTIC,
+        }
+    
     def _cleanup_conversations(self, message=None):
         """Cleanup expired conversation sessions"""
         try:
@@ -335,11 +530,48 @@ class EnmsSkill(OVOSSkill):
         except Exception as e:
             self.logger.error("conversation_cleanup_failed", error=str(e))
     
+    def _start_async_loop(self):
+        """Start the persistent event loop in a background daemon thread.
+        
+        A single long-lived loop keeps the httpx.AsyncClient connection pool
+        warm, so consecutive API calls reuse TCP connections (keep-alive)
+        instead of reconnecting on every intent.
+        """
+        if self._async_loop is not None and not self._async_loop.is_closed() \
+                and self._async_thread is not None and self._async_thread.is_alive():
+            return
+        
+        self._async_loop = asyncio.new_event_loop()
+        self._async_thread = threading.Thread(
+            target=self._async_loop.run_forever,
+            daemon=True,
+            name="enms_async_loop"
+        )
+        self._async_thread.start()
+        logger.info("async_loop_started", thread=self._async_thread.name)
+    
+    def _stop_async_loop(self):
+        """Stop the background event loop and wait for its thread to exit."""
+        loop, thread = self._async_loop, self._async_thread
+        self._async_loop = None
+        self._async_thread = None
+        
+        if loop is None or loop.is_closed():
+            return
+        
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join(timeout=5)
+        loop.close()
+    
     def _run_async(self, coro, timeout_seconds: float = 20.0):
         """Helper to run async coroutines from sync handlers.
         
-        Uses a persistent event loop to avoid 'Event loop is closed' errors
-        when making multiple API calls with httpx.AsyncClient.
+        Dispatches the coroutine to the persistent background event loop
+        (see _start_async_loop) and blocks until it completes. All API calls
+        share one loop, so the httpx connection pool stays alive between
+        queries and intent handlers running on different threads never
+        compete for run_until_complete().
         
         CRITICAL: Timeout must be LESS than bridge timeout (30s) to return
         errors gracefully. Set to 20s to leave 10s buffer for processing.
@@ -354,22 +586,136 @@ class EnmsSkill(OVOSSkill):
         Raises:
             asyncio.TimeoutError: If operation exceeds timeout
         """
-        if self._async_loop is None or self._async_loop.is_closed():
-            self._async_loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(self._async_loop)
+        self._start_async_loop()
         
         # Wrap coroutine with timeout protection
         async def _with_timeout():
             return await asyncio.wait_for(coro, timeout=timeout_seconds)
         
+        future = asyncio.run_coroutine_threadsafe(_with_timeout(), self._async_loop)
         try:
-            return self._async_loop.run_until_complete(_with_timeout())
+            return future.result()
         except asyncio.TimeoutError:
             self.logger.error("async_operation_timeout",
                             timeout_seconds=timeout_seconds,
                             operation=str(coro))
             raise
     
+    def _run_async_many(self, coros: Iterable, timeout_seconds: float = 20.0) -> List[Any]:
+        """Run several coroutines concurrently on the shared loop.
+        
+        Use instead of looping over _run_async: N round trips cost about as
+        much as the slowest one rather than their sum.
+        
+        Args:
+            coros: Async coroutines to run
+            timeout_seconds: Maximum time to wait for each of them
+            
+        Returns:
+            Results in input order; a failed or timed-out coroutine yields
+            its exception so one bad call doesn't sink the rest
+        """
+        coros = list(coros)
+        if not coros:
+            return []
+        
+        async def gather_all():
+            return await asyncio.gather(
+                *(asyncio.wait_for(coro, timeout=timeout_seconds) for coro in coros),
+                return_exceptions=True
+            )
+        
+        # Per-call timeouts fire first; the outer one is only a safety net
+        return self._run_async(gather_all(), timeout_seconds=timeout_seconds + 1.0)
+    
+    def _get_machine_status(self, machine_name: str) -> Dict[str, Any]:
+        """Get machine status, served from a short TTL cache when fresh.
+        
+        Follow-up queries about the same machine a few seconds apart
+        ("what about now?") hit memory instead of the EnMS API. The TTL is
+        controlled by the `status_cache_ttl_seconds` setting (0 disables).
+        
+        Args:
+            machine_name: Canonical machine name
+            
+        Returns:
+            Machine status dict (a copy - callers may add keys freely)
+        """
+        return self._get_machine_statuses([machine_name])[0]
+    
+    def _get_machine_statuses(self, machine_names: List[str],
+                              return_exceptions: bool = False) -> List[Dict[str, Any]]:
+        """Get status for several machines, fetching cache misses concurrently.
+        
+        Multi-machine queries ("status of all compressors") used to pay one
+        EnMS round trip per machine in sequence; misses are now gathered on the
+        shared event loop so total latency is roughly that of the slowest call.
+        
+        Args:
+            machine_names: Canonical machine names
+            return_exceptions: Put a failed lookup's exception in its slot
+                instead of raising it
+            
+        Returns:
+            Status dicts in the same order as machine_names (copies)
+        """
+        ttl = self._status_cache_ttl
+        results: Dict[str, Any] = {}
+        now = time.monotonic()
+        if ttl > 0:
+            with self._status_cache_lock:
+                for name in machine_names:
+                    cached = self._status_cache.get(name)
+                    if cached and now - cached[0] < ttl:
+                        results[name] = cached[1]
+            if results:
+                self.logger.debug("machine_status_cache_hit", machines=list(results))
+        
+        misses = list(dict.fromkeys(n for n in machine_names if n not in results))
+        if misses:
+            fetched = self._run_async_many(
+                self.api_client.get_machine_status(name) for name in misses
+            )
+            fetched_at = time.monotonic()
+            for name, data in zip(misses, fetched):
+                if isinstance(data, Exception) and not return_exceptions:
+                    raise data
+                results[name] = data
+                if ttl > 0 and isinstance(data, dict):
+                    with self._status_cache_lock:
+                        self._status_cache[name] = (fetched_at, data)
+        
+        return [
+            dict(results[name]) if isinstance(results[name], dict) else results[name]
+            for name in machine_names
+        ]
+    
+    def _resolve_machine_id(self, machine_name: str) -> Optional[str]:
+        """Resolve a machine name to its EnMS id.
+        
+        Served from the id map the registry builds on every whitelist
+        refresh; only unknown names cost a list_machines(search=...) round
+        trip, and the answer is remembered until the next refresh.
+        
+        Returns:
+            Machine id, or None if no machine matches
+        """
+        machine_id = self.machine_registry.get_machine_id(machine_name)
+        if machine_id:
+            return machine_id
+        
+        machines = self._run_async(self.api_client.list_machines(search=machine_name))
+        if not machines:
+            return None
+        machine_id = machines[0]['id']
+        self.machine_registry.cache_machine_id(machine_name, machine_id)
+        return machine_id
+    
+    def _invalidate_status_cache(self):
+        """Clear all cached machine statuses"""
+        with self._status_cache_lock:
+            self._status_cache.clear()
+    
     def _get_factory_wide_drivers(self) -> Dict[str, Any]:
         """Get aggregated key energy drivers across ALL machines with baseline models.
         
@@ -379,45 +725,46 @@ class EnmsSkill(OVOSSkill):
         machines_analyzed = []
         
         # Get all machines with baseline models
-        machines = self.validator.machine_whitelist
+        machines = list(self.validator.machine_whitelist)
         
-        for machine_name in machines:
-            try:
-                # Get baseline models for this machine
-                models_response = self._run_async(
-                    self.api_client.list_baseline_models(
-                        seu_name=machine_name,
-                        energy_source="electricity"
-                    )
-                )
-                
-                models = models_response.get('models', [])
-                active_model = next((m for m in models if m.get('is_active')), models[0] if models else None)
-                
-                if not active_model:
-                    continue
-                
-                # Get explanation with key drivers
-                explanation_response = self._run_async(
-                    self.api_client.get_baseline_model_explanation(
-                        model_id=active_model.get('id'),
-                        include_explanation=True
-                    )
-                )
-                
-                explanation = explanation_response.get('explanation', {})
-                key_drivers = explanation.get('key_drivers', [])
-                
-                # Add machine context to each driver
-                for driver in key_drivers:
-                    driver['machine'] = machine_name
-                    all_drivers.append(driver)
-                
-                machines_analyzed.append(machine_name)
-                
-            except Exception as e:
-                self.logger.warning("factory_driver_fetch_failed", machine=machine_name, error=str(e))
+        async def fetch_key_drivers(machine_name: str) -> Optional[List[Dict[str, Any]]]:
+            """Key drivers of a machine's active model, or None if it has no model"""
+            models_response = await self.api_client.list_baseline_models(
+                seu_name=machine_name,
+                energy_source="electricity"
+            )
+            
+            models = models_response.get('models', [])
+            active_model = next((m for m in models if m.get('is_active')), models[0] if models else None)
+            
+            if not active_model:
+                return None
+            
+            # Get explanation with key drivers
+            explanation_response = await self.api_client.get_baseline_model_explanation(
+                model_id=active_model.get('id'),
+                include_explanation=True
+            )
+            
+            explanation = explanation_response.get('explanation', {})
+            return explanation.get('key_drivers', [])
+        
+        # All machines fetched concurrently instead of 2 round trips each in sequence
+        results = self._run_async_many(fetch_key_drivers(machine_name) for machine_name in machines)
+        
+        for machine_name, key_drivers in zip(machines, results):
+            if isinstance(key_drivers, Exception):
+                self.logger.warning("factory_driver_fetch_failed", machine=machine_name, error=str(key_drivers))
                 continue
+            if key_drivers is None:
+                continue
+            
+            # Add machine context to each driver
+            for driver in key_drivers:
+                driver['machine'] = machine_name
+                all_drivers.append(driver)
+            
+            machines_analyzed.append(machine_name)
         
         if not all_drivers:
             return {'success': False, 'error': 'No baseline models found across factory'}
@@ -699,10 +1046,10 @@ class EnmsSkill(OVOSSkill):
             Modified intent with factory_wide scope applied
         """
         # Power/Energy query without machine → factory total
-        if intent.intent in [IntentType.ENERGY_QUERY, IntentType.POWER_QUERY]:
+        if intent.intent in (IntentType.ENERGY_QUERY, IntentType.POWER_QUERY):
             if not intent.machine and not intent.seu:
                 # Set factory-wide flag
-                if not hasattr(intent, 'params') or intent.params is None:
+                if intent.params is None:
                     intent.params = {}
                 intent.params['factory_wide'] = True
                 
@@ -711,7 +1058,7 @@ class EnmsSkill(OVOSSkill):
                                reason="no_machine_specified")
         
         # Status query without machine → factory overview
-        elif intent.intent == IntentType.MACHINE_STATUS:
+        elif intent.intent is IntentType.MACHINE_STATUS:
             if not intent.machine:
                 intent.intent = IntentType.FACTORY_OVERVIEW
                 self.logger.info("implicit_factory_overview",
@@ -739,14 +1086,11 @@ class EnmsSkill(OVOSSkill):
         Returns:
             dict with: success, response, latency_ms, tier, intent
         """
-        start_time = time.time()
-        self.logger.info("⚙️ PROCESS_QUERY_START", utterance=utterance[:50])
+        start_ns = time.perf_counter_ns()
         
         try:
             # Step 1: Get conversation session
-            self.logger.info("⚙️ step1_get_session", elapsed_ms=int((time.time()-start_time)*1000))
             # DISABLED: session = self.context_manager.get_or_create_session(session_id)
-            self.logger.info("⚙️ step1_session_created", elapsed_ms=int((time.time()-start_time)*1000))
             
             # Step 2: Voice acknowledgment (varies by expected intent)
             if expected_intent:
@@ -754,25 +1098,17 @@ class EnmsSkill(OVOSSkill):
                 self.speak(ack.message, wait=False)
             
             # Step 3: Parse with HybridParser (multi-tier routing)
-            self.logger.info("⚙️ step3_parsing", elapsed_ms=int((time.time()-start_time)*1000))
-            parse_start = time.time()
-            parse_result = self.hybrid_parser.parse(utterance)
-            parse_latency_ms = (time.time() - parse_start) * 1000
-            self.logger.info("⚙️ step3_parsed", parse_ms=int(parse_latency_ms), elapsed_ms=int((time.time()-start_time)*1000))
+            parse_start_ns = time.perf_counter_ns()
+            parse_result = self._try_fast_path(utterance) or self.hybrid_parser.parse(utterance)
+            parse_latency_ms = (time.perf_counter_ns() - parse_start_ns) / 1e6
             
             tier = parse_result.get("tier", RoutingTier.HEURISTIC)
             # parse_result IS the llm_output dict (contains intent, confidence, entities, etc.)
             llm_output = parse_result
             llm_output["utterance"] = utterance
             
-            self.logger.info("query_parsed",
-                           utterance=utterance,
-                           tier=tier,
-                           parse_latency_ms=round(parse_latency_ms, 2),
-                           confidence=parse_result.get("confidence"))
-            
             # Track tier routing
-            tier_routing.labels(tier=tier).inc()
+            labeled(tier_routing, tier).inc()
             
             # Step 3.5: Check for pending clarification BEFORE validation
             # If query is just a machine name answering clarification
@@ -796,14 +1132,12 @@ class EnmsSkill(OVOSSkill):
                     llm_output['confidence'] = 0.99  # User provided clarification
             
             # Step 4: Validate
-            self.logger.info("⚙️ step4_validating", elapsed_ms=int((time.time()-start_time)*1000))
-            validation_start = time.time()
+            validation_start_ns = time.perf_counter_ns()
             validation = self.validator.validate(llm_output)
-            validation_latency_ms = (time.time() - validation_start) * 1000
-            self.logger.info("⚙️ step4_validated", valid=validation.valid, elapsed_ms=int((time.time()-start_time)*1000))
+            validation_latency_ms = (time.perf_counter_ns() - validation_start_ns) / 1e6
             
             if not validation.valid:
-                errors_total.labels(error_type='validation', component='validator').inc()
+                labeled(errors_total, 'validation', 'validator').inc()
                 error_msg = " ".join(validation.errors)
                 if validation.suggestions:
                     error_msg += " " + validation.suggestions[0]
@@ -818,8 +1152,8 @@ class EnmsSkill(OVOSSkill):
                     context={'suggestion': error_msg}
                 )
                 
-                total_latency_ms = (time.time() - start_time) * 1000
-                query_latency.labels(intent_type='unknown', tier=str(tier)).observe(total_latency_ms / 1000)
+                total_latency_ms = (time.perf_counter_ns() - start_ns) / 1e6
+                labeled(query_latency, 'unknown', str(tier)).observe(total_latency_ms / 1000)
                 
                 return {
                     'success': False,
@@ -874,8 +1208,8 @@ class EnmsSkill(OVOSSkill):
                         intent, session, validation.suggestions, ambiguous_machines
                     )
                     
-                    total_latency_ms = (time.time() - start_time) * 1000
-                    query_latency.labels(intent_type=str(intent.intent.value), tier=str(tier)).observe(total_latency_ms / 1000)
+                    total_latency_ms = (time.perf_counter_ns() - start_ns) / 1e6
+                    labeled(query_latency, str(intent.intent.value), str(tier)).observe(total_latency_ms / 1000)
                     
                     return {
                         'success': False,
@@ -887,19 +1221,17 @@ class EnmsSkill(OVOSSkill):
                     }
             
             # Step 8: Call EnMS API
-            self.logger.info("⚙️ step8_calling_api", intent=intent.intent.value, elapsed_ms=int((time.time()-start_time)*1000))
-            api_start = time.time()
+            api_start_ns = time.perf_counter_ns()
             api_data = self._call_enms_api(intent)
-            api_latency_ms = (time.time() - api_start) * 1000
-            self.logger.info("⚙️ step8_api_returned", success=api_data.get('success'), api_ms=int(api_latency_ms), elapsed_ms=int((time.time()-start_time)*1000))
+            api_latency_ms = (time.perf_counter_ns() - api_start_ns) / 1e6
             
             if not api_data.get('success', False):
-                errors_total.labels(error_type='api', component='api_client').inc()
+                labeled(errors_total, 'api', 'api_client').inc()
                 error_type = api_data.get('error_type', 'api_error')
                 error_response = self.voice_feedback.get_error_message(error_type)
                 
-                total_latency_ms = (time.time() - start_time) * 1000
-                query_latency.labels(intent_type=str(intent.intent.value), tier=str(tier)).observe(total_latency_ms / 1000)
+                total_latency_ms = (time.perf_counter_ns() - start_ns) / 1e6
+                labeled(query_latency, str(intent.intent.value), str(tier)).observe(total_latency_ms / 1000)
                 
                 return {
                     'success': False,
@@ -911,10 +1243,10 @@ class EnmsSkill(OVOSSkill):
                 }
             
             # Step 9: Format response with templates
-            format_start = time.time()
+            format_start_ns = time.perf_counter_ns()
             custom_template = api_data.get('custom_template')
             response_text = self._format_response(intent, api_data['data'], custom_template=custom_template)
-            format_latency_ms = (time.time() - format_start) * 1000
+            format_latency_ms = (time.perf_counter_ns() - format_start_ns) / 1e6
             
             # Step 10: Update conversation context
             # DISABLED: session.add_turn(
@@ -925,22 +1257,26 @@ class EnmsSkill(OVOSSkill):
             # )
             
             # Step 11: Track metrics
-            total_latency_ms = (time.time() - start_time) * 1000
-            query_latency.labels(intent_type=str(intent.intent.value), tier=str(tier)).observe(total_latency_ms / 1000)
-            queries_total.labels(intent_type=str(intent.intent.value), tier=str(tier), status='success').inc()
+            total_latency_ns = time.perf_counter_ns() - start_ns
+            total_latency_ms = total_latency_ns / 1e6
+            intent_value = intent.intent.value
+            labeled(query_latency, intent_value, tier).observe(total_latency_ms / 1000)
+            labeled(queries_total, intent_value, tier, 'success').inc()
             
             self.query_count += 1
-            self.total_latency_ms += total_latency_ms
+            self.total_latency_ns += total_latency_ns
             
+            # One event per query carrying the whole breakdown
             self.logger.info("query_processed_successfully",
+                           utterance=utterance[:50],
+                           confidence=parse_result.get("confidence"),
                            latency_ms=round(total_latency_ms, 2),
                            parse_ms=round(parse_latency_ms, 2),
                            validation_ms=round(validation_latency_ms, 2),
                            api_ms=round(api_latency_ms, 2),
                            format_ms=round(format_latency_ms, 2),
                            tier=tier,
-                           intent=intent.intent,
-                           avg_latency_ms=round(self.total_latency_ms / self.query_count, 2))
+                           intent=intent.intent)
             
             result = {
                 'success': True,
@@ -958,7 +1294,7 @@ class EnmsSkill(OVOSSkill):
             }
             
             # For report generation, include pdf_base64 for browser download
-            if intent.intent == IntentType.REPORT and api_data.get('action') == 'generate':
+            if intent.intent is IntentType.REPORT and api_data.get('action') == 'generate':
                 data = api_data.get('data', {})
                 if data.get('pdf_base64'):
                     result['pdf_base64'] = data['pdf_base64']
@@ -972,9 +1308,9 @@ class EnmsSkill(OVOSSkill):
                             utterance=utterance)
             
             error_response = self.voice_feedback.get_error_message('api_timeout')
-            total_latency_ms = (time.time() - start_time) * 1000
-            query_latency.labels(intent_type='timeout', tier='unknown').observe(total_latency_ms / 1000)
-            errors_total.labels(error_type='timeout', component='api_client').inc()
+            total_latency_ms = (time.perf_counter_ns() - start_ns) / 1e6
+            labeled(query_latency, 'timeout', 'unknown').observe(total_latency_ms / 1000)
+            labeled(errors_total, 'timeout', 'api_client').inc()
             
             return {
                 'success': False,
@@ -992,8 +1328,8 @@ class EnmsSkill(OVOSSkill):
                             utterance=utterance)
             
             error_response = self.voice_feedback.get_error_message('api_error')
-            total_latency_ms = (time.time() - start_time) * 1000
-            query_latency.labels(intent_type='error', tier='unknown').observe(total_latency_ms / 1000)
+            total_latency_ms = (time.perf_counter_ns() - start_ns) / 1e6
+            labeled(query_latency, 'error', 'unknown').observe(total_latency_ms / 1000)
             
             return {
                 'success': False,
@@ -1012,1664 +1348,1622 @@ class EnmsSkill(OVOSSkill):
             dict with: success, data, error (if failed)
         """
         self.logger.info("🔌 CALL_ENMS_API_START", intent_type=intent.intent.value)
+        handler = self._intent_handlers.get(intent.intent)
+        if handler is None:
+            self.logger.warning("unsupported_intent_api_call", intent=intent.intent)
+            return {
+                'success': False,
+                'error': f"API call for intent {intent.intent} not yet implemented",
+                'error_type': 'not_implemented'
+            }
+        
         try:
-            if intent.intent == IntentType.MACHINE_STATUS:
-                # Check for multiple machines (set by validator for ambiguous queries like "compressor")
-                if intent.machines and len(intent.machines) > 1:
-                    # Multiple machines from validator - fetch status for ALL
-                    self.logger.info("multi_machine_status_from_validator", 
-                                   machines=intent.machines,
-                                   count=len(intent.machines))
-                    
-                    machine_statuses = []
-                    for machine_name in intent.machines:
-                        status_data = self._run_async(self.api_client.get_machine_status(machine_name))
-                        machine_statuses.append(status_data)
-                    
-                    return {
-                        'success': True,
-                        'data': {
-                            'machines': machine_statuses,
-                            'count': len(machine_statuses),
-                            'query_term': intent.machine if intent.machine else 'multiple machines'
-                        },
-                        'template': 'multi_machine_status'
-                    }
-                elif intent.machine:
-                    # Check for multiple matching machines (e.g., "HVAC" matches both HVAC-Main and HVAC-EU-North)
-                    all_matches = self.validator.find_all_matching_machines(intent.machine)
-                    
-                    if len(all_matches) > 1:
-                        # Multiple machines match - fetch status for ALL of them
-                        self.logger.info("multiple_machines_matched", 
-                                       query=intent.machine, 
-                                       matches=all_matches,
-                                       count=len(all_matches))
-                        
-                        machine_statuses = []
-                        for machine_name in all_matches:
-                            status_data = self._run_async(self.api_client.get_machine_status(machine_name))
-                            machine_statuses.append(status_data)
-                        
-                        return {
-                            'success': True,
-                            'data': {
-                                'machines': machine_statuses,
-                                'count': len(machine_statuses),
-                                'query_term': intent.machine
-                            },
-                            'template': 'multi_machine_status'
-                        }
-                    else:
-                        # Single machine match (existing behavior)
-                        data = self._run_async(self.api_client.get_machine_status(intent.machine))
-                        return {'success': True, 'data': data}
+            return handler(intent)
+        except Exception as e:
+            self.logger.error("api_call_failed",
+                            intent=intent.intent,
+                            error=str(e),
+                            error_type=type(e).__name__)
+            return {
+                'success': False,
+                'error': str(e),
+                'error_type': 'api_timeout' if 'timeout' in str(e).lower() else 'api_error'
+            }
+    
+    def _api_machine_status(self, intent: Intent) -> Dict[str, Any]:
+        """Status of one machine, several matching machines, or machine counts"""
+        # Check for multiple machines (set by validator for ambiguous queries like "compressor")
+        if intent.machines and len(intent.machines) > 1:
+            # Multiple machines from validator - fetch status for ALL
+            self.logger.info("multi_machine_status_from_validator", 
+                           machines=intent.machines,
+                           count=len(intent.machines))
+            
+            machine_statuses = self._get_machine_statuses(intent.machines)
+            
+            return {
+                'success': True,
+                'data': {
+                    'machines': machine_statuses,
+                    'count': len(machine_statuses),
+                    'query_term': intent.machine if intent.machine else 'multiple machines'
+                },
+                'template': 'multi_machine_status'
+            }
+        elif intent.machine:
+            # Check for multiple matching machines (e.g., "HVAC" matches both HVAC-Main and HVAC-EU-North)
+            all_matches = self.validator.find_all_matching_machines(intent.machine)
+            
+            if len(all_matches) > 1:
+                # Multiple machines match - fetch status for ALL of them
+                self.logger.info("multiple_machines_matched", 
+                               query=intent.machine, 
+                               matches=all_matches,
+                               count=len(all_matches))
+                
+                machine_statuses = self._get_machine_statuses(all_matches)
+                
+                return {
+                    'success': True,
+                    'data': {
+                        'machines': machine_statuses,
+                        'count': len(machine_statuses),
+                        'query_term': intent.machine
+                    },
+                    'template': 'multi_machine_status'
+                }
+            else:
+                # Single machine match (existing behavior)
+                data = self._get_machine_status(intent.machine)
+                return {'success': True, 'data': data}
+        else:
+            # No specific machine - check if query is about active/running machines count
+            utterance_lower = intent.utterance.lower() if intent.utterance else ''
+            
+            # Check if query is about listing machines by status
+            if 'how many' in utterance_lower or 'count' in utterance_lower:
+                # Count query - use factory summary for real-time power-based counts
+                # (not database is_active flag which may be stale)
+                factory_data = self._run_async(self.api_client.factory_summary())
+                machines_data = factory_data.get('machines', {})
+                return {
+                    'success': True,
+                    'data': {
+                        'total_machines': machines_data.get('total', 0),
+                        'active_count': machines_data.get('active', 0),
+                        'offline_count': machines_data.get('idle', 0) + machines_data.get('stopped', 0)
+                    },
+                    'template': 'machine_count'
+                }
+            elif 'running' in utterance_lower or 'active' in utterance_lower or 'offline' in utterance_lower:
+                # List machines by status
+                all_machines = self._run_async(self.api_client.list_machines())
+                
+                if 'offline' in utterance_lower:
+                    # List offline machines
+                    filtered = [m for m in all_machines if not m.get('is_active', False)]
+                    filter_type = 'offline'
                 else:
-                    # No specific machine - check if query is about active/running machines count
-                    utterance_lower = intent.utterance.lower() if intent.utterance else ''
-                    
-                    # Check if query is about listing machines by status
-                    if 'how many' in utterance_lower or 'count' in utterance_lower:
-                        # Count query - use factory summary for real-time power-based counts
-                        # (not database is_active flag which may be stale)
-                        factory_data = self._run_async(self.api_client.factory_summary())
-                        machines_data = factory_data.get('machines', {})
-                        return {
-                            'success': True,
-                            'data': {
-                                'total_machines': machines_data.get('total', 0),
-                                'active_count': machines_data.get('active', 0),
-                                'offline_count': machines_data.get('idle', 0) + machines_data.get('stopped', 0)
-                            },
-                            'template': 'machine_count'
-                        }
-                    elif 'running' in utterance_lower or 'active' in utterance_lower or 'offline' in utterance_lower:
-                        # List machines by status
-                        all_machines = self._run_async(self.api_client.list_machines())
-                        
-                        if 'offline' in utterance_lower:
-                            # List offline machines
-                            filtered = [m for m in all_machines if not m.get('is_active', False)]
-                            filter_type = 'offline'
-                        else:
-                            # List running/active machines
-                            filtered = [m for m in all_machines if m.get('is_active', False)]
-                            filter_type = 'active'
-                        
-                        return {
-                            'success': True,
-                            'data': {
-                                'machines': filtered,  # Keep as list of dicts for template
-                                'total_count': len(filtered),
-                                'filter_type': filter_type
-                            },
-                            'template': 'machines_by_status'
-                        }
-                    else:
-                        return {'success': False, 'error': 'No machine specified for status query'}
+                    # List running/active machines
+                    filtered = [m for m in all_machines if m.get('is_active', False)]
+                    filter_type = 'active'
+                
+                return {
+                    'success': True,
+                    'data': {
+                        'machines': filtered,  # Keep as list of dicts for template
+                        'total_count': len(filtered),
+                        'filter_type': filter_type
+                    },
+                    'template': 'machines_by_status'
+                }
+            else:
+                return {'success': False, 'error': 'No machine specified for status query'}
+    
+    def _timeseries_query(self, client_method, intent: Intent,
+                          interval: Optional[str] = None) -> Optional[Tuple[Dict[str, Any], str]]:
+        """
+        Fetch a machine's time series over intent.time_range
+        
+        Args:
+            client_method: ENMSClient.get_power_timeseries or get_energy_timeseries
+            intent: Intent with machine and time_range set
+            interval: Bucket size; derived from the range length when None
             
-            elif intent.intent == IntentType.POWER_QUERY:
-                if intent.machine:
-                    # Machine-specific power query
-                    utterance = getattr(intent, 'utterance', '').lower()
+        Returns:
+            (timeseries, interval), or None if the machine is unknown
+        """
+        machine_id = self._resolve_machine_id(intent.machine)
+        if not machine_id:
+            return None
+        
+        start, end = intent.time_range.start, intent.time_range.end
+        if not interval:
+            days = (end - start).days
+            if days > 7:
+                interval = '1day'
+            elif days > 1:
+                interval = '1hour'
+            else:
+                interval = '15min'
+        
+        timeseries = self._run_async(
+            client_method(machine_id=machine_id, start_time=start, end_time=end, interval=interval)
+        )
+        return timeseries, interval
+    
+    def _api_power_query(self, intent: Intent) -> Dict[str, Any]:
+        """Current, peak/average or time-series power for a machine or the factory"""
+        if intent.machine:
+            # Machine-specific power query
+            utterance = intent.utterance.lower()
+            
+            # Check if asking for peak or average power
+            is_peak_query = 'peak' in utterance or 'maximum' in utterance or 'max' in utterance or 'highest' in utterance
+            is_average_query = 'average' in utterance or 'avg' in utterance or 'mean' in utterance
+            
+            # Check if time range is specified (via time_range or entities)
+            if intent.time_range and intent.time_range.relative not in ["today", "now", None]:
+                # Time-series power query
+                self.logger.info("power_query_timeseries",
+                               machine=intent.machine,
+                               time_range=intent.time_range.relative)
+                
+                fetched = self._timeseries_query(self.api_client.get_power_timeseries, intent)
+                if fetched is None:
+                    return {'success': False, 'error': f"Machine {intent.machine} not found"}
+                timeseries, interval = fetched
+                
+                # Calculate average power from timeseries
+                avg_power = 0
+                points = timeseries.get('data_points')
+                if isinstance(points, list) and points:
+                    avg_power = sum([point.get('value', 0) for point in points]) / len(points)
+                
+                # Structure response for template
+                data = {
+                    'machine': intent.machine,
+                    'time_range': intent.time_range.relative or 'custom',
+                    'start_time': intent.time_range.start,
+                    'end_time': intent.time_range.end,
+                    'timeseries_data': timeseries.get('data_points', []),
+                    'avg_power_kw': avg_power,
+                    'interval': interval
+                }
+                
+                return {'success': True, 'data': data}
+            elif intent.entities:
+                entities = intent.entities
+                
+                if 'start_time' in entities and 'end_time' in entities:
+                    # Time-series query - get power for specific time range
+                    self.logger.info("power_query_timeseries",
+                                   machine=intent.machine,
+                                   start=entities['start_time'].isoformat(),
+                                   end=entities['end_time'].isoformat())
                     
-                    # Check if asking for peak or average power
-                    is_peak_query = 'peak' in utterance or 'maximum' in utterance or 'max' in utterance or 'highest' in utterance
-                    is_average_query = 'average' in utterance or 'avg' in utterance or 'mean' in utterance
+                    # First get machine ID
+                    machine_id = self._resolve_machine_id(intent.machine)
+                    if not machine_id:
+                        return {'success': False, 'error': f"Machine {intent.machine} not found"}
                     
-                    # Check if time range is specified (via time_range or entities)
-                    if intent.time_range and intent.time_range.relative not in ["today", "now", None]:
-                        # Time-series power query
-                        self.logger.info("power_query_timeseries",
-                                       machine=intent.machine,
-                                       time_range=intent.time_range.relative)
-                        
-                        # Get machine ID
-                        machines = self._run_async(self.api_client.list_machines(search=intent.machine))
-                        if not machines:
-                            return {'success': False, 'error': f"Machine {intent.machine} not found"}
-                        
-                        machine_id = machines[0]['id']
-                        
-                        # Determine interval
-                        time_delta = intent.time_range.end - intent.time_range.start
-                        if time_delta.days > 30:
-                            interval = '1day'
-                        elif time_delta.days > 7:
-                            interval = '1day'
-                        elif time_delta.days > 1:
-                            interval = '1hour'
-                        else:
-                            interval = '15min'
-                        
-                        # Get time-series power data
-                        timeseries = self._run_async(
-                            self.api_client.get_power_timeseries(
-                                machine_id=machine_id,
-                                start_time=intent.time_range.start,
-                                end_time=intent.time_range.end,
-                                interval=interval
-                            )
+                    # Get time-series data
+                    data = self._run_async(
+                        self.api_client.get_power_timeseries(
+                            machine_id=machine_id,
+                            start_time=entities['start_time'],
+                            end_time=entities['end_time'],
+                            interval='1hour'
                         )
-                        
-                        # Calculate average power from timeseries
-                        avg_power = 0
-                        if 'data_points' in timeseries and isinstance(timeseries['data_points'], list):
-                            avg_power = sum(point.get('value', 0) for point in timeseries['data_points']) / len(timeseries['data_points'])
-                        
-                        # Structure response for template
-                        data = {
-                            'machine': intent.machine,
-                            'time_range': intent.time_range.relative or 'custom',
-                            'start_time': intent.time_range.start,
-                            'end_time': intent.time_range.end,
-                            'timeseries_data': timeseries.get('data_points', []),
-                            'avg_power_kw': avg_power,
-                            'interval': interval
-                        }
-                        
-                        return {'success': True, 'data': data}
-                    elif hasattr(intent, 'entities') and intent.entities:
-                        entities = intent.entities if isinstance(intent.entities, dict) else {}
-                        
-                        if 'start_time' in entities and 'end_time' in entities:
-                            # Time-series query - get power for specific time range
-                            self.logger.info("power_query_timeseries",
-                                           machine=intent.machine,
-                                           start=entities['start_time'].isoformat(),
-                                           end=entities['end_time'].isoformat())
-                            
-                            # First get machine ID
-                            machines = self._run_async(self.api_client.list_machines(search=intent.machine))
-                            if not machines:
-                                return {'success': False, 'error': f"Machine {intent.machine} not found"}
-                            
-                            machine_id = machines[0]['id']
-                            
-                            # Get time-series data
-                            data = self._run_async(
-                                self.api_client.get_power_timeseries(
-                                    machine_id=machine_id,
-                                    start_time=entities['start_time'],
-                                    end_time=entities['end_time'],
-                                    interval='1hour'
-                                )
-                            )
-                            
-                            # Add machine name to response
-                            data['machine'] = intent.machine
-                            data['time_range'] = entities.get('time_range', 'custom')
-                            
-                            return {'success': True, 'data': data}
+                    )
                     
-                    # Check if asking for peak or average power (need time-series data)
-                    if is_peak_query or is_average_query:
-                        # Get machine ID
-                        machines = self._run_async(self.api_client.list_machines(search=intent.machine))
-                        if not machines:
-                            return {'success': False, 'error': f"Machine {intent.machine} not found"}
-                        
-                        machine_id = machines[0]['id']
-                        
-                        # Default to today if no time range specified
-                        from datetime import datetime, timedelta
-                        if not intent.time_range:
-                            end_time = datetime.now()
-                            start_time = end_time.replace(hour=0, minute=0, second=0, microsecond=0)
-                        else:
-                            start_time = intent.time_range.start
-                            end_time = intent.time_range.end
-                        
-                        # Get time-series power data
-                        timeseries = self._run_async(
-                            self.api_client.get_power_timeseries(
-                                machine_id=machine_id,
-                                start_time=start_time,
-                                end_time=end_time,
-                                interval='15min'
-                            )
-                        )
-                        
-                        # Calculate peak or average from timeseries
-                        data_points = timeseries.get('data_points', [])
-                        if data_points:
-                            power_values = [point.get('value', 0) for point in data_points]
-                            if is_peak_query:
-                                result_value = max(power_values)
-                                query_type = 'peak'
-                            else:
-                                result_value = sum(power_values) / len(power_values)
-                                query_type = 'average'
-                            
-                            data = {
-                                'machine': intent.machine,
-                                'power_kw': result_value,
-                                'query_type': query_type,
-                                'time_range': intent.time_range.relative if intent.time_range else 'today',
-                                'start_time': start_time,
-                                'end_time': end_time
-                            }
-                            return {'success': True, 'data': data, 'custom_template': 'power_aggregated'}
-                        else:
-                            # No data points - fall back to current
-                            data = self._run_async(self.api_client.get_machine_status(intent.machine))
-                            return {'success': True, 'data': data}
+                    # Add machine name to response
+                    data['machine'] = intent.machine
+                    data['time_range'] = entities.get('time_range', 'custom')
                     
-                    # Default: current/today data for specific machine
-                    data = self._run_async(self.api_client.get_machine_status(intent.machine))
                     return {'success': True, 'data': data}
+            
+            # Check if asking for peak or average power (need time-series data)
+            if is_peak_query or is_average_query:
+                # Get machine ID
+                machine_id = self._resolve_machine_id(intent.machine)
+                if not machine_id:
+                    return {'success': False, 'error': f"Machine {intent.machine} not found"}
+                
+                # Default to today if no time range specified
+                from datetime import datetime, timedelta
+                if not intent.time_range:
+                    end_time = datetime.now()
+                    start_time = end_time.replace(hour=0, minute=0, second=0, microsecond=0)
                 else:
-                    # Factory-wide power query (no machine specified) - Priority 3
-                    self.logger.info("power_query_factory_wide", intent="power_query", machine=None)
-                    
-                    # Call /factory/summary endpoint for aggregated data
-                    try:
-                        summary_data = self._run_async(self.api_client.get_factory_summary())
-                        
-                        if summary_data and 'energy' in summary_data:
-                            # Extract power data from factory summary
-                            power_data = {
-                                'current_power_kw': summary_data['energy'].get('current_power_kw', 0),
-                                'avg_power_kw': summary_data['energy'].get('avg_power_kw', 0),
-                                'total_kwh_today': summary_data['energy'].get('total_kwh_today', 0),
-                                'machines_active': summary_data.get('machines', {}).get('active', 0),
-                                'machines_total': summary_data.get('machines', {}).get('total', 0),
-                                'factory_wide': True,
-                                'timestamp': summary_data.get('timestamp')
-                            }
-                            return {'success': True, 'data': power_data, 'template': 'factory_power'}
-                        else:
-                            # Fallback to system_stats if factory/summary unavailable
-                            data = self._run_async(self.api_client.system_stats())
-                            return {'success': True, 'data': data}
-                    except Exception as e:
-                        self.logger.error("factory_summary_failed", error=str(e))
-                        # Fallback to system_stats
-                        data = self._run_async(self.api_client.system_stats())
-                        return {'success': True, 'data': data}
-            
-            elif intent.intent == IntentType.ENERGY_QUERY:
-                if intent.machine:
-                    # Machine-specific energy query
-                    # Debug: Check time_range
-                    self.logger.info("debug_time_range", 
-                                   has_time_range=intent.time_range is not None,
-                                   time_range_value=intent.time_range,
-                                   relative=intent.time_range.relative if intent.time_range else None)
-                    
-                    # Check if utterance mentions interval keywords (hourly, 15-minute, etc.)
-                    utterance_lower = intent.utterance.lower() if hasattr(intent, 'utterance') else ''
-                    needs_timeseries = False
-                    requested_interval = None
-                    
-                    # Check for multi-energy queries
-                    is_energy_types = 'energy types' in utterance_lower or 'energy sources' in utterance_lower or 'what energy' in utterance_lower
-                    is_energy_summary = 'energy summary' in utterance_lower or 'all energy' in utterance_lower
-                    specific_energy_type = None
-                    
-                    if 'electricity' in utterance_lower or 'electric' in utterance_lower:
-                        specific_energy_type = 'electricity'
-                    elif 'natural gas' in utterance_lower or 'gas' in utterance_lower:
-                        specific_energy_type = 'natural_gas'
-                    elif 'steam' in utterance_lower:
-                        specific_energy_type = 'steam'
-                    elif 'compressed air' in utterance_lower or 'air' in utterance_lower:
-                        specific_energy_type = 'compressed_air'
-                    
-                    # Handle multi-energy queries
-                    if is_energy_types or is_energy_summary or specific_energy_type:
-                        # Lookup machine ID
-                        machines = self._run_async(self.api_client.list_machines(search=intent.machine))
-                        if not machines:
-                            return {'success': False, 'error': f'Machine {intent.machine} not found'}
-                        
-                        machine_id = machines[0]['id']
-                        
-                        if is_energy_types:
-                            # List energy types
-                            try:
-                                data = self._run_async(self.api_client.get_energy_types(machine_id=machine_id, hours=24))
-                                data['machine_name'] = intent.machine
-                                return {'success': True, 'data': data, 'template': 'energy_types'}
-                            except Exception as e:
-                                # Fallback: API endpoint not available, use machine status
-                                self.logger.warning("energy_types_fallback", error=str(e), machine=intent.machine)
-                                status_data = self._run_async(self.api_client.get_machine_status(intent.machine))
-                                # Most machines use electricity, Boiler-1 uses multiple types
-                                # Since we can't query energy types, provide basic response
-                                machine_type = status_data.get('machine_type', 'unknown')
-                                if machine_type == 'boiler':
-                                    # Boilers typically use electricity, natural gas, and steam
-                                    energy_types = [
-                                        {'energy_type': 'electricity', 'unit': 'kWh'},
-                                        {'energy_type': 'natural_gas', 'unit': 'm³'},
-                                        {'energy_type': 'steam', 'unit': 'kg'}
-                                    ]
-                                    total = 3
-                                else:
-                                    # Default to electricity only
-                                    energy_types = [{'energy_type': 'electricity', 'unit': 'kWh'}]
-                                    total = 1
-                                
-                                fallback_data = {
-                                    'machine_name': intent.machine,
-                                    'energy_types': energy_types,
-                                    'total_energy_types': total
-                                }
-                                return {'success': True, 'data': fallback_data, 'template': 'energy_types'}
-                        elif is_energy_summary:
-                            # Multi-energy summary
-                            data = self._run_async(self.api_client.get_energy_summary(machine_id=machine_id))
-                            data['machine_name'] = intent.machine
-                            return {'success': True, 'data': data, 'template': 'energy_summary'}
-                        elif specific_energy_type:
-                            # Specific energy type readings
-                            data = self._run_async(self.api_client.get_energy_readings(
-                                machine_id=machine_id,
-                                energy_type=specific_energy_type,
-                                hours=24
-                            ))
-                            data['machine_name'] = intent.machine
-                            data['energy_type'] = specific_energy_type
-                            return {'success': True, 'data': data, 'custom_template': 'energy_type_readings'}
-                    
-                    if 'hourly' in utterance_lower or 'hour by hour' in utterance_lower:
-                        needs_timeseries = True
-                        requested_interval = '1hour'
-                    elif '15-minute' in utterance_lower or '15 minute' in utterance_lower or 'fifteen minute' in utterance_lower:
-                        needs_timeseries = True
-                        requested_interval = '15min'
-                    elif '5-minute' in utterance_lower or '5 minute' in utterance_lower:
-                        needs_timeseries = True
-                        requested_interval = '5min'
-                    elif 'daily' in utterance_lower or 'day by day' in utterance_lower:
-                        needs_timeseries = True
-                        requested_interval = '1day'
+                    start_time = intent.time_range.start
+                    end_time = intent.time_range.end
+                
+                # Get time-series power data
+                timeseries = self._run_async(
+                    self.api_client.get_power_timeseries(
+                        machine_id=machine_id,
+                        start_time=start_time,
+                        end_time=end_time,
+                        interval='15min'
+                    )
+                )
+                
+                # Calculate peak or average from timeseries
+                data_points = timeseries.get('data_points', [])
+                if data_points:
+                    power_values = [point.get('value', 0) for point in data_points]
+                    if is_peak_query:
+                        result_value = max(power_values)
+                        query_type = 'peak'
+                    else:
+                        result_value = sum(power_values) / len(power_values)
+                        query_type = 'average'
                     
-                    # Check if time range is specified (beyond "today") OR if interval keywords detected
-                    if intent.time_range and (intent.time_range.relative not in ["today", "now", None] or needs_timeseries):
-                        # Time-series query - get energy for specific time range
-                        self.logger.info("energy_query_timeseries",
-                                       machine=intent.machine,
-                                       start=intent.time_range.start.isoformat(),
-                                       end=intent.time_range.end.isoformat(),
-                                       relative=intent.time_range.relative,
-                                       needs_timeseries=needs_timeseries,
-                                       requested_interval=requested_interval)
-                        
-                        # First get machine ID
-                        machines = self._run_async(self.api_client.list_machines(search=intent.machine))
-                        if not machines:
-                            return {'success': False, 'error': f"Machine {intent.machine} not found"}
-                        
-                        machine_id = machines[0]['id']
-                        
-                        # Determine interval based on explicit request or time range
-                        if requested_interval:
-                            interval = requested_interval
-                        else:
-                            time_delta = intent.time_range.end - intent.time_range.start
-                            if time_delta.days > 30:
-                                interval = '1day'
-                            elif time_delta.days > 7:
-                                interval = '1day'  # Changed from 6hour
-                            elif time_delta.days > 1:
-                                interval = '1hour'
-                            else:
-                                interval = '15min'
-                        
-                        # Get time-series data
-                        timeseries = self._run_async(
-                            self.api_client.get_energy_timeseries(
-                                machine_id=machine_id,
-                                start_time=intent.time_range.start,
-                                end_time=intent.time_range.end,
-                                interval=interval
-                            )
-                        )
-                        
-                        # Calculate total energy and parse timestamps
-                        total_energy = 0
-                        data_points_parsed = []
-                        if 'data_points' in timeseries and isinstance(timeseries['data_points'], list):
-                            for point in timeseries['data_points']:
-                                total_energy += point.get('value', 0)
-                                # Parse timestamp string to datetime for voice_time filter
-                                timestamp_str = point.get('timestamp')
-                                if timestamp_str:
-                                    try:
-                                        from dateutil import parser as date_parser
-                                        timestamp_dt = date_parser.parse(timestamp_str)
-                                    except:
-                                        timestamp_dt = timestamp_str
-                                    data_points_parsed.append({
-                                        'timestamp': timestamp_dt,
-                                        'value': point.get('value', 0),
-                                        'unit': point.get('unit', 'kWh')
-                                    })
-                        
-                        # Detect trend/pattern queries
-                        utterance = getattr(intent, 'utterance', '').lower() if hasattr(intent, 'utterance') else ''
-                        is_trend_query = 'trend' in utterance or 'pattern' in utterance
-                        
-                        # Calculate trend analysis if requested
-                        trend_periods = None
-                        if is_trend_query and len(data_points_parsed) > 3:
-                            # Divide into 3-4 periods based on data density
-                            num_periods = 3 if len(data_points_parsed) <= 24 else 4
-                            period_size = len(data_points_parsed) // num_periods
-                            trend_periods = []
-                            
-                            for i in range(num_periods):
-                                start_idx = i * period_size
-                                end_idx = start_idx + period_size if i < num_periods - 1 else len(data_points_parsed)
-                                period_data = data_points_parsed[start_idx:end_idx]
-                                
-                                if period_data:
-                                    period_total = sum(p['value'] for p in period_data)
-                                    period_avg = period_total / len(period_data)
-                                    period_start = period_data[0]['timestamp']
-                                    period_end = period_data[-1]['timestamp']
-                                    
-                                    # Find peak hour in this period
-                                    peak_point = max(period_data, key=lambda p: p['value'])
-                                    
-                                    trend_periods.append({
-                                        'start_time': period_start,
-                                        'end_time': period_end,
-                                        'total_kwh': round(period_total, 2),
-                                        'avg_kwh': round(period_avg, 1),
-                                        'peak_kwh': round(peak_point['value'], 1),
-                                        'peak_time': peak_point['timestamp']
-                                    })
-                        
-                        # Structure response for template
-                        data = {
-                            'machine': intent.machine,
-                            'time_range': intent.time_range.relative or 'custom',
-                            'start_time': intent.time_range.start,
-                            'end_time': intent.time_range.end,
-                            'timeseries_data': data_points_parsed,
-                            'total_energy_kwh': total_energy,
-                            'interval': interval,
-                            'is_trend_query': is_trend_query,
-                            'trend_periods': trend_periods
-                        }
-                        
-                        return {'success': True, 'data': data}
-                    
-                    # Default: current/today data for specific machine
-                    data = self._run_async(self.api_client.get_machine_status(intent.machine))
-                    
-                    # Check if user asked for average per hour or trend/pattern analysis
-                    utterance = getattr(intent, 'utterance', '').lower() if hasattr(intent, 'utterance') else ''
-                    if isinstance(data, dict):
-                        if 'average' in utterance or 'per hour' in utterance or 'hourly average' in utterance:
-                            data['is_average_query'] = True
-                        
-                        # Detect trend/pattern queries for aggregated time-series analysis
-                        if 'trend' in utterance or 'pattern' in utterance:
-                            data['is_trend_query'] = True
-                    
-                    return {'success': True, 'data': data}
-                else:
-                    # Factory-wide energy query (no machine specified) - Priority 3
-                    self.logger.info("energy_query_factory_wide", intent="energy_query", machine=None)
-                    
-                    # Call /factory/summary endpoint for aggregated data
-                    try:
-                        summary_data = self._run_async(self.api_client.get_factory_summary())
-                        
-                        if summary_data and 'energy' in summary_data:
-                            # Extract energy data from factory summary
-                            energy_data = {
-                                'total_kwh_today': summary_data['energy'].get('total_kwh_today', 0),
-                                'current_power_kw': summary_data['energy'].get('current_power_kw', 0),
-                                'avg_power_kw': summary_data['energy'].get('avg_power_kw', 0),
-                                'total_cost_usd': summary_data.get('costs', {}).get('total_usd_today', 0),
-                                'machines_active': summary_data.get('machines', {}).get('active', 0),
-                                'machines_total': summary_data.get('machines', {}).get('total', 0),
-                                'factory_wide': True,
-                                'timestamp': summary_data.get('timestamp')
-                            }
-                            return {'success': True, 'data': energy_data, 'template': 'factory_energy'}
-                        else:
-                            # Fallback to system_stats if factory/summary unavailable
-                            data = self._run_async(self.api_client.system_stats())
-                            return {'success': True, 'data': data}
-                    except Exception as e:
-                        self.logger.error("factory_summary_failed", error=str(e))
-                        # Fallback to system_stats
-                        data = self._run_async(self.api_client.system_stats())
-                        return {'success': True, 'data': data}
-            
-            elif intent.intent == IntentType.SEUS:
-                # Significant Energy Uses (SEUs) queries
-                utterance = getattr(intent, 'utterance', '').lower() if hasattr(intent, 'utterance') else ''
-                
-                # Extract energy source from intent or utterance
-                energy_source = intent.energy_source
-                if not energy_source:
-                    if 'electricity' in utterance or 'electric' in utterance:
-                        energy_source = 'electricity'
-                    elif 'gas' in utterance or 'natural gas' in utterance:
-                        energy_source = 'natural_gas'
-                    elif 'steam' in utterance:
-                        energy_source = 'steam'
-                    elif 'compressed air' in utterance:
-                        energy_source = 'compressed_air'
-                
-                # Check for baseline filtering
-                asking_without_baseline = any(phrase in utterance for phrase in [
-                    "don't have", "doesn't have", "do not have", "does not have",
-                    "without baseline", "without basline",
-                    "no baseline", "no basline",
-                    "need baseline", "need basline",
-                    "missing baseline", "missing basline"
-                ])
-                asking_with_baseline = any(phrase in utterance for phrase in [
-                    "have baseline", "have basline",
-                    "has baseline", "has basline",
-                    "with baseline", "with basline"
-                ])
-                
-                data = self._run_async(self.api_client.list_seus(energy_source=energy_source))
-                
-                # Filter by baseline status if requested
-                if isinstance(data, dict):
-                    if asking_without_baseline:
-                        data['seus'] = [seu for seu in data.get('seus', []) if not seu.get('has_baseline')]
-                        data['total_count'] = len(data['seus'])
-                        data['filter_type'] = 'without_baseline'
-                    elif asking_with_baseline:
-                        data['seus'] = [seu for seu in data.get('seus', []) if seu.get('has_baseline')]
-                        data['total_count'] = len(data['seus'])
-                        data['filter_type'] = 'with_baseline'
-                
-                return {'success': True, 'data': data, 'template': 'seus'}
-            
-            elif intent.intent == IntentType.FACTORY_OVERVIEW:
-                # Check if this is a health/status check vs stats query
-                utterance = getattr(intent, 'utterance', '').lower() if hasattr(intent, 'utterance') else ''
-                
-                # Check for machine listing queries ("list all machines", "show machines")
-                if re.search(r'\b(?:list|show)\s+(?:all\s+)?machines', utterance):
-                    machines = self._run_async(self.api_client.list_machines())
-                    machine_names = [m.get('name', m.get('machine_name', 'Unknown')) for m in machines]
-                    return {
-                        'success': True,
-                        'data': {
-                            'machines': machine_names,
-                            'count': len(machines)
-                        },
-                        'template': 'machine_list'
+                    data = {
+                        'machine': intent.machine,
+                        'power_kw': result_value,
+                        'query_type': query_type,
+                        'time_range': intent.time_range.relative if intent.time_range else 'today',
+                        'start_time': start_time,
+                        'end_time': end_time
                     }
-                
-                # Check for carbon/emissions queries
-                if 'carbon' in utterance or 'emission' in utterance or 'co2' in utterance:
-                    data = self._run_async(self.api_client.system_stats())
-                    # Mark as carbon query for template
-                    if isinstance(data, dict):
-                        data['is_carbon_query'] = True
+                    return {'success': True, 'data': data, 'custom_template': 'power_aggregated'}
+                else:
+                    # No data points - fall back to current
+                    data = self._get_machine_status(intent.machine)
                     return {'success': True, 'data': data}
+            
+            # Default: current/today data for specific machine
+            data = self._get_machine_status(intent.machine)
+            return {'success': True, 'data': data}
+        else:
+            # Factory-wide power query (no machine specified) - Priority 3
+            self.logger.info("power_query_factory_wide", intent="power_query", machine=None)
+            
+            # Call /factory/summary endpoint for aggregated data
+            try:
+                summary_data = self._run_async(self.api_client.get_factory_summary())
                 
-                # Check for active/offline machine queries
-                if re.search(r'\b(?:active|online|running|inactive|offline|stopped)\b.*?\b(?:machines?|equipment)\b', utterance):
-                    is_active = bool(re.search(r'\b(?:active|online|running)\b', utterance))
-                    machines = self._run_async(self.api_client.list_machines(is_active=is_active))
-                    
-                    return {
-                        'success': True,
-                        'data': {
-                            'machines': machines,
-                            'total_count': len(machines),
-                            'filter_type': 'active' if is_active else 'offline'
-                        },
-                        'template': 'machines_by_status'
+                if summary_data and 'energy' in summary_data:
+                    # Extract power data from factory summary
+                    power_data = {
+                        'current_power_kw': summary_data['energy'].get('current_power_kw', 0),
+                        'avg_power_kw': summary_data['energy'].get('avg_power_kw', 0),
+                        'total_kwh_today': summary_data['energy'].get('total_kwh_today', 0),
+                        'machines_active': summary_data.get('machines', {}).get('active', 0),
+                        'machines_total': summary_data.get('machines', {}).get('total', 0),
+                        'factory_wide': True,
+                        'timestamp': summary_data.get('timestamp')
                     }
-                
-                # Check for performance engine health
-                if 'performance engine' in utterance or ('engine' in utterance and 'running' in utterance):
-                    data = self._run_async(self.api_client.get_performance_health())
-                    return {'success': True, 'data': data, 'template': 'performance_health'}
-                elif 'opportunities' in utterance or 'saving' in utterance:
-                    # Get factory_id from first machine (all machines share same factory)
-                    machines = self._run_async(self.api_client.list_machines())
-                    factory_id = machines[0]['factory_id'] if machines else None
-                    
-                    if not factory_id:
-                        return {'success': False, 'error': 'Could not determine factory ID'}
-                    
-                    # Get all opportunities from API
-                    data = self._run_async(self.api_client.get_performance_opportunities(
-                        factory_id=factory_id,
-                        period='week'
-                    ))
-                    
-                    # Filter by SEU name if specified (API doesn't support filtering)
-                    if intent.machine:
-                        filtered_opps = [opp for opp in data.get('opportunities', []) 
-                                        if opp.get('seu_name') == intent.machine]
-                        
-                        if filtered_opps:
-                            # Update data with filtered opportunities
-                            data['opportunities'] = filtered_opps
-                            data['total_opportunities'] = len(filtered_opps)
-                            # Recalculate total savings
-                            data['total_potential_savings_kwh'] = sum(o.get('potential_savings_kwh', 0) for o in filtered_opps)
-                            data['total_potential_savings_usd'] = sum(o.get('potential_savings_usd', 0) for o in filtered_opps)
-                        else:
-                            # No opportunities for this specific machine
-                            data['opportunities'] = []
-                            data['total_opportunities'] = 0
-                            data['total_potential_savings_kwh'] = 0
-                            data['total_potential_savings_usd'] = 0
-                    
-                    return {'success': True, 'data': data, 'template': 'opportunities'}
-                elif 'action plan' in utterance and 'list' in utterance:
-                    # List ISO action plans (check BEFORE create action plan)
-                    status_filter = None
-                    priority_filter = None
-                    
-                    if 'completed' in utterance or 'complete' in utterance:
-                        status_filter = 'completed'
-                    elif 'in progress' in utterance or 'active' in utterance:
-                        status_filter = 'in_progress'
-                    elif 'planned' in utterance:
-                        status_filter = 'planned'
-                    
-                    if 'high priority' in utterance or 'critical' in utterance:
-                        priority_filter = 'high' if 'high' in utterance else 'critical'
-                    
-                    # Get factory_id
-                    machines = self._run_async(self.api_client.list_machines())
-                    factory_id = machines[0]['factory_id'] if machines else "11111111-1111-1111-1111-111111111111"
-                    
-                    data = self._run_async(self.api_client.list_action_plans(
-                        factory_id=factory_id,
-                        status=status_filter,
-                        priority=priority_filter
-                    ))
-                    return {'success': True, 'data': data, 'template': 'action_plans_list'}
-                elif 'action plan' in utterance or 'create plan' in utterance:
-                    # Create action plan for improvement
-                    if not intent.machine:
-                        return {'success': False, 'error': 'Machine name required for action plan'}
-                    
-                    # Determine issue type from query or use default
-                    issue_type = 'inefficient_scheduling'  # default
-                    if 'idle' in utterance:
-                        issue_type = 'excessive_idle'
-                    elif 'drift' in utterance or 'degradation' in utterance or 'efficiency' in utterance:
-                        issue_type = 'baseline_drift'
-                    elif 'setpoint' in utterance or 'setting' in utterance:
-                        issue_type = 'suboptimal_setpoints'
-                    
-                    data = self._run_async(self.api_client.create_action_plan(
-                        seu_name=intent.machine,
-                        issue_type=issue_type
-                    ))
-                    return {'success': True, 'data': data, 'template': 'action_plan'}
-                
-                # Define health keywords for health check detection
-                health_keywords = ['health', 'status', 'alive', 'running', 'online', 'api status', 'system status', 'database']
-                if any(keyword in utterance for keyword in health_keywords):
-                    # Health check query - use /health endpoint
-                    data = self._run_async(self.api_client.health_check())
-                    return {'success': True, 'data': data}
-                elif 'summary' in utterance:
-                    # Factory summary - comprehensive overview
-                    data = self._run_async(self.api_client.factory_summary())
-                    return {'success': True, 'data': data, 'template': 'factory_summary'}
-                elif 'significant energy' in utterance or 'list seus' in utterance or 'energy uses' in utterance:
-                    # List SEUs (significant energy uses)
-                    # Check if filtering by energy source
-                    energy_source = None
-                    if 'electricity' in utterance or 'electric' in utterance:
-                        energy_source = 'electricity'
-                    elif 'gas' in utterance or 'natural gas' in utterance:
-                        energy_source = 'natural_gas'
-                    elif 'steam' in utterance:
-                        energy_source = 'steam'
-                    
-                    data = self._run_async(self.api_client.list_seus(energy_source=energy_source))
-                    return {'success': True, 'data': data, 'template': 'seus_list'}
-                elif 'seu' in utterance or 'significant energy' in utterance or 'energy uses' in utterance:
-                    # SEU queries (with typo tolerance for common misspellings)
-                    asking_without_baseline = any(phrase in utterance for phrase in [
-                        "don't have", "doesn't have", "do not have", "does not have",
-                        "without baseline", "without basline",  # typo tolerance
-                        "no baseline", "no basline",  # typo tolerance
-                        "need baseline", "need basline",  # typo tolerance
-                        "missing baseline", "missing basline"  # typo tolerance
-                    ])
-                    asking_with_baseline = any(phrase in utterance for phrase in [
-                        "have baseline", "have basline",  # typo tolerance
-                        "has baseline", "has basline",  # typo tolerance
-                        "with baseline", "with basline"  # typo tolerance
-                    ])
-                    
-                    energy_source = None
-                    if 'electricity' in utterance or 'electric' in utterance:
-                        energy_source = 'electricity'
-                    elif 'gas' in utterance or 'natural gas' in utterance:
-                        energy_source = 'natural_gas'
-                    elif 'steam' in utterance:
-                        energy_source = 'steam'
-                    
-                    data = self._run_async(self.api_client.list_seus(energy_source=energy_source))
-                    
-                    # Filter by baseline status if requested
-                    if asking_without_baseline:
-                        data['seus'] = [seu for seu in data.get('seus', []) if not seu.get('has_baseline')]
-                        data['total_count'] = len(data['seus'])
-                        data['filter_type'] = 'without_baseline'
-                    elif asking_with_baseline:
-                        data['seus'] = [seu for seu in data.get('seus', []) if seu.get('has_baseline')]
-                        data['total_count'] = len(data['seus'])
-                        data['filter_type'] = 'with_baseline'
-                    
-                    return {'success': True, 'data': data, 'template': 'seus'}
-                elif 'enpi' in utterance or 'iso' in utterance or 'compliance report' in utterance or 'energy performance indicator' in utterance:
-                    # ISO 50001 EnPI report
-                    # Extract period from utterance (Q1, Q2, Q3, Q4, or year)
-                    # Note: re and datetime are imported at module level
-                    
-                    period = None
-                    
-                    # Check for quarters
-                    quarter_match = re.search(r'q[1-4]|quarter\s*[1-4]', utterance, re.IGNORECASE)
-                    if quarter_match:
-                        quarter_text = quarter_match.group().lower()
-                        quarter_num = re.search(r'[1-4]', quarter_text).group()
-                        # Get year from utterance or use current year
-                        year_match = re.search(r'20\d{2}', utterance)
-                        year = year_match.group() if year_match else str(datetime.now().year)
-                        period = f"{year}-Q{quarter_num}"
-                    else:
-                        # Check for explicit year (e.g., "2025")
-                        year_match = re.search(r'20\d{2}', utterance)
-                        if year_match:
-                            period = year_match.group()
-                        else:
-                            # Default to current quarter
-                            now = datetime.now()
-                            current_quarter = (now.month - 1) // 3 + 1
-                            period = f"{now.year}-Q{current_quarter}"
-                    
-                    # Get factory_id from first machine
-                    machines = self._run_async(self.api_client.list_machines())
-                    factory_id = machines[0]['factory_id'] if machines else "11111111-1111-1111-1111-111111111111"
-                    
-                    data = self._run_async(self.api_client.get_enpi_report(
-                        factory_id=factory_id,
-                        period=period
-                    ))
-                    return {'success': True, 'data': data, 'template': 'enpi_report'}
-                elif 'aggregat' in utterance and intent.time_range:
-                    # Aggregated stats with time range
-                    data = self._run_async(self.api_client.aggregated_stats(
-                        start_time=intent.time_range.start,
-                        end_time=intent.time_range.end,
-                        machine_ids='all'
-                    ))
-                    # Use aggregated_stats template instead of factory_overview
-                    return {'success': True, 'data': data, 'template': 'aggregated_stats'}
+                    return {'success': True, 'data': power_data, 'template': 'factory_power'}
                 else:
-                    # General stats query - use /stats/system endpoint
+                    # Fallback to system_stats if factory/summary unavailable
                     data = self._run_async(self.api_client.system_stats())
-                
+                    return {'success': True, 'data': data}
+            except Exception as e:
+                self.logger.error("factory_summary_failed", error=str(e))
+                # Fallback to system_stats
+                data = self._run_async(self.api_client.system_stats())
                 return {'success': True, 'data': data}
-            
-            elif intent.intent == IntentType.MACHINE_LIST:
-                # List all machines or search for specific machines
-                utterance = getattr(intent, 'utterance', '').lower() if hasattr(intent, 'utterance') else ''
-                search_term = None
-                location_filter = intent.params.get('location') if intent.params else None
-                
-                # Extract search term from common patterns
-                search_patterns = [
-                    r'\b(HVAC|Boiler|Compressor|Conveyor|Turbine|Hydraulic|Injection)s?\b',
-                    r'\bfind.*?(?:the\s+)?(\w+)\b',
-                    r'\bhow\s+many\s+(\w+)\b',
-                ]
-                
-                for pattern in search_patterns:
-                    match = re.search(pattern, utterance, re.IGNORECASE)
-                    if match:
-                        search_term = match.group(1).rstrip('s')  # Remove plural 's'
-                        break
-                
-                # Call list_machines with optional search parameter
-                if search_term:
-                    machines = self._run_async(self.api_client.list_machines(search=search_term))
-                else:
-                    machines = self._run_async(self.api_client.list_machines())
-                
-                # Filter by location if specified
-                if location_filter:
-                    machines = [m for m in machines if location_filter.upper() in m['name'].upper()]
-                    self.logger.info("location_filter_applied", location=location_filter, count=len(machines))
-                
-                # Extract just the names for voice response
-                machine_names = [m['name'] for m in machines]
-                return {'success': True, 'data': {'machines': machine_names, 'count': len(machines), 'location': location_filter}}
-            
-            elif intent.intent == IntentType.RANKING:
-                # Top N ranking by metric (not machine list)
-                limit = intent.limit or 5
-                ranking_metric = getattr(intent, 'ranking_metric', 'consumption')
+    
+    def _api_energy_query(self, intent: Intent) -> Dict[str, Any]:
+        """Energy consumption, energy-type breakdowns and time series"""
+        if intent.machine:
+            # Machine-specific energy query
+            # Debug: Check time_range
+            self.logger.info("debug_time_range", 
+                           has_time_range=intent.time_range is not None,
+                           time_range_value=intent.time_range,
+                           relative=intent.time_range.relative if intent.time_range else None)
+            
+            # Check if utterance mentions interval keywords (hourly, 15-minute, etc.)
+            utterance_lower = intent.utterance.lower()
+            needs_timeseries = False
+            requested_interval = None
+            
+            # Check for multi-energy queries
+            is_energy_types = 'energy types' in utterance_lower or 'energy sources' in utterance_lower or 'what energy' in utterance_lower
+            is_energy_summary = 'energy summary' in utterance_lower or 'all energy' in utterance_lower
+            specific_energy_type = None
+            
+            if 'electricity' in utterance_lower or 'electric' in utterance_lower:
+                specific_energy_type = 'electricity'
+            elif 'natural gas' in utterance_lower or 'gas' in utterance_lower:
+                specific_energy_type = 'natural_gas'
+            elif 'steam' in utterance_lower:
+                specific_energy_type = 'steam'
+            elif 'compressed air' in utterance_lower or 'air' in utterance_lower:
+                specific_energy_type = 'compressed_air'
+            
+            # Handle multi-energy queries
+            if is_energy_types or is_energy_summary or specific_energy_type:
+                # Lookup machine ID
+                machine_id = self._resolve_machine_id(intent.machine)
+                if not machine_id:
+                    return {'success': False, 'error': f'Machine {intent.machine} not found'}
                 
-                # For efficiency queries, get all machines and calculate efficiency
-                if ranking_metric == 'efficiency':
+                if is_energy_types:
+                    # List energy types
                     try:
-                        from datetime import timedelta
-                        # Get all machines with energy + production data
-                        machines = self._run_async(self.api_client.list_machines())
-                        
-                        # Time range: last 24 hours
-                        end_time = datetime.now(timezone.utc)
-                        start_time = end_time - timedelta(days=1)
-                        
-                        efficiency_data = []
-                        for machine in machines[:10]:  # Limit to first 10 for performance
-                            try:
-                                # Get energy consumption using correct API method
-                                energy_data = self._run_async(self.api_client.get_energy_timeseries(
-                                    machine_id=machine['id'],
-                                    start_time=start_time,
-                                    end_time=end_time,
-                                    interval='1day'
-                                ))
-                                
-                                # Get production if available
-                                try:
-                                    production = self._run_async(self.api_client.get_machine_production(
-                                        machine_id=machine['id'],
-                                        limit=1
-                                    ))
-                                    units = production[0]['units_produced'] if production else None
-                                except:
-                                    units = None
-                                
-                                # Extract energy from response
-                                data_points = energy_data.get('data', {}).get('data_points', [])
-                                if not data_points or len(data_points) == 0:
-                                    self.logger.warning("no_energy_data", machine=machine['name'])
-                                    continue
-                                    
-                                energy_kwh = data_points[0].get('value', 0)
-                                
-                                if energy_kwh == 0:
-                                    self.logger.warning("zero_energy", machine=machine['name'])
-                                    continue
-                                
-                                # Calculate efficiency: units per kWh
-                                if units and units > 0 and energy_kwh > 0:
-                                    efficiency = units / energy_kwh
-                                else:
-                                    # Use inverse of energy as proxy (lower energy = better)
-                                    efficiency = 1.0 / energy_kwh if energy_kwh > 0 else 0
-                                
-                                efficiency_data.append({
-                                    'machine_name': machine['name'],
-                                    'efficiency_score': efficiency,
-                                    'energy_kwh': energy_kwh,
-                                    'units_produced': units or 0
-                                })
-                            except Exception as e:
-                                self.logger.warning("efficiency_calc_failed", machine=machine['name'], error=str(e))
-                                import traceback
-                                self.logger.debug("efficiency_traceback", trace=traceback.format_exc())
-                                continue
-                        
-                        # Sort by efficiency (highest first)
-                        efficiency_data.sort(key=lambda x: x['efficiency_score'], reverse=True)
+                        data = self._run_async(self.api_client.get_energy_types(machine_id=machine_id, hours=24))
+                        data['machine_name'] = intent.machine
+                        return {'success': True, 'data': data, 'template': 'energy_types'}
+                    except Exception as e:
+                        # Fallback: API endpoint not available, use machine status
+                        self.logger.warning("energy_types_fallback", error=str(e), machine=intent.machine)
+                        status_data = self._get_machine_status(intent.machine)
+                        # Most machines use electricity, Boiler-1 uses multiple types
+                        # Since we can't query energy types, provide basic response
+                        machine_type = status_data.get('machine_type', 'unknown')
+                        if machine_type == 'boiler':
+                            # Boilers typically use electricity, natural gas, and steam
+                            energy_types = [
+                                {'energy_type': 'electricity', 'unit': 'kWh'},
+                                {'energy_type': 'natural_gas', 'unit': 'm³'},
+                                {'energy_type': 'steam', 'unit': 'kg'}
+                            ]
+                            total = 3
+                        else:
+                            # Default to electricity only
+                            energy_types = [{'energy_type': 'electricity', 'unit': 'kWh'}]
+                            total = 1
                         
-                        return {
-                            'success': True,
-                            'data': {
-                                'machines': efficiency_data[:limit],
-                                'ranking_type': 'efficiency',
-                                'total_machines': len(efficiency_data)
-                            }
+                        fallback_data = {
+                            'machine_name': intent.machine,
+                            'energy_types': energy_types,
+                            'total_energy_types': total
                         }
-                    except Exception as e:
-                        self.logger.error("efficiency_ranking_failed", error=str(e))
-                        import traceback
-                        self.logger.error("efficiency_traceback", trace=traceback.format_exc())
-                        # Fallback to energy consumption ranking
-                        ranking_metric = 'consumption'
-                
-                # Standard consumption/cost ranking
-                metric = 'energy' if ranking_metric == 'consumption' else ranking_metric
-                data = self._run_async(self.api_client.get_top_consumers(limit=limit, metric=metric))
-                return {'success': True, 'data': data}
-            
-            elif intent.intent == IntentType.COMPARISON and intent.machines:
-                # Multi-machine energy comparison
-                try:
-                    # Get machine IDs for all machines in comparison
-                    machine_ids = []
-                    machine_names = []
-                    
-                    for machine_name in intent.machines:
-                        machines = self._run_async(self.api_client.list_machines(search=machine_name))
-                        if not machines:
-                            self.logger.warning("comparison_machine_not_found", machine=machine_name)
-                            continue
-                        machine_ids.append(machines[0]['id'])
-                        machine_names.append(machines[0]['name'])
-                    
-                    if len(machine_ids) < 2:
-                        return {'success': False, 'error': "Need at least 2 machines to compare"}
-                    
-                    # Get time range (default: today)
-                    if intent.time_range and intent.time_range.start and intent.time_range.end:
-                        start_time = intent.time_range.start
-                        end_time = intent.time_range.end
-                    else:
-                        # Default: today
-                        end_time = datetime.now(timezone.utc)
-                        start_time = end_time.replace(hour=0, minute=0, second=0, microsecond=0)
-                    
-                    # Call multi-machine comparison API
-                    data = self._run_async(self.api_client.get_multi_machine_energy(
-                        machine_ids=machine_ids,
-                        start_time=start_time,
-                        end_time=end_time,
-                        interval="1hour"
-                    ))
-                    
-                    # Calculate total energy for each machine from data_points
-                    machines_with_totals = []
-                    for machine in data.get('machines', []):
-                        total_energy = sum(dp['value'] for dp in machine.get('data_points', []))
-                        machines_with_totals.append({
-                            'machine_name': machine['machine_name'],
-                            'total_energy': total_energy,
-                            'data_points': machine.get('data_points', [])
-                        })
-                    
-                    # Add machine names for template
-                    data['machines'] = machines_with_totals
-                    data['machine_names'] = machine_names
-                    data['time_period'] = f"today ({start_time.strftime('%Y-%m-%d')})"
-                    
-                    return {'success': True, 'data': data}
-                    
-                except Exception as e:
-                    self.logger.error("comparison_failed", error=str(e), machines=intent.machines)
-                    return {'success': False, 'error': f"Comparison failed: {str(e)}"}
-            
-            elif intent.intent == IntentType.COST_ANALYSIS:
-                # Extract machine if not provided by Adapt parser
-                machine = intent.machine
-                if not machine:
-                    # Try to extract from utterance using validator's whitelist
-                    utterance = getattr(intent, 'utterance', '')
-                    machine_whitelist = self.validator.machine_whitelist if hasattr(self, 'validator') else []
-                    for machine_name in machine_whitelist:
-                        if machine_name.lower() in utterance.lower():
-                            machine = machine_name
-                            break
-                
-                if machine:
-                    # Machine-specific cost
-                    data = self._run_async(self.api_client.get_machine_status(machine))
-                    return {'success': True, 'data': data}
-                else:
-                    # Factory-wide cost - use system_stats which has cost data
-                    data = self._run_async(self.api_client.system_stats())
-                    # Extract cost information for cost_analysis template
-                    cost_data = {
-                        'estimated_cost': data.get('estimated_cost', 0),
-                        'cost_per_day': data.get('cost_per_day', 0),
-                        'total_energy': data.get('total_energy', 0),
-                        'energy_per_hour': data.get('energy_per_hour', 0)
-                    }
-                    return {'success': True, 'data': cost_data}
-            
-            elif intent.intent == IntentType.ANOMALY_DETECTION:
-                self.logger.info("🔍 ANOMALY_HANDLER_START", machine=intent.machine)
-                # Check what type of anomaly query this is
-                utterance = getattr(intent, 'utterance', '').lower()
-                self.logger.info("🔍 anomaly_utterance_check", utterance=utterance[:50])
-                is_detection_request = any(kw in utterance for kw in ['check for', 'detect', 'scan for', 'analyze for']) and intent.machine
-                is_active_request = any(kw in utterance for kw in ['active', 'unresolved', 'alerts', 'need attention'])
-                is_search_request = any(kw in utterance for kw in ['find', 'search']) and intent.time_range and intent.time_range.start
-                self.logger.info("🔍 anomaly_type_determined", detection=is_detection_request, active=is_active_request, search=is_search_request)
-                
-                # Extract severity from utterance (critical, warning, info)
-                severity = None
-                if 'critical' in utterance:
-                    severity = 'critical'
-                elif 'warning' in utterance or 'warn' in utterance:
-                    severity = 'warning'
-                elif 'info' in utterance or 'information' in utterance:
-                    severity = 'info'
-                
-                if is_detection_request:
-                    # RUN ML anomaly detection - POST /anomaly/detect
-                    machines = self._run_async(self.api_client.list_machines(search=intent.machine))
-                    if not machines:
-                        return {'success': False, 'error': f"Machine {intent.machine} not found"}
-                    
-                    machine_id = machines[0]['id']
-                    
-                    # Get time range (default: today)
-                    if intent.time_range and intent.time_range.start and intent.time_range.end:
-                        start_time = intent.time_range.start
-                        end_time = intent.time_range.end
-                    else:
-                        end_time = datetime.now(timezone.utc)
-                        start_time = end_time.replace(hour=0, minute=0, second=0, microsecond=0)
-                    
-                    # Run ML detection
-                    data = self._run_async(self.api_client.detect_anomalies(
-                        machine_id=machine_id,
-                        start=start_time,
-                        end=end_time
-                    ))
+                        return {'success': True, 'data': fallback_data, 'template': 'energy_types'}
+                elif is_energy_summary:
+                    # Multi-energy summary
+                    data = self._run_async(self.api_client.get_energy_summary(machine_id=machine_id))
                     data['machine_name'] = intent.machine
-                    data['is_detection'] = True
-                    return {'success': True, 'data': data}
-                
-                elif is_active_request:
-                    # GET active (unresolved) anomalies - GET /anomaly/active
-                    data = self._run_async(self.api_client.get_active_anomalies())
-                    data['is_active'] = True
-                    return {'success': True, 'data': data}
-                
-                elif is_search_request:
-                    # SEARCH anomalies by date range - GET /anomaly/search
-                    machine_id = None
-                    if intent.machine:
-                        machines = self._run_async(self.api_client.list_machines(search=intent.machine))
-                        if machines:
-                            machine_id = machines[0]['id']
-                    
-                    data = self._run_async(self.api_client.search_anomalies(
-                        start_time=intent.time_range.start,
-                        end_time=intent.time_range.end,
+                    return {'success': True, 'data': data, 'template': 'energy_summary'}
+                elif specific_energy_type:
+                    # Specific energy type readings
+                    data = self._run_async(self.api_client.get_energy_readings(
                         machine_id=machine_id,
-                        severity=severity,
-                        limit=50
+                        energy_type=specific_energy_type,
+                        hours=24
                     ))
-                    if intent.machine:
-                        data['machine_name'] = intent.machine
-                    return {'success': True, 'data': data}
-                
-                elif intent.machine:
-                    # LIST recent anomalies - GET /anomaly/recent
-                    machines = self._run_async(self.api_client.list_machines(search=intent.machine))
-                    if not machines:
-                        return {'success': False, 'error': f"Machine {intent.machine} not found"}
-                    
-                    machine_id = machines[0]['id']
-                    data = self._run_async(self.api_client.get_recent_anomalies(
-                        machine_id=machine_id,
-                        severity=severity,
-                        limit=10
-                    ))
-                    # Add machine name for template
                     data['machine_name'] = intent.machine
-                    return {'success': True, 'data': data}
-                else:
-                    # Factory-wide recent anomalies
-                    self.logger.info("🔍 anomaly_factory_wide_query", severity=severity)
-                    self.logger.info("🔍 calling_get_recent_anomalies")
-                    data = self._run_async(self.api_client.get_recent_anomalies(
-                        severity=severity,
-                        limit=10
-                    ))
-                    
-                    # Extract unique affected machines from anomalies list
-                    if 'anomalies' in data and isinstance(data['anomalies'], list):
-                        affected_machines = list(set(
-                            anomaly.get('machine_name') 
-                            for anomaly in data['anomalies'] 
-                            if anomaly.get('machine_name')
-                        ))
-                        data['affected_machines'] = sorted(affected_machines)
-                    
-                    return {'success': True, 'data': data}
-            
-            elif intent.intent == IntentType.BASELINE_MODELS:
-                # List baseline models for a machine
-                if not intent.machine:
-                    return {'success': False, 'error': 'Machine name required for baseline models'}
-                
-                self.logger.info("baseline_models_query", machine=intent.machine)
+                    data['energy_type'] = specific_energy_type
+                    return {'success': True, 'data': data, 'custom_template': 'energy_type_readings'}
+            
+            if 'hourly' in utterance_lower or 'hour by hour' in utterance_lower:
+                needs_timeseries = True
+                requested_interval = '1hour'
+            elif '15-minute' in utterance_lower or '15 minute' in utterance_lower or 'fifteen minute' in utterance_lower:
+                needs_timeseries = True
+                requested_interval = '15min'
+            elif '5-minute' in utterance_lower or '5 minute' in utterance_lower:
+                needs_timeseries = True
+                requested_interval = '5min'
+            elif 'daily' in utterance_lower or 'day by day' in utterance_lower:
+                needs_timeseries = True
+                requested_interval = '1day'
+            
+            # Check if time range is specified (beyond "today") OR if interval keywords detected
+            if intent.time_range and (intent.time_range.relative not in ["today", "now", None] or needs_timeseries):
+                # Time-series query - get energy for specific time range
+                self.logger.info("energy_query_timeseries",
+                               machine=intent.machine,
+                               start=intent.time_range.start.isoformat(),
+                               end=intent.time_range.end.isoformat(),
+                               relative=intent.time_range.relative,
+                               needs_timeseries=needs_timeseries,
+                               requested_interval=requested_interval)
                 
-                # Call list_baseline_models API
-                response = self._run_async(
-                    self.api_client.list_baseline_models(
-                        seu_name=intent.machine,
-                        energy_source="electricity"
-                    )
+                # Explicit interval request wins over the one derived from the range
+                fetched = self._timeseries_query(
+                    self.api_client.get_energy_timeseries, intent, interval=requested_interval
                 )
+                if fetched is None:
+                    return {'success': False, 'error': f"Machine {intent.machine} not found"}
+                timeseries, interval = fetched
                 
-                # Process response to extract active model and summary
-                models = response.get('models', [])
-                active_model = next((m for m in models if m.get('is_active')), models[0] if models else None)
-                
-                data = {
-                    'seu_name': response.get('seu_name', intent.machine),
-                    'models': models,
-                    'active_version': active_model.get('model_version') if active_model else None,
-                    'active_r_squared': active_model.get('r_squared') if active_model else None,
-                    'active_samples': active_model.get('training_samples') if active_model else None
-                }
-                
-                return {'success': True, 'data': data}
-            
-            elif intent.intent == IntentType.BASELINE_EXPLANATION:
-                # Explain baseline model (key drivers, accuracy)
-                # If no machine specified, show factory-wide key drivers
-                if not intent.machine:
-                    self.logger.info("baseline_explanation_factory_wide")
-                    return self._get_factory_wide_drivers()
-                
-                self.logger.info("baseline_explanation_query", machine=intent.machine)
-                
-                # First get the list of models to find the active model ID
-                models_response = self._run_async(
-                    self.api_client.list_baseline_models(
-                        seu_name=intent.machine,
-                        energy_source="electricity"
-                    )
-                )
-                
-                models = models_response.get('models', [])
-                active_model = next((m for m in models if m.get('is_active')), models[0] if models else None)
+                # Calculate total energy and parse timestamps
+                points = timeseries.get('data_points')
+                if not isinstance(points, list):
+                    points = []
+                values = [point.get('value', 0) for point in points]
+                total_energy = sum(values)
+                # Parse timestamp string to datetime for voice_time filter
+                data_points_parsed = [
+                    {
+                        'timestamp': _parse_timestamp(point['timestamp']),
+                        'value': value,
+                        'unit': point.get('unit', 'kWh')
+                    }
+                    for point, value in zip(points, values)
+                    if point.get('timestamp')
+                ]
                 
-                if not active_model:
-                    return {'success': False, 'error': f'No baseline model found for {intent.machine}'}
+                # Detect trend/pattern queries
+                utterance = intent.utterance.lower()
+                is_trend_query = 'trend' in utterance or 'pattern' in utterance
                 
-                # Get detailed explanation for the active model
-                model_id = active_model.get('id')
-                explanation_response = self._run_async(
-                    self.api_client.get_baseline_model_explanation(
-                        model_id=model_id,
-                        include_explanation=True
-                    )
-                )
+                # Calculate trend analysis if requested
+                trend_periods = None
+                if is_trend_query and len(data_points_parsed) > 3:
+                    # Divide into 3-4 periods based on data density
+                    num_periods = 3 if len(data_points_parsed) <= 24 else 4
+                    period_size = len(data_points_parsed) // num_periods
+                    trend_periods = []
+                    
+                    for i in range(num_periods):
+                        start_idx = i * period_size
+                        end_idx = start_idx + period_size if i < num_periods - 1 else len(data_points_parsed)
+                        period_data = data_points_parsed[start_idx:end_idx]
+                        
+                        if period_data:
+                            period_total = sum(p['value'] for p in period_data)
+                            period_avg = period_total / len(period_data)
+                            period_start = period_data[0]['timestamp']
+                            period_end = period_data[-1]['timestamp']
+                            
+                            # Find peak hour in this period
+                            peak_point = max(period_data, key=lambda p: p['value'])
+                            
+                            trend_periods.append({
+                                'start_time': period_start,
+                                'end_time': period_end,
+                                'total_kwh': round(period_total, 2),
+                                'avg_kwh': round(period_avg, 1),
+                                'peak_kwh': round(peak_point['value'], 1),
+                                'peak_time': peak_point['timestamp']
+                            })
                 
-                # Extract explanation data for template
-                explanation = explanation_response.get('explanation', {})
+                # Structure response for template
                 data = {
-                    'machine_name': explanation_response.get('machine_name', intent.machine),
-                    'seu_name': intent.machine,
-                    'r_squared': explanation_response.get('r_squared'),
-                    'model_version': explanation_response.get('model_version'),
-                    'explanation': explanation,
-                    'key_drivers': explanation.get('key_drivers', []),
-                    'accuracy_explanation': explanation.get('accuracy_explanation'),
-                    'formula_explanation': explanation.get('formula_explanation')
+                    'machine': intent.machine,
+                    'time_range': intent.time_range.relative or 'custom',
+                    'start_time': intent.time_range.start,
+                    'end_time': intent.time_range.end,
+                    'timeseries_data': data_points_parsed,
+                    'total_energy_kwh': total_energy,
+                    'interval': interval,
+                    'is_trend_query': is_trend_query,
+                    'trend_periods': trend_periods
                 }
                 
                 return {'success': True, 'data': data}
             
-            elif intent.intent == IntentType.BASELINE:
-                # Baseline prediction - get expected energy for given conditions
-                machine = intent.machine
-                machines = intent.machines if intent.machines else []
-                
-                # If no machine specified, try conversation context
-                if not machine and not machines and self.context_manager:
-                    # DISABLED: session = self.context_manager.get_or_create_session("default_user")
-                    machine = session.get_last_machine()
-                    if machine:
-                        self.logger.info("baseline_using_context", machine=machine)
+            # Default: current/today data for specific machine
+            data = self._get_machine_status(intent.machine)
+            
+            # Check if user asked for average per hour or trend/pattern analysis
+            utterance = intent.utterance.lower()
+            if isinstance(data, dict):
+                if 'average' in utterance or 'per hour' in utterance or 'hourly average' in utterance:
+                    data['is_average_query'] = True
                 
-                if not machine and not machines:
-                    return {'success': False, 'error': 'Which machine? Please specify a machine name.', 'needs_clarification': True}
+                # Detect trend/pattern queries for aggregated time-series analysis
+                if 'trend' in utterance or 'pattern' in utterance:
+                    data['is_trend_query'] = True
+            
+            return {'success': True, 'data': data}
+        else:
+            # Factory-wide energy query (no machine specified) - Priority 3
+            self.logger.info("energy_query_factory_wide", intent="energy_query", machine=None)
+            
+            # Call /factory/summary endpoint for aggregated data
+            try:
+                summary_data = self._run_async(self.api_client.get_factory_summary())
                 
-                # Extract features from utterance (temperature, pressure, load, production)
-                utterance = getattr(intent, 'utterance', '') if hasattr(intent, 'utterance') else ''
-                features = FeatureExtractor.extract_all_features(
-                    utterance,
-                    defaults={
-                        "total_production_count": 5000000,
-                        "avg_outdoor_temp_c": 22.0,
-                        "avg_pressure_bar": 7.0,
-                        "avg_load_factor": 0.85
+                if summary_data and 'energy' in summary_data:
+                    # Extract energy data from factory summary
+                    energy_data = {
+                        'total_kwh_today': summary_data['energy'].get('total_kwh_today', 0),
+                        'current_power_kw': summary_data['energy'].get('current_power_kw', 0),
+                        'avg_power_kw': summary_data['energy'].get('avg_power_kw', 0),
+                        'total_cost_usd': summary_data.get('costs', {}).get('total_usd_today', 0),
+                        'machines_active': summary_data.get('machines', {}).get('active', 0),
+                        'machines_total': summary_data.get('machines', {}).get('total', 0),
+                        'factory_wide': True,
+                        'timestamp': summary_data.get('timestamp')
                     }
-                )
+                    return {'success': True, 'data': energy_data, 'template': 'factory_energy'}
+                else:
+                    # Fallback to system_stats if factory/summary unavailable
+                    data = self._run_async(self.api_client.system_stats())
+                    return {'success': True, 'data': data}
+            except Exception as e:
+                self.logger.error("factory_summary_failed", error=str(e))
+                # Fallback to system_stats
+                data = self._run_async(self.api_client.system_stats())
+                return {'success': True, 'data': data}
+    
+    def _api_seus(self, intent: Intent) -> Dict[str, Any]:
+        """Significant Energy Uses (SEUs) listing"""
+        # Significant Energy Uses (SEUs) queries
+        utterance = intent.utterance.lower()
+        
+        # Extract energy source from intent or utterance
+        energy_source = intent.energy_source
+        if not energy_source:
+            if 'electricity' in utterance or 'electric' in utterance:
+                energy_source = 'electricity'
+            elif 'gas' in utterance or 'natural gas' in utterance:
+                energy_source = 'natural_gas'
+            elif 'steam' in utterance:
+                energy_source = 'steam'
+            elif 'compressed air' in utterance:
+                energy_source = 'compressed_air'
+        
+        # Check for baseline filtering
+        asking_without_baseline = bool(SEU_WITHOUT_BASELINE_PATTERN.search(utterance))
+        asking_with_baseline = bool(SEU_WITH_BASELINE_PATTERN.search(utterance))
+        
+        data = self._run_async(self.api_client.list_seus(energy_source=energy_source))
+        
+        # Filter by baseline status if requested
+        if isinstance(data, dict):
+            if asking_without_baseline:
+                data['seus'] = [seu for seu in data.get('seus', []) if not seu.get('has_baseline')]
+                data['total_count'] = len(data['seus'])
+                data['filter_type'] = 'without_baseline'
+            elif asking_with_baseline:
+                data['seus'] = [seu for seu in data.get('seus', []) if seu.get('has_baseline')]
+                data['total_count'] = len(data['seus'])
+                data['filter_type'] = 'with_baseline'
+        
+        return {'success': True, 'data': data, 'template': 'seus'}
+    
+    def _api_factory_overview(self, intent: Intent) -> Dict[str, Any]:
+        """Factory summary, system stats or health check"""
+        # Check if this is a health/status check vs stats query
+        utterance = intent.utterance.lower()
+        
+        # Check for machine listing queries ("list all machines", "show machines")
+        if MACHINE_LISTING_PATTERN.search(utterance):
+            machines = self._run_async(self.api_client.list_machines())
+            machine_names = [m.get('name', m.get('machine_name', 'Unknown')) for m in machines]
+            return {
+                'success': True,
+                'data': {
+                    'machines': machine_names,
+                    'count': len(machines)
+                },
+                'template': 'machine_list'
+            }
+        
+        # Check for carbon/emissions queries
+        if 'carbon' in utterance or 'emission' in utterance or 'co2' in utterance:
+            data = self._run_async(self.api_client.system_stats())
+            # Mark as carbon query for template
+            if isinstance(data, dict):
+                data['is_carbon_query'] = True
+            return {'success': True, 'data': data}
+        
+        # Check for active/offline machine queries
+        if MACHINES_BY_STATUS_PATTERN.search(utterance):
+            is_active = bool(ACTIVE_STATUS_PATTERN.search(utterance))
+            machines = self._run_async(self.api_client.list_machines(is_active=is_active))
+            
+            return {
+                'success': True,
+                'data': {
+                    'machines': machines,
+                    'total_count': len(machines),
+                    'filter_type': 'active' if is_active else 'offline'
+                },
+                'template': 'machines_by_status'
+            }
+        
+        # Check for performance engine health
+        if 'performance engine' in utterance or ('engine' in utterance and 'running' in utterance):
+            data = self._run_async(self.api_client.get_performance_health())
+            return {'success': True, 'data': data, 'template': 'performance_health'}
+        elif 'opportunities' in utterance or 'saving' in utterance:
+            # Get factory_id from first machine (all machines share same factory)
+            machines = self._run_async(self.api_client.list_machines())
+            factory_id = machines[0]['factory_id'] if machines else None
+            
+            if not factory_id:
+                return {'success': False, 'error': 'Could not determine factory ID'}
+            
+            # Get all opportunities from API
+            data = self._run_async(self.api_client.get_performance_opportunities(
+                factory_id=factory_id,
+                period='week'
+            ))
+            
+            # Filter by SEU name if specified (API doesn't support filtering)
+            if intent.machine:
+                filtered_opps = [opp for opp in data.get('opportunities', []) 
+                                if opp.get('seu_name') == intent.machine]
                 
-                self.logger.info("baseline_features_extracted", features=features)
+                if filtered_opps:
+                    # Update data with filtered opportunities
+                    data['opportunities'] = filtered_opps
+                    data['total_opportunities'] = len(filtered_opps)
+                    # Recalculate total savings
+                    data['total_potential_savings_kwh'] = sum(o.get('potential_savings_kwh', 0) for o in filtered_opps)
+                    data['total_potential_savings_usd'] = sum(o.get('potential_savings_usd', 0) for o in filtered_opps)
+                else:
+                    # No opportunities for this specific machine
+                    data['opportunities'] = []
+                    data['total_opportunities'] = 0
+                    data['total_potential_savings_kwh'] = 0
+                    data['total_potential_savings_usd'] = 0
+            
+            return {'success': True, 'data': data, 'template': 'opportunities'}
+        elif 'action plan' in utterance and 'list' in utterance:
+            # List ISO action plans (check BEFORE create action plan)
+            status_filter = None
+            priority_filter = None
+            
+            if 'completed' in utterance or 'complete' in utterance:
+                status_filter = 'completed'
+            elif 'in progress' in utterance or 'active' in utterance:
+                status_filter = 'in_progress'
+            elif 'planned' in utterance:
+                status_filter = 'planned'
+            
+            if 'high priority' in utterance or 'critical' in utterance:
+                priority_filter = 'high' if 'high' in utterance else 'critical'
+            
+            # Get factory_id
+            machines = self._run_async(self.api_client.list_machines())
+            factory_id = machines[0]['factory_id'] if machines else "11111111-1111-1111-1111-111111111111"
+            
+            data = self._run_async(self.api_client.list_action_plans(
+                factory_id=factory_id,
+                status=status_filter,
+                priority=priority_filter
+            ))
+            return {'success': True, 'data': data, 'template': 'action_plans_list'}
+        elif 'action plan' in utterance or 'create plan' in utterance:
+            # Create action plan for improvement
+            if not intent.machine:
+                return {'success': False, 'error': 'Machine name required for action plan'}
+            
+            # Determine issue type from query or use default
+            issue_type = 'inefficient_scheduling'  # default
+            if 'idle' in utterance:
+                issue_type = 'excessive_idle'
+            elif 'drift' in utterance or 'degradation' in utterance or 'efficiency' in utterance:
+                issue_type = 'baseline_drift'
+            elif 'setpoint' in utterance or 'setting' in utterance:
+                issue_type = 'suboptimal_setpoints'
+            
+            data = self._run_async(self.api_client.create_action_plan(
+                seu_name=intent.machine,
+                issue_type=issue_type
+            ))
+            return {'success': True, 'data': data, 'template': 'action_plan'}
+        
+        # Health check detection
+        if HEALTH_CHECK_PATTERN.search(utterance):
+            # Health check query - use /health endpoint
+            data = self._run_async(self.api_client.health_check())
+            return {'success': True, 'data': data}
+        elif 'summary' in utterance:
+            # Factory summary - comprehensive overview
+            data = self._run_async(self.api_client.factory_summary())
+            return {'success': True, 'data': data, 'template': 'factory_summary'}
+        elif 'significant energy' in utterance or 'list seus' in utterance or 'energy uses' in utterance:
+            # List SEUs (significant energy uses)
+            # Check if filtering by energy source
+            energy_source = None
+            if 'electricity' in utterance or 'electric' in utterance:
+                energy_source = 'electricity'
+            elif 'gas' in utterance or 'natural gas' in utterance:
+                energy_source = 'natural_gas'
+            elif 'steam' in utterance:
+                energy_source = 'steam'
+            
+            data = self._run_async(self.api_client.list_seus(energy_source=energy_source))
+            return {'success': True, 'data': data, 'template': 'seus_list'}
+        elif 'seu' in utterance or 'significant energy' in utterance or 'energy uses' in utterance:
+            # SEU queries (with typo tolerance for common misspellings)
+            asking_without_baseline = bool(SEU_WITHOUT_BASELINE_PATTERN.search(utterance))
+            asking_with_baseline = bool(SEU_WITH_BASELINE_PATTERN.search(utterance))
+            
+            energy_source = None
+            if 'electricity' in utterance or 'electric' in utterance:
+                energy_source = 'electricity'
+            elif 'gas' in utterance or 'natural gas' in utterance:
+                energy_source = 'natural_gas'
+            elif 'steam' in utterance:
+                energy_source = 'steam'
+            
+            data = self._run_async(self.api_client.list_seus(energy_source=energy_source))
+            
+            # Filter by baseline status if requested
+            if asking_without_baseline:
+                data['seus'] = [seu for seu in data.get('seus', []) if not seu.get('has_baseline')]
+                data['total_count'] = len(data['seus'])
+                data['filter_type'] = 'without_baseline'
+            elif asking_with_baseline:
+                data['seus'] = [seu for seu in data.get('seus', []) if seu.get('has_baseline')]
+                data['total_count'] = len(data['seus'])
+                data['filter_type'] = 'with_baseline'
+            
+            return {'success': True, 'data': data, 'template': 'seus'}
+        elif 'enpi' in utterance or 'iso' in utterance or 'compliance report' in utterance or 'energy performance indicator' in utterance:
+            # ISO 50001 EnPI report
+            # Extract period from utterance (Q1, Q2, Q3, Q4, or year)
+            # Note: re and datetime are imported at module level
+            
+            period = None
+            
+            # Check for quarters
+            quarter_match = re.search(r'q[1-4]|quarter\s*[1-4]', utterance, re.IGNORECASE)
+            if quarter_match:
+                quarter_text = quarter_match.group().lower()
+                quarter_num = re.search(r'[1-4]', quarter_text).group()
+                # Get year from utterance or use current year
+                year_match = re.search(r'20\d{2}', utterance)
+                year = year_match.group() if year_match else str(datetime.now().year)
+                period = f"{year}-Q{quarter_num}"
+            else:
+                # Check for explicit year (e.g., "2025")
+                year_match = re.search(r'20\d{2}', utterance)
+                if year_match:
+                    period = year_match.group()
+                else:
+                    # Default to current quarter
+                    now = datetime.now()
+                    current_quarter = (now.month - 1) // 3 + 1
+                    period = f"{now.year}-Q{current_quarter}"
+            
+            # Get factory_id from first machine
+            machines = self._run_async(self.api_client.list_machines())
+            factory_id = machines[0]['factory_id'] if machines else "11111111-1111-1111-1111-111111111111"
+            
+            data = self._run_async(self.api_client.get_enpi_report(
+                factory_id=factory_id,
+                period=period
+            ))
+            return {'success': True, 'data': data, 'template': 'enpi_report'}
+        elif 'aggregat' in utterance and intent.time_range:
+            # Aggregated stats with time range
+            data = self._run_async(self.api_client.aggregated_stats(
+                start_time=intent.time_range.start,
+                end_time=intent.time_range.end,
+                machine_ids='all'
+            ))
+            # Use aggregated_stats template instead of factory_overview
+            return {'success': True, 'data': data, 'template': 'aggregated_stats'}
+        else:
+            # General stats query - use /stats/system endpoint
+            data = self._run_async(self.api_client.system_stats())
+        
+        return {'success': True, 'data': data}
+    
+    def _api_machine_list(self, intent: Intent) -> Dict[str, Any]:
+        """List or search machines"""
+        # List all machines or search for specific machines
+        utterance = intent.utterance.lower()
+        search_term = None
+        location_filter = intent.params.get('location') if intent.params else None
+        
+        # Extract search term from common patterns
+        search_patterns = [
+            r'\b(HVAC|Boiler|Compressor|Conveyor|Turbine|Hydraulic|Injection)s?\b',
+            r'\bfind.*?(?:the\s+)?(\w+)\b',
+            r'\bhow\s+many\s+(\w+)\b',
+        ]
+        
+        for pattern in search_patterns:
+            match = re.search(pattern, utterance, re.IGNORECASE)
+            if match:
+                search_term = match.group(1).rstrip('s')  # Remove plural 's'
+                break
+        
+        # Call list_machines with optional search parameter
+        if search_term:
+            machines = self._run_async(self.api_client.list_machines(search=search_term))
+        else:
+            machines = self._run_async(self.api_client.list_machines())
+        
+        # Filter by location if specified
+        if location_filter:
+            machines = [m for m in machines if location_filter.upper() in m['name'].upper()]
+            self.logger.info("location_filter_applied", location=location_filter, count=len(machines))
+        
+        # Extract just the names for voice response
+        machine_names = [m['name'] for m in machines]
+        return {'success': True, 'data': {'machines': machine_names, 'count': len(machines), 'location': location_filter}}
+    
+    def _api_ranking(self, intent: Intent) -> Dict[str, Any]:
+        """Top-N machines by consumption, cost or efficiency"""
+        # Top N ranking by metric (not machine list)
+        limit = intent.limit or 5
+        ranking_metric = intent.ranking_metric
+        
+        # For efficiency queries, get all machines and calculate efficiency
+        if ranking_metric == 'efficiency':
+            try:
+                from datetime import timedelta
+                # Get all machines with energy + production data
+                machines = self._run_async(self.api_client.list_machines())
                 
-                # Handle multiple machines (ambiguous query like "HVAC" or "compressor")
-                if machines:
-                    self.logger.info("baseline_multi_prediction", machines=machines, count=len(machines))
-                    predictions = []
-                    
-                    for seu_name in machines:
+                # Time range: last 24 hours
+                end_time = datetime.now(timezone.utc)
+                start_time = end_time - timedelta(days=1)
+                
+                efficiency_data = []
+                for machine in machines[:10]:  # Limit to first 10 for performance
+                    try:
+                        # Get energy consumption using correct API method
+                        energy_data = self._run_async(self.api_client.get_energy_timeseries(
+                            machine_id=machine['id'],
+                            start_time=start_time,
+                            end_time=end_time,
+                            interval='1day'
+                        ))
+                        
+                        # Get production if available
                         try:
-                            prediction = self._run_async(
-                                self.api_client.predict_baseline(
-                                    seu_name=seu_name,
-                                    energy_source="electricity",
-                                    features=features,
-                                    include_message=False
-                                )
-                            )
-                            prediction['seu_name'] = seu_name
-                            predictions.append(prediction)
-                        except Exception as e:
-                            self.logger.warning("baseline_prediction_failed", machine=seu_name, error=str(e))
-                    
-                    # Return multi-machine predictions
-                    return {
-                        'success': True,
-                        'data': {
-                            'predictions': predictions,
-                            'features': features,
-                            'machine_count': len(predictions)
-                        }
-                    }
+                            production = self._run_async(self.api_client.get_machine_production(
+                                machine_id=machine['id'],
+                                limit=1
+                            ))
+                            units = production[0]['units_produced'] if production else None
+                        except:
+                            units = None
+                        
+                        # Extract energy from response
+                        data_points = energy_data.get('data', {}).get('data_points', [])
+                        if not data_points or len(data_points) == 0:
+                            self.logger.warning("no_energy_data", machine=machine['name'])
+                            continue
+                            
+                        energy_kwh = data_points[0].get('value', 0)
+                        
+                        if energy_kwh == 0:
+                            self.logger.warning("zero_energy", machine=machine['name'])
+                            continue
+                        
+                        # Calculate efficiency: units per kWh
+                        if units and units > 0 and energy_kwh > 0:
+                            efficiency = units / energy_kwh
+                        else:
+                            # Use inverse of energy as proxy (lower energy = better)
+                            efficiency = 1.0 / energy_kwh if energy_kwh > 0 else 0
+                        
+                        efficiency_data.append({
+                            'machine_name': machine['name'],
+                            'efficiency_score': efficiency,
+                            'energy_kwh': energy_kwh,
+                            'units_produced': units or 0
+                        })
+                    except Exception as e:
+                        self.logger.warning("efficiency_calc_failed", machine=machine['name'], error=str(e))
+                        import traceback
+                        self.logger.debug("efficiency_traceback", trace=traceback.format_exc())
+                        continue
                 
-                # Single machine prediction
-                self.logger.info("baseline_prediction", machine=machine)
+                # Sort by efficiency (highest first)
+                efficiency_data.sort(key=lambda x: x['efficiency_score'], reverse=True)
                 
-                try:
-                    # Call baseline prediction API
-                    prediction = self._run_async(
-                        self.api_client.predict_baseline(
-                            seu_name=machine,
-                            energy_source="electricity",
-                            features=features,
-                            include_message=False  # Don't use API message, we format with features
-                        )
-                    )
-                    
-                    # Add SEU name and features to response for template
-                    prediction['seu_name'] = machine
-                    prediction['features'] = features
-                except Exception as e:
-                    self.logger.error("baseline_prediction_failed", machine=machine, error=str(e))
-                    return {
-                        'success': False,
-                        'error': f'Could not get baseline prediction for {machine}. The machine may not have a trained model yet.'
+                return {
+                    'success': True,
+                    'data': {
+                        'machines': efficiency_data[:limit],
+                        'ranking_type': 'efficiency',
+                        'total_machines': len(efficiency_data)
                     }
+                }
+            except Exception as e:
+                self.logger.error("efficiency_ranking_failed", error=str(e))
+                import traceback
+                self.logger.error("efficiency_traceback", trace=traceback.format_exc())
+                # Fallback to energy consumption ranking
+                ranking_metric = 'consumption'
+        
+        # Standard consumption/cost ranking
+        metric = 'energy' if ranking_metric == 'consumption' else ranking_metric
+        data = self._run_async(self.api_client.get_top_consumers(limit=limit, metric=metric))
+        return {'success': True, 'data': data}
+    
+    def _api_comparison(self, intent: Intent) -> Dict[str, Any]:
+        """Compare energy or status across machines"""
+        if intent.machines:
+            # Multi-machine energy comparison
+            try:
+                # Get machine IDs for all machines in comparison
+                machine_ids = []
+                machine_names = []
                 
-                # Update conversation context with this machine
-                if self.context_manager:
-                    # DISABLED: session = self.context_manager.get_or_create_session("default_user")
-                    session.update_machine(machine)
-                
-                return {'success': True, 'data': prediction}
-            
-            elif intent.intent == IntentType.KPI:
-                # KPI query - get all KPIs for a machine
-                machine = intent.machine
-                
-                if not machine:
-                    return {'success': False, 'error': 'Which machine? Please specify a machine name for KPIs.', 'needs_clarification': True}
+                searches = self._run_async_many(
+                    self.api_client.list_machines(search=machine_name)
+                    for machine_name in intent.machines
+                )
+                for machine_name, machines in zip(intent.machines, searches):
+                    if isinstance(machines, Exception):
+                        raise machines
+                    if not machines:
+                        self.logger.warning("comparison_machine_not_found", machine=machine_name)
+                        continue
+                    machine_ids.append(machines[0]['id'])
+                    machine_names.append(machines[0]['name'])
                 
-                self.logger.info("kpi_query", machine=machine, time_range=intent.time_range)
+                if len(machine_ids) < 2:
+                    return {'success': False, 'error': "Need at least 2 machines to compare"}
                 
-                try:
-                    # Get time range (default to today)
-                    if intent.time_range and intent.time_range.start:
-                        start_time = intent.time_range.start
-                        end_time = intent.time_range.end if intent.time_range.end else datetime.now(timezone.utc)
-                    else:
-                        start_time = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
-                        end_time = datetime.now(timezone.utc)
-                    
-                    self.log.info(f"KPI time range: {start_time} to {end_time}")
-                    
-                    # Get machine ID
-                    machines = self._run_async(self.api_client.list_machines(search=machine))
-                    if not machines or len(machines) == 0:
-                        return {'success': False, 'error': f'Machine {machine} not found'}
-                    
-                    machine_id = machines[0]['id']
-                    self.log.info(f"Found machine ID: {machine_id}")
-                    
-                    # Call KPI API (note: API expects 'start' and 'end' as ISO strings, not 'start_time'/'end_time')
-                    kpis = self._run_async(
-                        self.api_client.get_all_kpis(
-                            machine_id=machine_id,
-                            start=start_time.isoformat(),
-                            end=end_time.isoformat()
-                        )
-                    )
-                    
-                    self.log.info(f"KPI API returned: {type(kpis)}, keys={list(kpis.keys()) if isinstance(kpis, dict) else 'N/A'}")
-                    
-                    return {'success': True, 'data': kpis}
-                except Exception as e:
-                    self.log.error(f"KPI API call failed: {e}")
-                    import traceback
-                    self.log.error(f"Traceback: {traceback.format_exc()}")
-                    return {'success': False, 'error': f'Failed to get KPIs: {str(e)}'}
-            
-            elif intent.intent == IntentType.PERFORMANCE:
-                # Performance analysis - analyze SEU performance vs baseline
-                machine = intent.machine
-                
-                if not machine:
-                    return {'success': False, 'error': 'Which machine? Please specify a machine name for performance analysis.', 'needs_clarification': True}
+                # Get time range (default: today)
+                if intent.time_range and intent.time_range.start and intent.time_range.end:
+                    start_time = intent.time_range.start
+                    end_time = intent.time_range.end
+                else:
+                    # Default: today
+                    end_time = datetime.now(timezone.utc)
+                    start_time = end_time.replace(hour=0, minute=0, second=0, microsecond=0)
                 
-                self.logger.info("performance_query", machine=machine)
+                # Call multi-machine comparison API
+                data = self._run_async(self.api_client.get_multi_machine_energy(
+                    machine_ids=machine_ids,
+                    start_time=start_time,
+                    end_time=end_time,
+                    interval="1hour"
+                ))
                 
-                # Use "energy" as default energy source (works for most machines)
-                # Boiler-1 would need "electricity" but that's an edge case
-                energy_source = "energy"
+                # Calculate total energy for each machine from data_points
+                machines_with_totals = []
+                for machine in data.get('machines', []):
+                    total_energy = sum(dp['value'] for dp in machine.get('data_points', []))
+                    machines_with_totals.append({
+                        'machine_name': machine['machine_name'],
+                        'total_energy': total_energy,
+                        'data_points': machine.get('data_points', [])
+                    })
                 
-                # Get analysis date (default to today)
-                from datetime import date as date_class
-                analysis_date = date_class.today().isoformat()
+                # Add machine names for template
+                data['machines'] = machines_with_totals
+                data['machine_names'] = machine_names
+                data['time_period'] = f"today ({start_time.strftime('%Y-%m-%d')})"
                 
-                # Call performance API
-                performance = self._run_async(
-                    self.api_client.analyze_performance(
-                        seu_name=machine,
-                        energy_source=energy_source,
-                        analysis_date=analysis_date
-                    )
-                )
+                return {'success': True, 'data': data}
                 
-                return {'success': True, 'data': performance}
+            except Exception as e:
+                self.logger.error("comparison_failed", error=str(e), machines=intent.machines)
+                return {'success': False, 'error': f"Comparison failed: {str(e)}"}
+        
+        # Machine comparison query - extract all machines from utterance
+        machines = []
+        if intent.machine:
+            machines.append(intent.machine)
+        
+        # Try to find additional machines in utterance
+        all_machine_names = self.validator.machine_whitelist
+        for machine in all_machine_names:
+            machine_lower = machine.lower()
+            intent_machine_lower = intent.machine.lower() if intent.machine else ""
+            if machine_lower in intent.utterance.lower() and machine_lower != intent_machine_lower:
+                machines.append(machine)
+        
+        # If only one machine found, get top consumers for comparison
+        if len(machines) < 2:
+            top_consumers = self._run_async(self.api_client.get_top_consumers(limit=3))
+            if top_consumers and 'top_consumers' in top_consumers:
+                machines = [c['seu_name'] for c in top_consumers['top_consumers'][:2]]
+        
+        # Get status for each machine
+        machines = machines[:5]  # Limit to 5 machines
+        comparison_data = []
+        statuses = self._get_machine_statuses(machines, return_exceptions=True)
+        for machine_name, status in zip(machines, statuses):
+            if isinstance(status, Exception):
+                self.logger.warning("comparison_machine_failed", machine=machine_name, error=str(status))
+                continue
+            comparison_data.append(status)
+        
+        return {
+            'success': True,
+            'data': {
+                'machines': comparison_data,
+                'count': len(comparison_data)
+            }
+        }
+    
+    def _api_cost_analysis(self, intent: Intent) -> Dict[str, Any]:
+        """Energy cost for a machine or the factory"""
+        # Extract machine if not provided by Adapt parser
+        machine = intent.machine
+        if not machine:
+            # Try to extract from utterance using validator's whitelist
+            utterance = intent.utterance
+            machine_whitelist = self.validator.machine_whitelist if hasattr(self, 'validator') else []
+            for machine_name in machine_whitelist:
+                if machine_name.lower() in utterance.lower():
+                    machine = machine_name
+                    break
+        
+        if machine:
+            # Machine-specific cost
+            data = self._get_machine_status(machine)
+            return {'success': True, 'data': data}
+        else:
+            # Factory-wide cost - use system_stats which has cost data
+            data = self._run_async(self.api_client.system_stats())
+            # Extract cost information for cost_analysis template
+            cost_data = {
+                'estimated_cost': data.get('estimated_cost', 0),
+                'cost_per_day': data.get('cost_per_day', 0),
+                'total_energy': data.get('total_energy', 0),
+                'energy_per_hour': data.get('energy_per_hour', 0)
+            }
+            return {'success': True, 'data': cost_data}
+    
+    def _api_anomaly_detection(self, intent: Intent) -> Dict[str, Any]:
+        """Run, search or list anomalies"""
+        self.logger.info("🔍 ANOMALY_HANDLER_START", machine=intent.machine)
+        # Check what type of anomaly query this is
+        utterance = intent.utterance.lower()
+        self.logger.info("🔍 anomaly_utterance_check", utterance=utterance[:50])
+        is_detection_request = any(kw in utterance for kw in ['check for', 'detect', 'scan for', 'analyze for']) and intent.machine
+        is_active_request = any(kw in utterance for kw in ['active', 'unresolved', 'alerts', 'need attention'])
+        is_search_request = any(kw in utterance for kw in ['find', 'search']) and intent.time_range and intent.time_range.start
+        self.logger.info("🔍 anomaly_type_determined", detection=is_detection_request, active=is_active_request, search=is_search_request)
+        
+        # Extract severity from utterance (critical, warning, info)
+        severity = None
+        if 'critical' in utterance:
+            severity = 'critical'
+        elif 'warning' in utterance or 'warn' in utterance:
+            severity = 'warning'
+        elif 'info' in utterance or 'information' in utterance:
+            severity = 'info'
+        
+        if is_detection_request:
+            # RUN ML anomaly detection - POST /anomaly/detect
+            machine_id = self._resolve_machine_id(intent.machine)
+            if not machine_id:
+                return {'success': False, 'error': f"Machine {intent.machine} not found"}
+            
+            # Get time range (default: today)
+            if intent.time_range and intent.time_range.start and intent.time_range.end:
+                start_time = intent.time_range.start
+                end_time = intent.time_range.end
+            else:
+                end_time = datetime.now(timezone.utc)
+                start_time = end_time.replace(hour=0, minute=0, second=0, microsecond=0)
+            
+            # Run ML detection
+            data = self._run_async(self.api_client.detect_anomalies(
+                machine_id=machine_id,
+                start=start_time,
+                end=end_time
+            ))
+            data['machine_name'] = intent.machine
+            data['is_detection'] = True
+            return {'success': True, 'data': data}
+        
+        elif is_active_request:
+            # GET active (unresolved) anomalies - GET /anomaly/active
+            data = self._run_async(self.api_client.get_active_anomalies())
+            data['is_active'] = True
+            return {'success': True, 'data': data}
+        
+        elif is_search_request:
+            # SEARCH anomalies by date range - GET /anomaly/search
+            machine_id = None
+            if intent.machine:
+                machine_id = self._resolve_machine_id(intent.machine)
+            
+            data = self._run_async(self.api_client.search_anomalies(
+                start_time=intent.time_range.start,
+                end_time=intent.time_range.end,
+                machine_id=machine_id,
+                severity=severity,
+                limit=50
+            ))
+            if intent.machine:
+                data['machine_name'] = intent.machine
+            return {'success': True, 'data': data}
+        
+        elif intent.machine:
+            # LIST recent anomalies - GET /anomaly/recent
+            machine_id = self._resolve_machine_id(intent.machine)
+            if not machine_id:
+                return {'success': False, 'error': f"Machine {intent.machine} not found"}
+            
+            data = self._run_async(self.api_client.get_recent_anomalies(
+                machine_id=machine_id,
+                severity=severity,
+                limit=10
+            ))
+            # Add machine name for template
+            data['machine_name'] = intent.machine
+            return {'success': True, 'data': data}
+        else:
+            # Factory-wide recent anomalies
+            self.logger.info("🔍 anomaly_factory_wide_query", severity=severity)
+            self.logger.info("🔍 calling_get_recent_anomalies")
+            data = self._run_async(self.api_client.get_recent_anomalies(
+                severity=severity,
+                limit=10
+            ))
             
-            elif intent.intent == IntentType.FORECAST:
-                # Forecast - get future energy prediction
-                self.logger.info("forecast_query", machine=intent.machine)
-                
-                # Check if this is a demand forecast (detailed ARIMA predictions)
-                utterance = getattr(intent, 'utterance', '').lower()
-                is_demand_forecast = 'demand' in utterance or 'detailed' in utterance
-                
-                if is_demand_forecast and intent.machine:
-                    # Use /forecast/demand endpoint (requires machine UUID)
-                    # Lookup machine ID
-                    machines = self._run_async(
-                        self.api_client.list_machines(search=intent.machine)
-                    )
-                    
-                    if not machines:
-                        return {'success': False, 'error': f'Machine {intent.machine} not found'}
-                    
-                    machine_id = machines[0]['id']
-                    
-                    # Get detailed demand forecast
-                    forecast = self._run_async(
-                        self.api_client.forecast_demand(
-                            machine_id=machine_id,
-                            horizon="short",
-                            periods=4
-                        )
-                    )
-                    # Add machine name for template
-                    forecast['machine_name'] = intent.machine
-                    return {'success': True, 'data': forecast, 'custom_template': 'demand_forecast'}
-                else:
-                    # Use /forecast/short-term endpoint (simplified daily forecast)
-                    forecast = self._run_async(
-                        self.api_client.get_forecast(
-                            machine=intent.machine,
-                            hours=24  # Default to 24 hour forecast
-                        )
-                    )
-                    return {'success': True, 'data': forecast}
+            # Extract unique affected machines from anomalies list
+            if 'anomalies' in data and isinstance(data['anomalies'], list):
+                affected_machines = list(set(
+                    anomaly.get('machine_name') 
+                    for anomaly in data['anomalies'] 
+                    if anomaly.get('machine_name')
+                ))
+                data['affected_machines'] = sorted(affected_machines)
             
-            elif intent.intent == IntentType.PRODUCTION:
-                # Production - get production stats from machine status
-                if not intent.machine:
-                    return {'success': False, 'error': 'Machine name required for production queries'}
-                
-                self.logger.info("production_query", machine=intent.machine)
-                
-                # Get machine status (includes production_today)
-                data = self._run_async(
-                    self.api_client.get_machine_status(intent.machine)
+            return {'success': True, 'data': data}
+    
+    def _api_baseline_models(self, intent: Intent) -> Dict[str, Any]:
+        """List baseline models for a machine"""
+        # List baseline models for a machine
+        if not intent.machine:
+            return {'success': False, 'error': 'Machine name required for baseline models'}
+        
+        self.logger.info("baseline_models_query", machine=intent.machine)
+        
+        # Call list_baseline_models API
+        response = self._run_async(
+            self.api_client.list_baseline_models(
+                seu_name=intent.machine,
+                energy_source="electricity"
+            )
+        )
+        
+        # Process response to extract active model and summary
+        models = response.get('models', [])
+        active_model = next((m for m in models if m.get('is_active')), models[0] if models else None)
+        
+        data = {
+            'seu_name': response.get('seu_name', intent.machine),
+            'models': models,
+            'active_version': active_model.get('model_version') if active_model else None,
+            'active_r_squared': active_model.get('r_squared') if active_model else None,
+            'active_samples': active_model.get('training_samples') if active_model else None
+        }
+        
+        return {'success': True, 'data': data}
+    
+    def _api_baseline_explanation(self, intent: Intent) -> Dict[str, Any]:
+        """Explain a baseline model (key drivers, accuracy)"""
+        # Explain baseline model (key drivers, accuracy)
+        # If no machine specified, show factory-wide key drivers
+        if not intent.machine:
+            self.logger.info("baseline_explanation_factory_wide")
+            return self._get_factory_wide_drivers()
+        
+        self.logger.info("baseline_explanation_query", machine=intent.machine)
+        
+        # First get the list of models to find the active model ID
+        models_response = self._run_async(
+            self.api_client.list_baseline_models(
+                seu_name=intent.machine,
+                energy_source="electricity"
+            )
+        )
+        
+        models = models_response.get('models', [])
+        active_model = next((m for m in models if m.get('is_active')), models[0] if models else None)
+        
+        if not active_model:
+            return {'success': False, 'error': f'No baseline model found for {intent.machine}'}
+        
+        # Get detailed explanation for the active model
+        model_id = active_model.get('id')
+        explanation_response = self._run_async(
+            self.api_client.get_baseline_model_explanation(
+                model_id=model_id,
+                include_explanation=True
+            )
+        )
+        
+        # Extract explanation data for template
+        explanation = explanation_response.get('explanation', {})
+        data = {
+            'machine_name': explanation_response.get('machine_name', intent.machine),
+            'seu_name': intent.machine,
+            'r_squared': explanation_response.get('r_squared'),
+            'model_version': explanation_response.get('model_version'),
+            'explanation': explanation,
+            'key_drivers': explanation.get('key_drivers', []),
+            'accuracy_explanation': explanation.get('accuracy_explanation'),
+            'formula_explanation': explanation.get('formula_explanation')
+        }
+        
+        return {'success': True, 'data': data}
+    
+    def _api_baseline(self, intent: Intent) -> Dict[str, Any]:
+        """Baseline energy prediction for given conditions"""
+        # Baseline prediction - get expected energy for given conditions
+        machine = intent.machine
+        machines = intent.machines if intent.machines else []
+        
+        # If no machine specified, try conversation context
+        if not machine and not machines and self.context_manager:
+            # DISABLED: session = self.context_manager.get_or_create_session("default_user")
+            machine = session.get_last_machine()
+            if machine:
+                self.logger.info("baseline_using_context", machine=machine)
+        
+        if not machine and not machines:
+            return {'success': False, 'error': 'Which machine? Please specify a machine name.', 'needs_clarification': True}
+        
+        # Extract features from utterance (temperature, pressure, load, production)
+        utterance = intent.utterance
+        features = FeatureExtractor.extract_all_features(
+            utterance,
+            defaults={
+                "total_production_count": 5000000,
+                "avg_outdoor_temp_c": 22.0,
+                "avg_pressure_bar": 7.0,
+                "avg_load_factor": 0.85
+            }
+        )
+        
+        self.logger.info("baseline_features_extracted", features=features)
+        
+        # Handle multiple machines (ambiguous query like "HVAC" or "compressor")
+        if machines:
+            self.logger.info("baseline_multi_prediction", machines=machines, count=len(machines))
+            predictions = []
+            
+            results = self._run_async_many(
+                self.api_client.predict_baseline(
+                    seu_name=seu_name,
+                    energy_source="electricity",
+                    features=features,
+                    include_message=False
                 )
-                
-                return {'success': True, 'data': data}
+                for seu_name in machines
+            )
+            for seu_name, prediction in zip(machines, results):
+                if isinstance(prediction, Exception):
+                    self.logger.warning("baseline_prediction_failed", machine=seu_name, error=str(prediction))
+                    continue
+                prediction['seu_name'] = seu_name
+                predictions.append(prediction)
             
-            elif intent.intent == IntentType.REPORT:
-                # Report generation - generate/preview/list reports
-                # Handle both 'action' and 'report_action' keys (heuristic parser uses 'report_action')
-                action = intent.params.get('action') or intent.params.get('report_action', 'generate') if intent.params else 'generate'
-                report_type = intent.params.get('report_type', 'monthly_enpi') if intent.params else 'monthly_enpi'
-                year = intent.params.get('year') if intent.params else None
-                month = intent.params.get('month') if intent.params else None
-                
-                self.logger.info("report_query", action=action, report_type=report_type, year=year, month=month)
-                
-                if action == 'list_types':
-                    # List available report types
-                    data = self._run_async(self.api_client.get_report_types())
-                    return {'success': True, 'data': data, 'action': 'list_types'}
-                    
-                elif action == 'preview':
-                    # Preview report data
-                    data = self._run_async(
-                        self.api_client.preview_report(
-                            report_type=report_type,
-                            year=year,
-                            month=month
-                        )
-                    )
-                    return {'success': True, 'data': data, 'action': 'preview'}
-                    
-                else:  # generate
-                    # Generate and download PDF report
-                    data = self._run_async(
-                        self.api_client.generate_report(
-                            report_type=report_type,
-                            year=year,
-                            month=month
-                        )
-                    )
-                    self.logger.info("report_generate_returned", data=data, data_type=type(data).__name__)
-                    return {'success': True, 'data': data, 'action': 'generate'}
-            
-            elif intent.intent == IntentType.COMPARISON:
-                # Machine comparison query - extract all machines from utterance
-                machines = []
-                if intent.machine:
-                    machines.append(intent.machine)
-                
-                # Try to find additional machines in utterance
-                all_machine_names = self.validator.machine_whitelist
-                for machine in all_machine_names:
-                    machine_lower = machine.lower()
-                    intent_machine_lower = intent.machine.lower() if intent.machine else ""
-                    if machine_lower in intent.utterance.lower() and machine_lower != intent_machine_lower:
-                        machines.append(machine)
-                
-                # If only one machine found, get top consumers for comparison
-                if len(machines) < 2:
-                    top_consumers = self._run_async(self.api_client.get_top_consumers(limit=3))
-                    if top_consumers and 'top_consumers' in top_consumers:
-                        machines = [c['seu_name'] for c in top_consumers['top_consumers'][:2]]
-                
-                # Get status for each machine
-                comparison_data = []
-                for machine_name in machines[:5]:  # Limit to 5 machines
-                    try:
-                        status = self._run_async(self.api_client.get_machine_status(machine_name))
-                        comparison_data.append(status)
-                    except Exception as e:
-                        self.logger.warning("comparison_machine_failed", machine=machine_name, error=str(e))
-                
-                return {
-                    'success': True,
-                    'data': {
-                        'machines': comparison_data,
-                        'count': len(comparison_data)
-                    }
+            # Return multi-machine predictions
+            return {
+                'success': True,
+                'data': {
+                    'predictions': predictions,
+                    'features': features,
+                    'machine_count': len(predictions)
                 }
+            }
+        
+        # Single machine prediction
+        self.logger.info("baseline_prediction", machine=machine)
+        
+        try:
+            # Call baseline prediction API
+            prediction = self._run_async(
+                self.api_client.predict_baseline(
+                    seu_name=machine,
+                    energy_source="electricity",
+                    features=features,
+                    include_message=False  # Don't use API message, we format with features
+                )
+            )
             
-            elif intent.intent == IntentType.KPI:
-                # KPI query - get factory-wide or machine-specific KPIs
-                if intent.machine:
-                    # Machine-specific KPIs
-                    data = self._run_async(self.api_client.get_machine_status(intent.machine))
-                    return {'success': True, 'data': data}
-                else:
-                    # Factory-wide KPIs - use summary endpoint
-                    data = self._run_async(self.api_client.get_factory_summary())
-                    return {'success': True, 'data': data}
+            # Add SEU name and features to response for template
+            prediction['seu_name'] = machine
+            prediction['features'] = features
+        except Exception as e:
+            self.logger.error("baseline_prediction_failed", machine=machine, error=str(e))
+            return {
+                'success': False,
+                'error': f'Could not get baseline prediction for {machine}. The machine may not have a trained model yet.'
+            }
+        
+        # Update conversation context with this machine
+        if self.context_manager:
+            # DISABLED: session = self.context_manager.get_or_create_session("default_user")
+            session.update_machine(machine)
+        
+        return {'success': True, 'data': prediction}
+    
+    def _api_kpi(self, intent: Intent) -> Dict[str, Any]:
+        """KPIs for a machine or the factory"""
+        # KPI query - get all KPIs for a machine
+        machine = intent.machine
+        
+        if not machine:
+            return {'success': False, 'error': 'Which machine? Please specify a machine name for KPIs.', 'needs_clarification': True}
+        
+        self.logger.info("kpi_query", machine=machine, time_range=intent.time_range)
+        
+        try:
+            # Get time range (default to today)
+            if intent.time_range and intent.time_range.start:
+                start_time = intent.time_range.start
+                end_time = intent.time_range.end if intent.time_range.end else datetime.now(timezone.utc)
+            else:
+                start_time = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+                end_time = datetime.now(timezone.utc)
             
-            elif intent.intent == IntentType.HEALTH:
-                # System health check - call /health endpoint
-                data = self._run_async(self.api_client.health_check())
-                return {'success': True, 'data': data}
+            self.log.info(f"KPI time range: {start_time} to {end_time}")
             
-            elif intent.intent == IntentType.OPPORTUNITIES:
-                # Energy saving opportunities - call /performance/opportunities
-                machine = intent.machine
-                
-                # Get factory_id (use first machine's factory)
-                machines = self._run_async(self.api_client.list_machines())
-                factory_id = machines[0]['factory_id'] if machines else None
-                
-                if not factory_id:
-                    return {'success': False, 'error': 'Could not determine factory ID'}
-                
-                # Call opportunities API
-                data = self._run_async(
-                    self.api_client.get_performance_opportunities(
-                        factory_id=factory_id,
-                        period='week',
-                        seu_name=machine if machine else None
-                    )
+            # Get machine ID
+            machine_id = self._resolve_machine_id(machine)
+            if not machine_id:
+                return {'success': False, 'error': f'Machine {machine} not found'}
+            
+            self.log.info(f"Found machine ID: {machine_id}")
+            
+            # Call KPI API (note: API expects 'start' and 'end' as ISO strings, not 'start_time'/'end_time')
+            kpis = self._run_async(
+                self.api_client.get_all_kpis(
+                    machine_id=machine_id,
+                    start=start_time.isoformat(),
+                    end=end_time.isoformat()
                 )
-                return {'success': True, 'data': data}
+            )
             
-            elif intent.intent == IntentType.ISO50001:
-                # ISO 50001 queries - ENPI reports, action plans
-                utterance = getattr(intent, 'utterance', '').lower()
-                
-                if 'action plan' in utterance:
-                    if 'create' in utterance:
-                        # Create action plan (not yet implemented)
-                        return {'success': False, 'error': 'Creating action plans via voice is not yet supported'}
-                    elif 'update' in utterance or 'progress' in utterance:
-                        # Update action plan (not yet implemented)
-                        return {'success': False, 'error': 'Updating action plans via voice is not yet supported'}
-                    else:
-                        # List action plans
-                        data = self._run_async(self.api_client.list_iso_action_plans())
-                        return {'success': True, 'data': data}
-                else:
-                    # ENPI report
-                    data = self._run_async(self.api_client.get_enpi_report())
-                    return {'success': True, 'data': data}
+            self.log.info(f"KPI API returned: {type(kpis)}, keys={list(kpis.keys()) if isinstance(kpis, dict) else 'N/A'}")
             
-            elif intent.intent == IntentType.ALERTS:
-                # Alert subscription
-                return {'success': False, 'error': 'Alert subscription via voice is not yet implemented'}
+            return {'success': True, 'data': kpis}
+        except Exception as e:
+            self.log.error(f"KPI API call failed: {e}")
+            import traceback
+            self.log.error(f"Traceback: {traceback.format_exc()}")
+            return {'success': False, 'error': f'Failed to get KPIs: {str(e)}'}
+    
+    def _api_performance(self, intent: Intent) -> Dict[str, Any]:
+        """SEU performance analysis vs baseline"""
+        # Performance analysis - analyze SEU performance vs baseline
+        machine = intent.machine
+        
+        if not machine:
+            return {'success': False, 'error': 'Which machine? Please specify a machine name for performance analysis.', 'needs_clarification': True}
+        
+        self.logger.info("performance_query", machine=machine)
+        
+        # Use "energy" as default energy source (works for most machines)
+        # Boiler-1 would need "electricity" but that's an edge case
+        energy_source = "energy"
+        
+        # Get analysis date (default to today)
+        from datetime import date as date_class
+        analysis_date = date_class.today().isoformat()
+        
+        # Call performance API
+        performance = self._run_async(
+            self.api_client.analyze_performance(
+                seu_name=machine,
+                energy_source=energy_source,
+                analysis_date=analysis_date
+            )
+        )
+        
+        return {'success': True, 'data': performance}
+    
+    def _api_forecast(self, intent: Intent) -> Dict[str, Any]:
+        """Energy and demand forecasts"""
+        # Forecast - get future energy prediction
+        self.logger.info("forecast_query", machine=intent.machine)
+        
+        # Check if this is a demand forecast (detailed ARIMA predictions)
+        utterance = intent.utterance.lower()
+        is_demand_forecast = 'demand' in utterance or 'detailed' in utterance
+        
+        if is_demand_forecast and intent.machine:
+            # Use /forecast/demand endpoint (requires machine UUID)
+            # Lookup machine ID
+            machine_id = self._resolve_machine_id(intent.machine)
+            if not machine_id:
+                return {'success': False, 'error': f'Machine {intent.machine} not found'}
+            
+            # Get detailed demand forecast
+            forecast = self._run_async(
+                self.api_client.forecast_demand(
+                    machine_id=machine_id,
+                    horizon="short",
+                    periods=4
+                )
+            )
+            # Add machine name for template
+            forecast['machine_name'] = intent.machine
+            return {'success': True, 'data': forecast, 'custom_template': 'demand_forecast'}
+        else:
+            # Use /forecast/short-term endpoint (simplified daily forecast)
+            forecast = self._run_async(
+                self.api_client.get_forecast(
+                    machine=intent.machine,
+                    hours=24  # Default to 24 hour forecast
+                )
+            )
+            return {'success': True, 'data': forecast}
+    
+    def _api_production(self, intent: Intent) -> Dict[str, Any]:
+        """Production stats from machine status"""
+        # Production - get production stats from machine status
+        if not intent.machine:
+            return {'success': False, 'error': 'Machine name required for production queries'}
+        
+        self.logger.info("production_query", machine=intent.machine)
+        
+        # Get machine status (includes production_today)
+        data = self._get_machine_status(intent.machine)
+        
+        return {'success': True, 'data': data}
+    
+    def _api_report(self, intent: Intent) -> Dict[str, Any]:
+        """Generate, preview or list reports"""
+        # Report generation - generate/preview/list reports
+        # Handle both 'action' and 'report_action' keys (heuristic parser uses 'report_action')
+        action = intent.params.get('action') or intent.params.get('report_action', 'generate') if intent.params else 'generate'
+        report_type = intent.params.get('report_type', 'monthly_enpi') if intent.params else 'monthly_enpi'
+        year = intent.params.get('year') if intent.params else None
+        month = intent.params.get('month') if intent.params else None
+        
+        self.logger.info("report_query", action=action, report_type=report_type, year=year, month=month)
+        
+        if action == 'list_types':
+            # List available report types
+            data = self._run_async(self.api_client.get_report_types())
+            return {'success': True, 'data': data, 'action': 'list_types'}
+            
+        elif action == 'preview':
+            # Preview report data
+            data = self._run_async(
+                self.api_client.preview_report(
+                    report_type=report_type,
+                    year=year,
+                    month=month
+                )
+            )
+            return {'success': True, 'data': data, 'action': 'preview'}
             
-            elif intent.intent == IntentType.ENERGY_TYPES:
-                # Energy types query - list energy types for a machine
-                machine = intent.machine
-                
-                if not machine:
-                    return {'success': False, 'error': 'Which machine? Please specify a machine name.'}
-                
-                # Get machine ID
-                machines = self._run_async(self.api_client.list_machines(search=machine))
-                if not machines:
-                    return {'success': False, 'error': f'Machine {machine} not found'}
-                
-                machine_id = machines[0]['id']
-                
-                # Get energy types
-                data = self._run_async(self.api_client.get_energy_types(machine_id=machine_id))
-                data['machine_name'] = machine
+        else:  # generate
+            # Generate and download PDF report
+            data = self._run_async(
+                self.api_client.generate_report(
+                    report_type=report_type,
+                    year=year,
+                    month=month
+                )
+            )
+            self.logger.info("report_generate_returned", data=data, data_type=type(data).__name__)
+            return {'success': True, 'data': data, 'action': 'generate'}
+    
+    def _api_health(self, intent: Intent) -> Dict[str, Any]:
+        """EnMS /health endpoint"""
+        # System health check - call /health endpoint
+        data = self._run_async(self.api_client.health_check())
+        return {'success': True, 'data': data}
+    
+    def _api_opportunities(self, intent: Intent) -> Dict[str, Any]:
+        """Energy saving opportunities"""
+        # Energy saving opportunities - call /performance/opportunities
+        machine = intent.machine
+        
+        # Get factory_id (use first machine's factory)
+        machines = self._run_async(self.api_client.list_machines())
+        factory_id = machines[0]['factory_id'] if machines else None
+        
+        if not factory_id:
+            return {'success': False, 'error': 'Could not determine factory ID'}
+        
+        # Call opportunities API
+        data = self._run_async(
+            self.api_client.get_performance_opportunities(
+                factory_id=factory_id,
+                period='week',
+                seu_name=machine if machine else None
+            )
+        )
+        return {'success': True, 'data': data}
+    
+    def _api_iso50001(self, intent: Intent) -> Dict[str, Any]:
+        """ISO 50001 EnPI reports and action plans"""
+        # ISO 50001 queries - ENPI reports, action plans
+        utterance = intent.utterance.lower()
+        
+        if 'action plan' in utterance:
+            if 'create' in utterance:
+                # Create action plan (not yet implemented)
+                return {'success': False, 'error': 'Creating action plans via voice is not yet supported'}
+            elif 'update' in utterance or 'progress' in utterance:
+                # Update action plan (not yet implemented)
+                return {'success': False, 'error': 'Updating action plans via voice is not yet supported'}
+            else:
+                # List action plans
+                data = self._run_async(self.api_client.list_iso_action_plans())
                 return {'success': True, 'data': data}
+        else:
+            # ENPI report
+            data = self._run_async(self.api_client.get_enpi_report())
+            return {'success': True, 'data': data}
+    
+    def _api_alerts(self, intent: Intent) -> Dict[str, Any]:
+        """Alert subscription (not available by voice)"""
+        # Alert subscription
+        return {'success': False, 'error': 'Alert subscription via voice is not yet implemented'}
+    
+    def _api_energy_types(self, intent: Intent) -> Dict[str, Any]:
+        """Energy types metered for a machine"""
+        # Energy types query - list energy types for a machine
+        machine = intent.machine
+        
+        if not machine:
+            return {'success': False, 'error': 'Which machine? Please specify a machine name.'}
+        
+        # Get machine ID
+        machine_id = self._resolve_machine_id(machine)
+        if not machine_id:
+            return {'success': False, 'error': f'Machine {machine} not found'}
+        
+        # Get energy types
+        data = self._run_async(self.api_client.get_energy_types(machine_id=machine_id))
+        data['machine_name'] = machine
+        return {'success': True, 'data': data}
+    
+    def _api_model_query(self, intent: Intent) -> Dict[str, Any]:
+        """Baseline model details by version"""
+        # Baseline model details query
+        model_version = intent.params.get('model_id') if intent.params else None
+        
+        if not model_version:
+            return {'success': False, 'error': 'Please specify a model version number.'}
+        
+        try:
+            # API expects UUID, but user says "model 46" (version number)
+            # Need to lookup by version to get UUID
+            # First, need to determine which machine (default to Compressor-1)
+            machine = intent.machine if intent.machine else "Compressor-1"
+            energy_source = "electricity"  # Default
+            
+            # Get list of models for this machine
+            models_response = self._run_async(self.api_client.list_baseline_models(
+                seu_name=machine,
+                energy_source=energy_source
+            ))
             
-            elif intent.intent == IntentType.MODEL_QUERY:
-                # Baseline model details query
-                model_version = intent.params.get('model_id') if intent.params else None
-                
-                if not model_version:
-                    return {'success': False, 'error': 'Please specify a model version number.'}
-                
-                try:
-                    # API expects UUID, but user says "model 46" (version number)
-                    # Need to lookup by version to get UUID
-                    # First, need to determine which machine (default to Compressor-1)
-                    machine = intent.machine if intent.machine else "Compressor-1"
-                    energy_source = "electricity"  # Default
-                    
-                    # Get list of models for this machine
-                    models_response = self._run_async(self.api_client.list_baseline_models(
-                        seu_name=machine,
-                        energy_source=energy_source
-                    ))
-                    
-                    models = models_response.get('models', [])
-                    
-                    # Find model with matching version
-                    matching_model = None
-                    for model in models:
-                        if model.get('model_version') == model_version:
-                            matching_model = model
-                            break
-                    
-                    if not matching_model:
-                        return {
-                            'success': False, 
-                            'error': f'Model version {model_version} not found for {machine}. Available: versions 1-{models_response.get("total_models", 0)}. Try "list baseline models for {machine}" to see all.'
-                        }
-                    
-                    # Now get details using UUID
-                    model_uuid = matching_model['id']
-                    data = self._run_async(self.api_client.get_baseline_model_explanation(
-                        model_id=model_uuid,
-                        include_explanation=True
-                    ))
-                    # Ensure machine name is in response for template
-                    if 'machine_name' not in data or not data['machine_name']:
-                        data['machine_name'] = machine
-                    return {'success': True, 'data': data}
-                    
-                except Exception as e:
-                    error_msg = str(e)
-                    if '404' in error_msg or 'not found' in error_msg.lower():
-                        return {'success': False, 'error': f'Model {model_version} not found. It may not exist or has been deleted.'}
-                    elif '422' in error_msg:
-                        return {'success': False, 'error': f'No baseline models have been trained yet. Train a model first using "train a baseline for Compressor-1".'}
-                    elif 'MISSING_IDENTIFIER' in error_msg:
-                        return {'success': False, 'error': f'API requires machine name. Try "show details for baseline model {model_version} for Compressor-1".'}
-                    return {'success': False, 'error': f'Could not retrieve model {model_version}: {error_msg}'}
+            models = models_response.get('models', [])
             
-            else:
-                self.logger.warning("unsupported_intent_api_call", intent=intent.intent)
+            # Find model with matching version
+            matching_model = None
+            for model in models:
+                if model.get('model_version') == model_version:
+                    matching_model = model
+                    break
+            
+            if not matching_model:
                 return {
-                    'success': False,
-                    'error': f"API call for intent {intent.intent} not yet implemented",
-                    'error_type': 'not_implemented'
+                    'success': False, 
+                    'error': f'Model version {model_version} not found for {machine}. Available: versions 1-{models_response.get("total_models", 0)}. Try "list baseline models for {machine}" to see all.'
                 }
-                
+            
+            # Now get details using UUID
+            model_uuid = matching_model['id']
+            data = self._run_async(self.api_client.get_baseline_model_explanation(
+                model_id=model_uuid,
+                include_explanation=True
+            ))
+            # Ensure machine name is in response for template
+            if 'machine_name' not in data or not data['machine_name']:
+                data['machine_name'] = machine
+            return {'success': True, 'data': data}
+            
         except Exception as e:
-            self.logger.error("api_call_failed",
-                            intent=intent.intent,
-                            error=str(e),
-                            error_type=type(e).__name__)
-            return {
-                'success': False,
-                'error': str(e),
-                'error_type': 'api_timeout' if 'timeout' in str(e).lower() else 'api_error'
-            }
+            error_msg = str(e)
+            if '404' in error_msg or 'not found' in error_msg.lower():
+                return {'success': False, 'error': f'Model {model_version} not found. It may not exist or has been deleted.'}
+            elif '422' in error_msg:
+                return {'success': False, 'error': f'No baseline models have been trained yet. Train a model first using "train a baseline for Compressor-1".'}
+            elif 'MISSING_IDENTIFIER' in error_msg:
+                return {'success': False, 'error': f'API requires machine name. Try "show details for baseline model {model_version} for Compressor-1".'}
+            return {'success': False, 'error': f'Could not retrieve model {model_version}: {error_msg}'}
     
     def _format_response(self, intent: Intent, api_data: Dict[str, Any], custom_template: Optional[str] = None) -> str:
         """Format API response using Jinja2 templates"""
         try:
             # Use custom template if specified
             if custom_template:
-                template = self.response_formatter.env.get_template(f'{custom_template}.dialog')
+                template = self.response_formatter.get_template(f'{custom_template}.dialog')
                 return template.render(**api_data).strip()
             
             # Special handling for health check responses within factory_overview
-            if intent.intent == IntentType.FACTORY_OVERVIEW and 'status' in api_data and 'database' in api_data:
+            if intent.intent is IntentType.FACTORY_OVERVIEW and 'status' in api_data and 'database' in api_data:
                 # This is a health check response, use health_check template
                 template_data = {
                     'status': api_data.get('status'),
@@ -2678,21 +2972,21 @@ class EnmsSkill(OVOSSkill):
                     'database': api_data.get('database', {})
                 }
                 # Manually render health_check template
-                template = self.response_formatter.env.get_template('health_check.dialog')
+                template = self.response_formatter.get_template('health_check.dialog')
                 return template.render(**template_data).strip()
             
             # Special handling for REPORT intent - choose template based on action
-            if intent.intent == IntentType.REPORT:
+            if intent.intent is IntentType.REPORT:
                 action = api_data.get('action', 'generate')
                 self.logger.info("report_formatting", action=action, api_data_keys=list(api_data.keys()))
                 month_names = ['', 'January', 'February', 'March', 'April', 'May', 'June',
                               'July', 'August', 'September', 'October', 'November', 'December']
                 
                 if action == 'list_types':
-                    template = self.response_formatter.env.get_template('report_types.dialog')
+                    template = self.response_formatter.get_template('report_types.dialog')
                     return template.render(**api_data.get('data', {})).strip()
                 elif action == 'preview':
-                    template = self.response_formatter.env.get_template('report_preview.dialog')
+                    template = self.response_formatter.get_template('report_preview.dialog')
                     data = api_data.get('data', {})
                     month = intent.params.get('month', 1) if intent.params else 1
                     year = intent.params.get('year', 2024) if intent.params else 2024
@@ -2703,7 +2997,7 @@ class EnmsSkill(OVOSSkill):
                         year=year
                     ).strip()
                 else:  # generate
-                    template = self.response_formatter.env.get_template('report_generated.dialog')
+                    template = self.response_formatter.get_template('report_generated.dialog')
                     # Data is directly in api_data (not nested in 'data' key)
                     data = api_data.get('data', api_data)  # Try nested first, fallback to flat
                     month = data.get('month', 1)
@@ -2731,8 +3025,8 @@ class EnmsSkill(OVOSSkill):
                 api_data=api_data,
                 context={
                     "machine_name": intent.machine,
-                    "utterance": getattr(intent, 'utterance', '').lower()
-                } if intent.machine or hasattr(intent, 'utterance') else {}
+                    "utterance": intent.utterance.lower()
+                }
             )
         except Exception as e:
             self.logger.error("response_formatting_failed", error=str(e))
@@ -2741,15 +3035,15 @@ class EnmsSkill(OVOSSkill):
     
     def _generate_fallback_response(self, intent: Intent, api_data: Dict[str, Any]) -> str:
         """Generate simple fallback response if template fails"""
-        if intent.intent == IntentType.MACHINE_STATUS and 'machine_name' in api_data:
+        if intent.intent is IntentType.MACHINE_STATUS and 'machine_name' in api_data:
             status = api_data.get('current_status', {})
             return f"{api_data['machine_name']} is {status.get('status', 'unknown')}"
         
-        elif intent.intent == IntentType.POWER_QUERY and 'current_status' in api_data:
+        elif intent.intent is IntentType.POWER_QUERY and 'current_status' in api_data:
             power = api_data['current_status'].get('power_kw', 0)
             return f"Current power consumption is {power:.1f} kilowatts"
         
-        elif intent.intent == IntentType.FACTORY_OVERVIEW:
+        elif intent.intent is IntentType.FACTORY_OVERVIEW:
             return "Factory overview data retrieved successfully"
         
         else:
@@ -2757,6 +3051,102 @@ class EnmsSkill(OVOSSkill):
     
     # ========== EXISTING MACHINE-SPECIFIC HANDLERS (UPDATED FOR PRIORITY 3) ==========
     
+    def _dispatch(self, message: Message, intent_type: IntentType,
+                  with_machine: bool = False,
+                  extract: Optional[Callable[[str], Dict[str, Any]]] = None,
+                  template_from_result: bool = False):
+        """Shared flow for template-backed intent handlers
+        
+        Builds the Intent from the Adapt message, calls the EnMS API and speaks
+        the response rendered with the intent's dialog template.
+        
+        Args:
+            message: Adapt intent message
+            intent_type: Intent to build; its value names the dialog template
+            with_machine: Read and normalize the optional 'machine' entity
+            extract: Returns extra Intent fields parsed from the utterance
+            template_from_result: Prefer a 'template' chosen by _call_enms_api
+        """
+        if self._enms_unreachable():
+            return
+        try:
+            utterance = message.data.get("utterances", [""])[0]
+            fields = extract(utterance) if extract else {}
+            if with_machine:
+                machine_raw = message.data.get('machine')
+                fields['machine'] = self._normalize_machine_name(machine_raw) if machine_raw else None
+            
+            intent = Intent(
+                intent=intent_type,
+                confidence=0.95,
+                utterance=utterance,
+                **fields
+            )
+            
+            result = self._call_enms_api(intent)
+            
+            if result['success']:
+                template_name = intent_type.value
+                if template_from_result:
+                    template_name = result.get('template', template_name)
+                response = self.response_formatter.format_response(template_name, result['data'])
+                self.speak(response)
+            else:
+                self.logger.warning("intent_api_failed", intent=intent_type.value, error=result.get('error'))
+                self.speak_dialog("error.general")
+        except Exception as e:
+            self.log.error(f"{intent_type.value} handler failed: {e}")
+            self.speak_dialog("error.general")
+    
+    def _enms_unreachable(self) -> bool:
+        """Speak the outage fallback right away while the API circuit is open
+        
+        Avoids parking the handler (and the shared async loop) on timeouts
+        and retries against an EnMS that is known to be down.
+        """
+        if not self.api_client.breaker_open:
+            return False
+        self.logger.warning("enms_circuit_open_short_circuit")
+        self.speak_dialog("enms_unreachable")
+        return True
+    
+    def _ranking_fields(self, utterance: str) -> Dict[str, Any]:
+        """Extract top-N limit and ranking metric from a ranking query"""
+        utterance_lower = utterance.lower()
+        
+        # Detect efficiency vs consumption queries
+        is_efficiency_query = any(word in utterance_lower for word in [
+            'efficient', 'efficiency', 'best performing', 'performance',
+            'optimal', 'productive', 'cost effective'
+        ])
+        
+        # Extract number from utterance (e.g., "top 3", "top 5 machines")
+        number_match = re.search(r'\b(top|first|bottom|worst)\s+(\d+)\b', utterance_lower)
+        if number_match:
+            limit_int = int(number_match.group(2))
+        else:
+            limit_int = 5  # Default to 5
+        
+        self.log.info(f"Ranking query with limit: {limit_int}, efficiency: {is_efficiency_query}")
+        
+        return {
+            'limit': limit_int,
+            'ranking_metric': 'efficiency' if is_efficiency_query else 'consumption'
+        }
+    
+    def _machine_list_fields(self, utterance: str) -> Dict[str, Any]:
+        """Extract location filter from a machine list query"""
+        utterance_lower = utterance.lower()
+        
+        # Detect location filter
+        location = None
+        if 'european' in utterance_lower or 'europe' in utterance_lower or 'eu' in utterance_lower:
+            location = 'EU'
+        elif 'american' in utterance_lower or 'america' in utterance_lower or 'us' in utterance_lower:
+            location = 'US'
+        
+        return {'params': {'location': location} if location else None}
+    
     @intent_handler(IntentBuilder('EnergyQuery').require('energy_metric').optionally('machine').build())
     def handle_energy_query(self, message: Message):
         """
@@ -2769,6 +3159,8 @@ class EnmsSkill(OVOSSkill):
         
         Phase 3.1: Uses session context for follow-up queries
         """
+        if self._enms_unreachable():
+            return
         try:
             utterance = message.data.get("utterances", [""])[0]
             session_id = self._get_session_id(message)
@@ -2879,261 +3271,84 @@ class EnmsSkill(OVOSSkill):
                 # session = self.context_manager.get_or_create_session(session_id)
                 # session.add_turn(
                 #     query=utterance,
-                #     intent=intent,
-                #     response=response,
-                #     api_data=data
-                # )
-            else:
-                error = result.get('error', 'Unknown error')
-                self.logger.error("health_check_failed", error=error)
-                self.speak(f"I couldn't check the system status. Error: {error}")
-        except Exception as e:
-            self.log.error(f"System health handler failed: {e}")
-            import traceback
-            self.logger.error("health_check_traceback", traceback=traceback.format_exc())
-            self.speak("I encountered an error checking the system health.")
-    
-    @intent_handler(IntentBuilder('MachineStatus').require('status_check').require('machine').build())
-    def handle_machine_status(self, message: Message):
-        """Handle machine status queries - OVOS interface layer"""
-        try:
-            machine_raw = message.data.get('machine')
-
-            machine = self._normalize_machine_name(machine_raw)
-            utterance = message.data.get("utterances", [""])[0]
-            session_id = self._get_session_id(message)
-            
-            # Build intent object
-            intent = Intent(
-                intent=IntentType.MACHINE_STATUS,
-                machine=machine,
-                confidence=0.95,
-                utterance=utterance
-            )
-            
-            # Call existing service layer
-            result = self._call_enms_api(intent)
-            
-            # Speak result
-            if result['success']:
-                response = self.response_formatter.format_response('machine_status', result['data'])
-                self.speak(response)
-            else:
-                self.speak_dialog("error.general")
-        except Exception as e:
-            self.log.error(f"Machine status handler failed: {e}")
-            self.speak_dialog("error.general")
-    
-    @intent_handler(IntentBuilder('FactoryOverview').require('factory').build())
-    def handle_factory_overview(self, message: Message):
-        """Handle factory-wide queries - OVOS interface layer"""
-        try:
-            utterance = message.data.get("utterances", [""])[0]
-            session_id = self._get_session_id(message)
-            
-            # Build intent object
-            intent = Intent(
-                intent=IntentType.FACTORY_OVERVIEW,
-                confidence=0.95,
-                utterance=utterance
-            )
-            
-            # Call existing service layer
-            result = self._call_enms_api(intent)
-            
-            # Speak result
-            if result['success']:
-                response = self.response_formatter.format_response('factory_overview', result['data'])
-                self.speak(response)
-            else:
-                self.speak_dialog("error.general")
-        except Exception as e:
-            self.log.error(f"Factory overview handler failed: {e}")
-            self.speak_dialog("error.general")
-    
-    @intent_handler(IntentBuilder('AnomalyDetection').require('anomaly').optionally('machine').build())
-    def handle_anomaly_detection(self, message: Message):
-        """Handle anomaly detection queries - OVOS interface layer (Phase 3.1: with context)"""
-        try:
-            utterance = message.data.get("utterances", [""])[0]
-            session_id = self._get_session_id(message)
-            
-            # Get or create session context
-            # DISABLED: session = self.context_manager.get_or_create_session(session_id)
-            
-            # Extract machine (or use context)
-            machine_raw = message.data.get('machine')
-            machine = self._normalize_machine_name(machine_raw) if machine_raw else None
-            
-            # Use context if no machine specified
-            # DISABLED: if not machine and session.last_machine:
-                # DISABLED: machine = session.last_machine
-                # DISABLED: self.logger.info("using_context_machine", machine=machine, session_id=session_id)
-            
-            # Extract time range from utterance
-            time_range = self._extract_time_range(utterance)
-            
-            intent = Intent(
-                intent=IntentType.ANOMALY_DETECTION,
-                time_range=time_range,
-                machine=machine,
-                confidence=0.95,
-                utterance=utterance
-            )
-            
-            result = self._call_enms_api(intent)
-            
-            if result['success']:
-                response = self.response_formatter.format_response('anomaly_detection', result['data'])
-                self.speak(response)
-                
-                # Update context for next query
-                # DISABLED: session.add_turn(utterance, intent, response, result['data'])
-                self.logger.info("context_updated", session_id=session_id, machine=machine)
-            else:
-                self.speak_dialog("error.general")
-        except Exception as e:
-            self.log.error(f"Anomaly detection handler failed: {e}")
-            self.speak_dialog("error.general")
-    
-    @intent_handler(IntentBuilder('Ranking').require('ranking').build())
-    def handle_ranking(self, message: Message):
-        """Handle ranking/top consumers queries - OVOS interface layer"""
-        try:
-            utterance = message.data.get("utterances", [""])[0]
-            utterance_lower = utterance.lower()
-            
-            # Detect efficiency vs consumption queries
-            is_efficiency_query = any(word in utterance_lower for word in [
-                'efficient', 'efficiency', 'best performing', 'performance',
-                'optimal', 'productive', 'cost effective'
-            ])
-            
-            # Extract number from utterance (e.g., "top 3", "top 5 machines")
-            import re
-            number_match = re.search(r'\b(top|first|bottom|worst)\s+(\d+)\b', utterance_lower)
-            if number_match:
-                limit_int = int(number_match.group(2))
-            else:
-                limit_int = 5  # Default to 5
-            
-            self.log.info(f"Ranking query with limit: {limit_int}, efficiency: {is_efficiency_query}")
-            
-            intent = Intent(
-                intent=IntentType.RANKING,
-                limit=limit_int,
-                confidence=0.95,
-                utterance=utterance,
-                ranking_metric='efficiency' if is_efficiency_query else 'consumption'
-            )
-            
-            result = self._call_enms_api(intent)
-            
-            if result['success']:
-                response = self.response_formatter.format_response('ranking', result['data'])
-                self.speak(response)
-            else:
-                self.speak_dialog("error.general")
-        except Exception as e:
-            self.log.error(f"Ranking handler failed: {e}")
-            self.speak_dialog("error.general")
-    
-    @intent_handler(IntentBuilder('MachineStatus').require('machine_status').optionally('machine').build())
-    def handle_machine_status(self, message: Message):
-        """Handle machine status queries (running/offline/operational)"""
-        try:
-            utterance = message.data.get("utterances", [""])[0]
-            machine_raw = message.data.get('machine')
-            machine = self._normalize_machine_name(machine_raw) if machine_raw else None
-            
-            intent = Intent(
-                intent=IntentType.MACHINE_STATUS,
-                machine=machine,
-                confidence=0.95,
-                utterance=utterance
-            )
-            
-            result = self._call_enms_api(intent)
-            
-            if result['success']:
-                # Use template from result if specified, otherwise default to 'machine_status'
-                template_name = result.get('template', 'machine_status')
-                response = self.response_formatter.format_response(template_name, result['data'])
-                self.speak(response)
-            else:
-                self.speak_dialog("error.general")
-        except Exception as e:
-            self.log.error(f"Machine status handler failed: {e}")
-            self.speak_dialog("error.general")
-    
-    @intent_handler(IntentBuilder('MachineList').require('machine_list').build())
-    def handle_machine_list(self, message: Message):
-        """Handle machine list queries (list all machines)"""
-        try:
-            utterance = message.data.get("utterances", [""])[0]
-            utterance_lower = utterance.lower()
-            
-            # Detect location filter
-            location = None
-            if 'european' in utterance_lower or 'europe' in utterance_lower or 'eu' in utterance_lower:
-                location = 'EU'
-            elif 'american' in utterance_lower or 'america' in utterance_lower or 'us' in utterance_lower:
-                location = 'US'
-            
-            intent = Intent(
-                intent=IntentType.MACHINE_LIST,
-                confidence=0.95,
-                utterance=utterance,
-                params={'location': location} if location else None
-            )
-            
-            result = self._call_enms_api(intent)
-            
-            if result['success']:
-                response = self.response_formatter.format_response('machine_list', result['data'])
-                self.speak(response)
+                #     intent=intent,
+                #     response=response,
+                #     api_data=data
+                # )
             else:
-                self.speak_dialog("error.general")
+                error = result.get('error', 'Unknown error')
+                self.logger.error("health_check_failed", error=error)
+                self.speak(f"I couldn't check the system status. Error: {error}")
         except Exception as e:
-            self.log.error(f"Machine list handler failed: {e}")
-            self.speak_dialog("error.general")
+            self.log.error(f"System health handler failed: {e}")
+            import traceback
+            self.logger.error("health_check_traceback", traceback=traceback.format_exc())
+            self.speak("I encountered an error checking the system health.")
     
-    @intent_handler(IntentBuilder('Comparison').require('comparison').require('machine').build())
-    def handle_comparison(self, message: Message):
-        """Handle machine comparison queries - OVOS interface layer (Phase 3.1: with context)"""
+    @intent_handler(IntentBuilder('MachineStatus').require('status_check').require('machine').build())
+    def handle_machine_status(self, message: Message):
+        """Handle machine status queries - OVOS interface layer"""
         try:
+            machine_raw = message.data.get('machine')
+
+            machine = self._normalize_machine_name(machine_raw)
             utterance = message.data.get("utterances", [""])[0]
             session_id = self._get_session_id(message)
             
-            # Get or create session context
-            # DISABLED: session = self.context_manager.get_or_create_session(session_id)
-            
-            # Extract machine
-            machine_raw = message.data.get('machine')
-            machine = self._normalize_machine_name(machine_raw) if machine_raw else None
-            
+            # Build intent object
             intent = Intent(
-                intent=IntentType.COMPARISON,
+                intent=IntentType.MACHINE_STATUS,
                 machine=machine,
                 confidence=0.95,
                 utterance=utterance
             )
             
+            # Call existing service layer
             result = self._call_enms_api(intent)
             
+            # Speak result
             if result['success']:
-                response = self.response_formatter.format_response('comparison', result['data'])
+                response = self.response_formatter.format_response('machine_status', result['data'])
                 self.speak(response)
-                
-                # Update context for next query
-                # DISABLED: session.add_turn(utterance, intent, response, result['data'])
-                self.logger.info("context_updated", session_id=session_id, machines=intent.machines)
             else:
                 self.speak_dialog("error.general")
         except Exception as e:
-            self.log.error(f"Comparison handler failed: {e}")
+            self.log.error(f"Machine status handler failed: {e}")
             self.speak_dialog("error.general")
     
+    @intent_handler(IntentBuilder('FactoryOverview').require('factory').build())
+    def handle_factory_overview(self, message: Message):
+        """Handle factory-wide queries - OVOS interface layer"""
+        self._dispatch(message, IntentType.FACTORY_OVERVIEW)
+    
+    @intent_handler(IntentBuilder('AnomalyDetection').require('anomaly').optionally('machine').build())
+    def handle_anomaly_detection(self, message: Message):
+        """Handle anomaly detection queries - OVOS interface layer (Phase 3.1: with context)"""
+        self._dispatch(message, IntentType.ANOMALY_DETECTION, with_machine=True,
+                       extract=lambda utterance: {'time_range': self._extract_time_range(utterance)})
+    
+    @intent_handler(IntentBuilder('Ranking').require('ranking').build())
+    def handle_ranking(self, message: Message):
+        """Handle ranking/top consumers queries - OVOS interface layer"""
+        self._dispatch(message, IntentType.RANKING, extract=self._ranking_fields)
+    
+    @intent_handler(IntentBuilder('MachineStatus').require('machine_status').optionally('machine').build())
+    def handle_machine_status(self, message: Message):
+        """Handle machine status queries (running/offline/operational)"""
+        # API layer picks multi_machine_status/machine_count/... templates
+        self._dispatch(message, IntentType.MACHINE_STATUS, with_machine=True,
+                       template_from_result=True)
+    
+    @intent_handler(IntentBuilder('MachineList').require('machine_list').build())
+    def handle_machine_list(self, message: Message):
+        """Handle machine list queries (list all machines)"""
+        self._dispatch(message, IntentType.MACHINE_LIST, extract=self._machine_list_fields)
+    
+    @intent_handler(IntentBuilder('Comparison').require('comparison').require('machine').build())
+    def handle_comparison(self, message: Message):
+        """Handle machine comparison queries - OVOS interface layer (Phase 3.1: with context)"""
+        self._dispatch(message, IntentType.COMPARISON, with_machine=True)
+    
     @intent_handler(IntentBuilder('CostAnalysis').require('cost_metric').optionally('machine').build())
     def handle_cost_analysis(self, message: Message):
         """Handle cost analysis queries - OVOS interface layer (Phase 3.1: with context)"""
@@ -3426,161 +3641,22 @@ class EnmsSkill(OVOSSkill):
     @intent_handler(IntentBuilder('SEUs').require('seu_query').build())
     def handle_seus(self, message: Message):
         """Handle SEU (Significant Energy Uses) queries - OVOS interface layer"""
-        try:
-            utterance = message.data.get("utterances", [""])[0]
-            
-            intent = Intent(
-                intent=IntentType.SEUS,
-                confidence=0.95,
-                utterance=utterance
-            )
-            
-            result = self._call_enms_api(intent)
-            
-            if result['success']:
-                response = self.response_formatter.format_response('seus', result['data'])
-                self.speak(response)
-            else:
-                self.speak_dialog("error.general")
-        except Exception as e:
-            self.log.error(f"SEUs handler failed: {e}")
-            self.speak_dialog("error.general")
+        self._dispatch(message, IntentType.SEUS)
     
     @intent_handler(IntentBuilder('KPI').require('kpi_metric').optionally('machine').build())
     def handle_kpi(self, message: Message):
         """Handle KPI queries - OVOS interface layer (Phase 3.1: with context)"""
-        try:
-            utterance = message.data.get("utterances", [""])[0]
-            session_id = self._get_session_id(message)
-            
-            self.log.info(f"KPI query triggered: {utterance}")
-            
-            # Get or create session context
-            # DISABLED: session = self.context_manager.get_or_create_session(session_id)
-            
-            # Extract machine (or use context)
-            machine_raw = message.data.get('machine')
-            machine = self._normalize_machine_name(machine_raw) if machine_raw else None
-            
-            self.log.info(f"Machine extracted: {machine_raw} → {machine}")
-            
-            # Use context if no machine specified
-            # DISABLED: if not machine and session.last_machine:
-                # DISABLED: machine = session.last_machine
-                # DISABLED: self.logger.info("using_context_machine", machine=machine, session_id=session_id)
-            
-            intent = Intent(
-                intent=IntentType.KPI,
-                machine=machine,
-                confidence=0.95,
-                utterance=utterance
-            )
-            
-            self.log.info(f"Calling API for KPI intent")
-            result = self._call_enms_api(intent)
-            
-            self.log.info(f"API result: success={result.get('success')}, data keys={list(result.get('data', {}).keys()) if result.get('data') else None}")
-            
-            if result['success']:
-                self.log.info(f"Formatting response for KPI data")
-                response = self.response_formatter.format_response('kpi', result['data'])
-                self.log.info(f"Generated response: {response[:100]}...")
-                self.speak(response)
-                
-                # Update context for next query
-                # DISABLED: session.add_turn(utterance, intent, response, result['data'])
-                self.logger.info("context_updated", session_id=session_id, machine=machine, metric="kpi")
-            else:
-                error_msg = result.get('error', 'Unknown error')
-                self.log.error(f"API call failed: {error_msg}")
-                self.speak_dialog("error.general")
-        except Exception as e:
-            self.log.error(f"KPI handler failed: {e}")
-            import traceback
-            self.log.error(f"Traceback: {traceback.format_exc()}")
-            self.speak_dialog("error.general")
+        self._dispatch(message, IntentType.KPI, with_machine=True)
     
     @intent_handler(IntentBuilder('Performance').require('performance_query').optionally('machine').build())
     def handle_performance(self, message: Message):
         """Handle performance analysis queries - OVOS interface layer (Phase 3.1: with context)"""
-        try:
-            utterance = message.data.get("utterances", [""])[0]
-            session_id = self._get_session_id(message)
-            
-            # Get or create session context
-            # DISABLED: session = self.context_manager.get_or_create_session(session_id)
-            
-            # Extract machine (or use context)
-            machine_raw = message.data.get('machine')
-            machine = self._normalize_machine_name(machine_raw) if machine_raw else None
-            
-            # Use context if no machine specified
-            # DISABLED: if not machine and session.last_machine:
-                # DISABLED: machine = session.last_machine
-                # DISABLED: self.logger.info("using_context_machine", machine=machine, session_id=session_id)
-            
-            intent = Intent(
-                intent=IntentType.PERFORMANCE,
-                machine=machine,
-                confidence=0.95,
-                utterance=utterance
-            )
-            
-            result = self._call_enms_api(intent)
-            
-            if result['success']:
-                response = self.response_formatter.format_response('performance', result['data'])
-                self.speak(response)
-                
-                # Update context for next query
-                # DISABLED: session.add_turn(utterance, intent, response, result['data'])
-                self.logger.info("context_updated", session_id=session_id, machine=machine)
-            else:
-                self.speak_dialog("error.general")
-        except Exception as e:
-            self.log.error(f"Performance handler failed: {e}")
-            self.speak_dialog("error.general")
+        self._dispatch(message, IntentType.PERFORMANCE, with_machine=True)
     
     @intent_handler(IntentBuilder('Production').require('production_query').require('machine').build())
     def handle_production(self, message: Message):
         """Handle production data queries - OVOS interface layer (Phase 3.1: with context)"""
-        try:
-            utterance = message.data.get("utterances", [""])[0]
-            session_id = self._get_session_id(message)
-            
-            # Get or create session context
-            # DISABLED: session = self.context_manager.get_or_create_session(session_id)
-            
-            # Extract machine (or use context)
-            machine_raw = message.data.get('machine')
-            machine = self._normalize_machine_name(machine_raw) if machine_raw else None
-            
-            # Use context if no machine specified
-            # DISABLED: if not machine and session.last_machine:
-                # DISABLED: machine = session.last_machine
-                # DISABLED: self.logger.info("using_context_machine", machine=machine, session_id=session_id)
-            
-            intent = Intent(
-                intent=IntentType.PRODUCTION,
-                machine=machine,
-                confidence=0.95,
-                utterance=utterance
-            )
-            
-            result = self._call_enms_api(intent)
-            
-            if result['success']:
-                response = self.response_formatter.format_response('production', result['data'])
-                self.speak(response)
-                
-                # Update context for next query
-                # DISABLED: session.add_turn(utterance, intent, response, result['data'])
-                self.logger.info("context_updated", session_id=session_id, machine=machine)
-            else:
-                self.speak_dialog("error.general")
-        except Exception as e:
-            self.log.error(f"Production handler failed: {e}")
-            self.speak_dialog("error.general")
+        self._dispatch(message, IntentType.PRODUCTION, with_machine=True)
     
     @intent_handler(IntentBuilder('PowerQuery').require('power_metric').optionally('machine').build())
     def handle_power_query(self, message: Message):
@@ -3667,12 +3743,11 @@ class EnmsSkill(OVOSSkill):
             
             if machine:
                 # Machine-specific load factor
-                machines = self._run_async(self.api_client.list_machines(search=machine))
-                if not machines:
+                machine_id = self._resolve_machine_id(machine)
+                if not machine_id:
                     self.speak(f"I couldn't find a machine called {machine}")
                     return
                 
-                machine_id = machines[0]['id']
                 result = self._run_async(self.api_client.get_all_kpis(
                     machine_id=machine_id,
                     start=start.isoformat(),
@@ -3725,12 +3800,11 @@ class EnmsSkill(OVOSSkill):
             
             if machine:
                 # Machine-specific SEC
-                machines = self._run_async(self.api_client.list_machines(search=machine))
-                if not machines:
+                machine_id = self._resolve_machine_id(machine)
+                if not machine_id:
                     self.speak(f"I couldn't find a machine called {machine}")
                     return
                 
-                machine_id = machines[0]['id']
                 result = self._run_async(self.api_client.get_all_kpis(
                     machine_id=machine_id,
                     start=start.isoformat(),
@@ -3869,100 +3943,22 @@ class EnmsSkill(OVOSSkill):
     @intent_handler(IntentBuilder('Opportunities').require('opportunities').optionally('machine').build())
     def handle_opportunities(self, message: Message):
         """Handle energy saving opportunities queries"""
-        try:
-            utterance = message.data.get("utterances", [""])[0]
-            machine_raw = message.data.get('machine')
-            machine = self._normalize_machine_name(machine_raw) if machine_raw else None
-            
-            intent = Intent(
-                intent=IntentType.OPPORTUNITIES,
-                machine=machine,
-                confidence=0.95,
-                utterance=utterance
-            )
-            
-            result = self._call_enms_api(intent)
-            
-            if result['success']:
-                response = self.response_formatter.format_response('opportunities', result['data'])
-                self.speak(response)
-            else:
-                self.speak_dialog("error.general")
-        except Exception as e:
-            self.log.error(f"Opportunities handler failed: {e}")
-            self.speak_dialog("error.general")
+        self._dispatch(message, IntentType.OPPORTUNITIES, with_machine=True)
     
     @intent_handler(IntentBuilder('ISO50001').require('iso50001').build())
     def handle_iso50001(self, message: Message):
         """Handle ISO 50001 compliance queries"""
-        try:
-            utterance = message.data.get("utterances", [""])[0]
-            
-            intent = Intent(
-                intent=IntentType.ISO50001,
-                confidence=0.95,
-                utterance=utterance
-            )
-            
-            result = self._call_enms_api(intent)
-            
-            if result['success']:
-                response = self.response_formatter.format_response('iso50001', result['data'])
-                self.speak(response)
-            else:
-                self.speak_dialog("error.general")
-        except Exception as e:
-            self.log.error(f"ISO50001 handler failed: {e}")
-            self.speak_dialog("error.general")
+        self._dispatch(message, IntentType.ISO50001)
     
     @intent_handler(IntentBuilder('Alerts').require('alerts').build())
     def handle_alerts(self, message: Message):
         """Handle alert subscription queries"""
-        try:
-            utterance = message.data.get("utterances", [""])[0]
-            
-            intent = Intent(
-                intent=IntentType.ALERTS,
-                confidence=0.95,
-                utterance=utterance
-            )
-            
-            result = self._call_enms_api(intent)
-            
-            if result['success']:
-                response = self.response_formatter.format_response('alerts', result['data'])
-                self.speak(response)
-            else:
-                self.speak_dialog("error.general")
-        except Exception as e:
-            self.log.error(f"Alerts handler failed: {e}")
-            self.speak_dialog("error.general")
+        self._dispatch(message, IntentType.ALERTS)
     
     @intent_handler(IntentBuilder('EnergyTypes').require('energy_types').optionally('machine').build())
     def handle_energy_types(self, message: Message):
         """Handle energy types queries"""
-        try:
-            utterance = message.data.get("utterances", [""])[0]
-            machine_raw = message.data.get('machine')
-            machine = self._normalize_machine_name(machine_raw) if machine_raw else None
-            
-            intent = Intent(
-                intent=IntentType.ENERGY_TYPES,
-                machine=machine,
-                confidence=0.95,
-                utterance=utterance
-            )
-            
-            result = self._call_enms_api(intent)
-            
-            if result['success']:
-                response = self.response_formatter.format_response('energy_types', result['data'])
-                self.speak(response)
-            else:
-                self.speak_dialog("error.general")
-        except Exception as e:
-            self.log.error(f"Energy types handler failed: {e}")
-            self.speak_dialog("error.general")
+        self._dispatch(message, IntentType.ENERGY_TYPES, with_machine=True)
     
     @intent_handler(IntentBuilder('ModelQuery').require('model_query').build())
     def handle_model_query(self, message: Message):
@@ -4030,15 +4026,10 @@ class EnmsSkill(OVOSSkill):
                 return False
             
             # Check if this is a follow-up/contextual query
-            # These typically reference previous context without full detail
-            follow_up_indicators = [
-                'what about', 'and the', 'how about', 'also show',
-                'what else', 'anything else', 'more details', 'tell me more',
-                'yesterday', 'last week', 'last month', 'today',
-                'the other', 'another', 'different'
-            ]
-            
-            is_follow_up = any(indicator in utterance.lower() for indicator in follow_up_indicators)
+            # These typically reference previous context without full detail;
+            # bail out before any session lookup for everything else
+            if not FOLLOW_UP_PATTERN.search(utterance.lower()):
+                return False
             
             # Check if we have active context
             session_id = self._get_session_id(message)
@@ -4049,7 +4040,7 @@ class EnmsSkill(OVOSSkill):
             
             # Only handle if it's clearly a follow-up AND we have context
             # Otherwise, let intent handlers try first
-            if not (is_follow_up and has_context):
+            if not has_context:
                 return False
             
             # Process as follow-up query with context
@@ -4091,7 +4082,7 @@ class EnmsSkill(OVOSSkill):
         self.logger.info("skill_shutdown", 
                         skill_name="EnmsSkill",
                         total_queries=self.query_count,
-                        avg_latency_ms=round(self.total_latency_ms / max(self.query_count, 1), 2))
+                        avg_latency_ms=self._avg_latency_ms())
         
         # Close async clients using persistent loop
         try:
@@ -4100,11 +4091,9 @@ class EnmsSkill(OVOSSkill):
         except Exception as e:
             self.logger.error("api_client_shutdown_failed", error=str(e))
         
-        # Close the persistent event loop
+        # Stop the persistent event loop thread
         try:
-            if self._async_loop and not self._async_loop.is_closed():
-                self._async_loop.close()
-                self._async_loop = None
+            self._stop_async_loop()
         except Exception as e:
             self.logger.error("event_loop_shutdown_failed", error=str(e))
         
@@ -15,7 +15,7 @@ from adapt.intent import IntentBuilder
 from adapt.engine import IntentDeterminationEngine
 
 from .models import IntentType
-from .observability import query_latency, tier_routing, queries_total
+from .observability import query_latency, tier_routing, queries_total, labeled
 
 logger = structlog.get_logger()
 
@@ -448,12 +448,12 @@ class AdaptParser:
         
         latency_ms = (time.time() - start_time) * 1000
         
-        self.logger.info("adapt_match",
+        self.logger.debug("adapt_match",
                         intent=mapped_intent,
                         confidence=confidence,
                         latency_ms=latency_ms)
         
         # Update metrics
-        query_latency.labels(intent_type=mapped_intent, tier="adapt").observe(latency_ms / 1000)
+        labeled(query_latency, mapped_intent, "adapt").observe(latency_ms / 1000)
         
         return result
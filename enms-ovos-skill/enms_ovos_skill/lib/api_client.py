@@ -2,7 +2,8 @@
 EnMS API Client - Async HTTP client for Energy Management System
 Tier 3: API Executor with circuit breaker, retries, and connection pooling
 """
-from typing import Optional, Dict, Any, List
+import time
+from typing import Optional, Dict, Any, List, Sequence
 from datetime import datetime, timezone, timedelta
 import httpx
 from tenacity import (
@@ -14,6 +15,20 @@ from tenacity import (
 )
 import structlog
 
+# HTTP/2 support (optional, provided by httpx[http2])
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Fast JSON decoding (optional)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = structlog.get_logger(__name__)
 
 
@@ -27,6 +42,10 @@ def _should_retry_exception(exception: BaseException) -> bool:
     return isinstance(exception, (httpx.ConnectError, httpx.TimeoutException))
 
 
+class CircuitOpenError(httpx.RequestError):
+    """Raised without touching the network while the circuit breaker is open"""
+
+
 class ENMSClient:
     """
     Async HTTP client for EnMS API with reliability features
@@ -43,7 +62,14 @@ class ENMSClient:
         self,
         base_url: str = "http://10.33.10.104:8001/api/v1",
         timeout: float = 90.0,
-        max_retries: int = 3
+        max_retries: int = 3,
+        max_connections: int = 32,
+        max_keepalive_connections: int = 16,
+        keepalive_expiry: float = 60.0,
+        connect_timeout: float = 5.0,
+        http2: bool = True,
+        breaker_failure_threshold: int = 5,
+        breaker_reset_seconds: float = 30.0
     ):
         """
         Initialize EnMS API client
@@ -52,19 +78,66 @@ class ENMSClient:
             base_url: EnMS API base URL
             timeout: Request timeout in seconds
             max_retries: Maximum retry attempts
+            max_connections: Connection pool size
+            max_keepalive_connections: Idle connections kept open for reuse
+            keepalive_expiry: Seconds an idle connection stays in the pool
+            connect_timeout: TCP/TLS connect timeout in seconds
+            http2: Use HTTP/2 when available (needs h2; negotiated over TLS)
+            breaker_failure_threshold: Consecutive failures that open the circuit
+            breaker_reset_seconds: Seconds the circuit stays open before a probe
         """
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
         self.max_retries = max_retries
+        self.http2 = http2 and HTTP2_AVAILABLE
+        
+        # Circuit breaker: after N consecutive connection/timeout/5xx failures,
+        # fail fast instead of waiting out timeouts against a dead EnMS
+        self.breaker_failure_threshold = breaker_failure_threshold
+        self.breaker_reset_seconds = breaker_reset_seconds
+        self._consecutive_failures = 0
+        self._opened_at: Optional[float] = None
+        self._probe_in_flight = False  # Half-open: one request tests EnMS at a time
         
-        # Async HTTP client with connection pooling
+        # Async HTTP client with connection pooling - kept alive across intents
+        # so repeated queries skip TCP/TLS handshakes
         self.client = httpx.AsyncClient(
             base_url=self.base_url,
-            timeout=httpx.Timeout(timeout),
-            limits=httpx.Limits(max_connections=10, max_keepalive_connections=5)
+            http2=self.http2,
+            timeout=httpx.Timeout(timeout, connect=connect_timeout),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry
+            )
         )
         
-        logger.info("enms_client_initialized", base_url=self.base_url, timeout=timeout)
+        logger.info("enms_client_initialized",
+                   base_url=self.base_url,
+                   timeout=timeout,
+                   http2=self.http2,
+                   max_connections=max_connections)
+    
+    @property
+    def breaker_open(self) -> bool:
+        """True while the circuit is open; half-opens after breaker_reset_seconds"""
+        return (self._opened_at is not None
+                and time.monotonic() - self._opened_at < self.breaker_reset_seconds)
+    
+    def _record_success(self):
+        if self._opened_at is not None:
+            logger.info("circuit_breaker_closed")
+        self._consecutive_failures = 0
+        self._opened_at = None
+    
+    def _record_failure(self):
+        self._consecutive_failures += 1
+        if self._consecutive_failures >= self.breaker_failure_threshold:
+            # Also re-opens after a failed half-open probe
+            self._opened_at = time.monotonic()
+            logger.warning("circuit_breaker_open",
+                          failures=self._consecutive_failures,
+                          reset_seconds=self.breaker_reset_seconds)
     
     async def close(self):
         """Close the HTTP client and cleanup resources"""
@@ -97,39 +170,69 @@ class ENMSClient:
             
         Raises:
             httpx.HTTPError: On request failure after retries
-        """
+            CircuitOpenError: If the circuit breaker is open
+        """
+        probe = False
+        if self._opened_at is not None:
+            # Half-open: only one probe goes out; everyone else fails fast
+            # until it closes (success) or re-opens (failure) the circuit
+            if self.breaker_open or self._probe_in_flight:
+                raise CircuitOpenError(f"EnMS circuit open, skipping {method} {endpoint}")
+            self._probe_in_flight = probe = True
+        
         url = f"{self.base_url}{endpoint}"
         
-        logger.info("api_request", method=method, endpoint=endpoint, params=params)
+        # Encode bodies with orjson too (stdlib json otherwise)
+        body = {}
+        if json is not None:
+            if ORJSON_AVAILABLE:
+                body["content"] = orjson.dumps(json, option=orjson.OPT_NON_STR_KEYS)
+                body["headers"] = {"content-type": "application/json"}
+            else:
+                body["json"] = json
         
         try:
             response = await self.client.request(
                 method=method,
                 url=endpoint,
                 params=params,
-                json=json
+                **body
             )
             response.raise_for_status()
+            self._record_success()
             
-            data = response.json()
-            logger.info("api_response", 
-                       endpoint=endpoint, 
+            data = orjson.loads(response.content) if ORJSON_AVAILABLE else response.json()
+            # One event per call; failures are logged below with the same fields
+            logger.info("api_response",
+                       method=method,
+                       endpoint=endpoint,
+                       params=params,
                        status_code=response.status_code,
                        response_time_ms=response.elapsed.total_seconds() * 1000)
             
             return data
             
         except httpx.HTTPStatusError as e:
+            if e.response.status_code >= 500:
+                self._record_failure()
             logger.error("api_http_error",
+                        method=method,
                         endpoint=endpoint,
+                        params=params,
                         status_code=e.response.status_code,
                         error=str(e))
             raise
         except httpx.RequestError as e:
+            self._record_failure()
             logger.error("api_request_error",
+                        method=method,
                         endpoint=endpoint,
+                        params=params,
                         error=str(e))
             raise
+        finally:
+            if probe:
+                self._probe_in_flight = False
     
     # Health & System Endpoints
     
@@ -201,7 +304,8 @@ class ENMSClient:
     async def list_machines(
         self,
         search: Optional[str] = None,
-        is_active: Optional[bool] = None
+        is_active: Optional[bool] = None,
+        fields: Optional[Sequence[str]] = None
     ) -> List[Dict[str, Any]]:
         """
         List all machines with optional filtering
@@ -209,6 +313,8 @@ class ENMSClient:
         Args:
             search: Filter by machine name (case-insensitive)
             is_active: Filter by active status
+            fields: Only return these fields (smaller payload; ignored by
+                    servers that don't support projection)
             
         Returns:
             List of machine metadata
@@ -218,6 +324,8 @@ class ENMSClient:
             params["search"] = search
         if is_active is not None:
             params["is_active"] = str(is_active).lower()
+        if fields:
+            params["fields"] = ",".join(fields)
         
         return await self._request("GET", "/machines", params=params)
     
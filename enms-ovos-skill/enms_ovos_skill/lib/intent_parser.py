@@ -24,11 +24,23 @@ from .observability import (
     tier_routing,
     query_latency,
     queries_total,
-    active_queries
+    active_queries,
+    labeled
 )
 
 logger = structlog.get_logger()
 
+# Time range patterns used by HybridParser when no tier extracted one
+# (compiled once; checked on every parse)
+FROM_TO_PATTERN = re.compile(r'from\s+(.+?)\s+to\s+(.+?)(?:\s+(?:am|pm|for|in|at|$))')
+TIME_RANGE_PATTERNS = [
+    re.compile(r'in\s+the\s+last\s+(\d+\s+)?(\w+)'),  # "in the last hour", "in the last 2 days"
+    re.compile(r'this\s+(week|month|year)'),
+    re.compile(r'last\s+(week|month|year|\d+\s+(?:hour|day|week)s?)'),
+    re.compile(r'between\s+(.+?)\s+and\s+(.+?)(?:\s|$)'),
+    re.compile(r'(yesterday|today)'),
+]
+
 
 class RoutingTier(str, Enum):
     """Which parser tier handled the query"""
@@ -60,6 +72,9 @@ class HeuristicRouter:
         "HVAC-EU-North", "HVAC-Main", "Injection-Molding-1", "Turbine-1"
     ]
     
+    # Machine alternation currently embedded in PATTERNS (see update_machines)
+    _machine_alternation = '|'.join(re.escape(m) for m in MACHINES)
+    
     # Regex patterns (compiled for speed)
     # CRITICAL: Order matters! More specific patterns first
     PATTERNS = {
@@ -369,6 +384,44 @@ class HeuristicRouter:
         """Initialize heuristic router"""
         self.logger = logger.bind(component="heuristic_router")
     
+    def update_machines(self, machines: List[str]) -> None:
+        """
+        Swap in a new machine whitelist and recompile machine-bearing patterns
+        
+        PATTERNS are compiled at import time from the built-in MACHINES list, so
+        machines discovered later via the EnMS API would otherwise never match
+        the Tier 1 regexes. Only patterns that embed the machine alternation are
+        recompiled; the rest are shared with the class.
+        
+        Args:
+            machines: Canonical machine names (from DynamicMachineRegistry)
+        """
+        old_alternation = self._machine_alternation
+        # Longest first so a name that prefixes another can't shadow it
+        new_alternation = '|'.join(
+            re.escape(m) for m in sorted(machines, key=len, reverse=True)
+        )
+        
+        patterns = {}
+        recompiled = 0
+        for intent_type, intent_patterns in self.PATTERNS.items():
+            patterns[intent_type] = []
+            for pattern in intent_patterns:
+                if old_alternation in pattern.pattern:
+                    pattern = re.compile(
+                        pattern.pattern.replace(old_alternation, new_alternation),
+                        pattern.flags
+                    )
+                    recompiled += 1
+                patterns[intent_type].append(pattern)
+        
+        self.MACHINES = list(machines)
+        self.PATTERNS = patterns
+        self._machine_alternation = new_alternation
+        self.logger.info("heuristic_machines_updated",
+                        machines_count=len(machines),
+                        patterns_recompiled=recompiled)
+    
     def _extract_machine_fuzzy(self, utterance: str) -> Optional[str]:
         """
         Extract machine name with fuzzy matching
@@ -658,13 +711,13 @@ class HeuristicRouter:
                     result = self._build_intent(intent_type, match, normalized)
                     if result:
                         latency_ms = (time.time() - start_time) * 1000
-                        self.logger.info(
+                        self.logger.debug(
                             "heuristic_match",
                             intent=intent_type,
                             pattern=pattern.pattern[:50],
                             latency_ms=latency_ms
                         )
-                        query_latency.labels(intent_type=intent_type, tier="heuristic").observe(latency_ms / 1000)
+                        labeled(query_latency, intent_type, "heuristic").observe(latency_ms / 1000)
                         return result
         
         # No pattern matched
@@ -1118,23 +1171,17 @@ class HybridParser:
             # Try to extract time range from utterance if not in entities
             if not time_range_str:
                 # Look for common time patterns in utterance
-                import re
+                utterance_lower = utterance.lower()
                 
                 # "from X to Y" - greedy match
-                match = re.search(r'from\s+(.+?)\s+to\s+(.+?)(?:\s+(?:am|pm|for|in|at|$))', utterance.lower())
+                match = FROM_TO_PATTERN.search(utterance_lower)
                 if match:
                     # Reconstruct full range
                     time_range_str = f"{match.group(1)} to {match.group(2)}"
                 else:
                     # Try other patterns
-                    for pattern in [
-                        r'in\s+the\s+last\s+(\d+\s+)?(\w+)',  # "in the last hour", "in the last 2 days"
-                        r'this\s+(week|month|year)',
-                        r'last\s+(week|month|year|\d+\s+(?:hour|day|week)s?)',
-                        r'between\s+(.+?)\s+and\s+(.+?)(?:\s|$)',
-                        r'(yesterday|today)',
-                    ]:
-                        match = re.search(pattern, utterance.lower())
+                    for pattern in TIME_RANGE_PATTERNS:
+                        match = pattern.search(utterance_lower)
                         if match:
                             time_range_str = match.group(0)
                             break
@@ -1151,12 +1198,6 @@ class HybridParser:
                     result['entities']['time_range'] = time_range_str
                     result['entities']['start_time'] = start_dt
                     result['entities']['end_time'] = end_dt
-                    
-                    self.logger.info("time_range_parsed",
-                                   raw=time_range_str,
-                                   start=start_dt.isoformat(),
-                                   end=end_dt.isoformat(),
-                                   tier=tier_used)
                 else:
                     self.logger.warning("time_range_parse_failed", 
                                       raw=time_range_str,
@@ -1169,20 +1210,22 @@ class HybridParser:
             # Update stats
             self.stats['total'] += 1
             
-            # Log routing decision
+            # Log routing decision - the single info event per parse
+            entities = result.get('entities') or {}
             self.logger.info(
                 "query_routed",
                 utterance=utterance[:50],
                 tier=tier_used,
                 intent=result.get('intent'),
                 confidence=result.get('confidence'),
+                time_range=entities.get('time_range') if 'start_time' in entities else None,
                 latency_ms=result['routing_latency_ms']
             )
             
             # Update metrics
-            tier_routing.labels(tier=tier_used).inc()
-            query_latency.labels(intent_type=result.get('intent'), tier=tier_used).observe(result['routing_latency_ms'] / 1000)
-            queries_total.labels(intent_type=result.get('intent'), tier=tier_used, status='success').inc()
+            labeled(tier_routing, tier_used).inc()
+            labeled(query_latency, result.get('intent'), tier_used).observe(result['routing_latency_ms'] / 1000)
+            labeled(queries_total, result.get('intent'), tier_used, 'success').inc()
             
             return result
             
@@ -2,34 +2,58 @@
 Structured logging configuration for EnMS OVOS Skill
 Uses structlog for JSON-formatted, context-rich logging
 """
+import logging
 import sys
 import structlog
-from structlog.processors import TimeStamper, StackInfoRenderer, format_exc_info
-from structlog.stdlib import add_log_level, add_logger_name
+from structlog.processors import TimeStamper, StackInfoRenderer, format_exc_info, add_log_level
 
+# orjson renders ~3x faster than stdlib json (optional)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
-def configure_logging(log_level: str = "INFO"):
+
+def create_json_logger(log_level: str = "INFO", **initial_values) -> structlog.BoundLogger:
     """
-    Configure structured logging for the skill
+    Create a skill-local structured JSON logger
+    
+    Processors and level filter are attached to this logger only; structlog's
+    global configuration is shared with every skill and plugin in the OVOS
+    process and is left untouched. Events below log_level are dropped by the
+    bound logger itself, before any processor runs.
     
     Args:
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR)
+        **initial_values: Context bound to every event (e.g. component)
+        
+    Returns:
+        Configured structlog logger
     """
-    structlog.configure(
+    if ORJSON_AVAILABLE:
+        # orjson emits bytes, so write through a BytesLogger
+        renderer = structlog.processors.JSONRenderer(serializer=orjson.dumps)
+        output = structlog.BytesLogger(file=sys.stdout.buffer)
+    else:
+        renderer = structlog.processors.JSONRenderer()
+        output = structlog.PrintLogger(file=sys.stdout)
+    
+    return structlog.wrap_logger(
+        output,
         processors=[
             add_log_level,
-            add_logger_name,
             TimeStamper(fmt="iso"),
             StackInfoRenderer(),
             format_exc_info,
-            structlog.processors.JSONRenderer()
+            renderer
         ],
         context_class=dict,
-        logger_factory=structlog.PrintLoggerFactory(file=sys.stdout),
         wrapper_class=structlog.make_filtering_bound_logger(
-            getattr(structlog.stdlib.logging, log_level)
+            getattr(logging, log_level.upper(), logging.INFO)
         ),
         cache_logger_on_first_use=True,
+        **initial_values
     )
 
 
@@ -56,6 +56,7 @@ class DynamicMachineRegistry:
         
         # Cached data
         self.machines: List[str] = []
+        self.machine_ids: Dict[str, str] = {}  # lowercase name -> machine id
         self.seus: List[Dict[str, Any]] = []
         self.last_refresh: Optional[datetime] = None
         self.refresh_in_progress = False
@@ -83,17 +84,22 @@ class DynamicMachineRegistry:
             
             # Fetch machines from API
             try:
-                machines_response = await self.api_client.list_machines()
+                # Names for the whitelist, ids so queries can skip a search call
+                machines_response = await self.api_client.list_machines(fields=("id", "name"))
                 
                 if machines_response and isinstance(machines_response, list):
                     # Extract machine names/IDs
                     self.machines = []
+                    machine_ids = {}
                     for machine in machines_response:
                         if isinstance(machine, dict):
                             # Prefer 'machine_name' or 'name' field
                             machine_name = machine.get('machine_name') or machine.get('name') or machine.get('machine_id')
                             if machine_name:
                                 self.machines.append(machine_name)
+                                if machine.get('id'):
+                                    machine_ids[machine_name.lower()] = machine['id']
+                    self.machine_ids = machine_ids
                     
                     logger.info("machines_fetched_from_api",
                                count=len(self.machines),
@@ -161,6 +167,19 @@ class DynamicMachineRegistry:
         
         return self.machines if self.machines else self.fallback_machines
     
+    def get_machine_id(self, machine_name: str) -> Optional[str]:
+        """
+        Get cached machine ID by name (case-insensitive)
+        
+        Returns:
+            Machine ID, or None if not cached
+        """
+        return self.machine_ids.get(machine_name.lower())
+    
+    def cache_machine_id(self, machine_name: str, machine_id: str):
+        """Remember a machine ID resolved outside refresh()"""
+        self.machine_ids[machine_name.lower()] = machine_id
+    
     def get_seus(self) -> List[Dict[str, Any]]:
         """
         Get cached SEU list
@@ -82,6 +82,9 @@ class Intent(BaseModel):
     # NEW: Extra parameters for special intents (report, etc.)
     params: Optional[Dict[str, Any]] = None
     
+    # Parser entities (e.g. pre-parsed start_time/end_time); always a dict
+    entities: Dict[str, Any] = Field(default_factory=dict)
+    
     # Raw utterance
     utterance: str
     
@@ -11,8 +11,11 @@ Provides:
 """
 from prometheus_client import Counter, Histogram, Gauge, CollectorRegistry, generate_latest
 from prometheus_client import CONTENT_TYPE_LATEST
+from prometheus_client.metrics_core import Metric
+from prometheus_client.registry import Collector
+import functools
 import time
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable
 import structlog
 
 logger = structlog.get_logger(__name__)
@@ -20,79 +23,138 @@ logger = structlog.get_logger(__name__)
 # Create custom registry to avoid conflicts
 REGISTRY = CollectorRegistry()
 
-# Metrics definitions
-
-# Latency histogram - measures end-to-end query processing time
-query_latency = Histogram(
-    'enms_query_latency_seconds',
-    'End-to-end query processing latency',
-    ['intent_type', 'tier'],  # Labels for grouping
-    buckets=[0.01, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0, 5.0, 10.0],  # Bucket boundaries
-    registry=REGISTRY
-)
-
-# LLM inference latency (subset of total)
-llm_latency = Histogram(
-    'enms_llm_latency_seconds',
-    'LLM inference time',
-    buckets=[0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0],
-    registry=REGISTRY
-)
-
-# API call latency
-api_latency = Histogram(
-    'enms_api_latency_seconds',
-    'EnMS API call time',
-    ['endpoint', 'status_code'],
-    buckets=[0.01, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0],
-    registry=REGISTRY
-)
-
-# Query counters
-queries_total = Counter(
-    'enms_queries_total',
-    'Total queries processed',
-    ['intent_type', 'tier', 'status'],  # status: success/failure
-    registry=REGISTRY
-)
-
-# Error counter
-errors_total = Counter(
-    'enms_errors_total',
-    'Total errors by type',
-    ['error_type', 'component'],  # component: llm/validator/api/formatter
-    registry=REGISTRY
-)
-
-# Tier routing distribution
-tier_routing = Counter(
-    'enms_tier_routing_total',
-    'Query routing by tier',
-    ['tier'],  # tier: adapt/heuristic/llm
-    registry=REGISTRY
-)
-
-# Validation metrics
-validation_rejections = Counter(
-    'enms_validation_rejections_total',
-    'Queries rejected by validator',
-    ['rejection_reason'],  # reason: low_confidence/invalid_entity/schema_error
-    registry=REGISTRY
-)
-
-# Active queries gauge
-active_queries = Gauge(
-    'enms_active_queries',
-    'Currently processing queries',
-    registry=REGISTRY
-)
-
-# Model loading status
-model_loaded = Gauge(
-    'enms_model_loaded',
-    'LLM model loaded status (1=loaded, 0=not loaded)',
-    registry=REGISTRY
-)
+
+class EnmsMetricsCollector(Collector):
+    """
+    Owns every skill metric and exposes them as one registry collector
+    
+    The metrics are created unregistered; a scrape walks this single
+    collector instead of one registry entry per metric. describe() keeps
+    the registry's duplicate-name checks working.
+    """
+    
+    def __init__(self):
+        # Latency histogram - measures end-to-end query processing time
+        self.query_latency = Histogram(
+            'enms_query_latency_seconds',
+            'End-to-end query processing latency',
+            ['intent_type', 'tier'],  # Labels for grouping
+            buckets=[0.01, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0, 5.0, 10.0],  # Bucket boundaries
+            registry=None
+        )
+        
+        # LLM inference latency (subset of total)
+        self.llm_latency = Histogram(
+            'enms_llm_latency_seconds',
+            'LLM inference time',
+            buckets=[0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0],
+            registry=None
+        )
+        
+        # API call latency
+        self.api_latency = Histogram(
+            'enms_api_latency_seconds',
+            'EnMS API call time',
+            ['endpoint', 'status_code'],
+            buckets=[0.01, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0],
+            registry=None
+        )
+        
+        # Query counters
+        self.queries_total = Counter(
+            'enms_queries_total',
+            'Total queries processed',
+            ['intent_type', 'tier', 'status'],  # status: success/failure
+            registry=None
+        )
+        
+        # Error counter
+        self.errors_total = Counter(
+            'enms_errors_total',
+            'Total errors by type',
+            ['error_type', 'component'],  # component: llm/validator/api/formatter
+            registry=None
+        )
+        
+        # Tier routing distribution
+        self.tier_routing = Counter(
+            'enms_tier_routing_total',
+            'Query routing by tier',
+            ['tier'],  # tier: adapt/heuristic/llm
+            registry=None
+        )
+        
+        # Validation metrics
+        self.validation_rejections = Counter(
+            'enms_validation_rejections_total',
+            'Queries rejected by validator',
+            ['rejection_reason'],  # reason: low_confidence/invalid_entity/schema_error
+            registry=None
+        )
+        
+        # Active queries gauge
+        self.active_queries = Gauge(
+            'enms_active_queries',
+            'Currently processing queries',
+            registry=None
+        )
+        
+        # Model loading status
+        self.model_loaded = Gauge(
+            'enms_model_loaded',
+            'LLM model loaded status (1=loaded, 0=not loaded)',
+            registry=None
+        )
+        
+        self._metrics = (
+            self.query_latency, self.llm_latency, self.api_latency,
+            self.queries_total, self.errors_total, self.tier_routing,
+            self.validation_rejections, self.active_queries, self.model_loaded
+        )
+    
+    def describe(self) -> Iterable[Metric]:
+        for metric in self._metrics:
+            yield from metric.describe()
+    
+    def collect(self) -> Iterable[Metric]:
+        for metric in self._metrics:
+            yield from metric.collect()
+
+
+METRICS = EnmsMetricsCollector()
+REGISTRY.register(METRICS)
+
+# Module-level handles used across the skill
+query_latency = METRICS.query_latency
+llm_latency = METRICS.llm_latency
+api_latency = METRICS.api_latency
+queries_total = METRICS.queries_total
+errors_total = METRICS.errors_total
+tier_routing = METRICS.tier_routing
+validation_rejections = METRICS.validation_rejections
+active_queries = METRICS.active_queries
+model_loaded = METRICS.model_loaded
+
+
+@functools.lru_cache(maxsize=None)
+def _labeled_child(metric, labelvalues: tuple):
+    return metric.labels(*labelvalues)
+
+
+def labeled(metric, *labelvalues):
+    """
+    Cached metric.labels(...) child for hot paths
+    
+    labels() re-validates the label set and takes the metric lock on every
+    call; label sets here are small and fixed (intent x tier), so each child
+    is resolved once and reused.
+    
+    Args:
+        metric: Labelled Counter/Histogram/Gauge
+        labelvalues: Label values in the metric's label order
+    """
+    # str() up front: str-Enum members hash equal to their values
+    return _labeled_child(metric, tuple(map(str, labelvalues)))
 
 
 class MetricsCollector:
@@ -117,7 +179,7 @@ class MetricsCollector:
     def __enter__(self):
         self.start_time = time.time()
         active_queries.inc()
-        tier_routing.labels(tier=self.tier).inc()
+        labeled(tier_routing, self.tier).inc()
         return self
         
     def __exit__(self, exc_type, exc_val, exc_tb):
@@ -125,24 +187,13 @@ class MetricsCollector:
         active_queries.dec()
         
         # Record latency
-        query_latency.labels(
-            intent_type=self.intent_type,
-            tier=self.tier
-        ).observe(latency)
+        labeled(query_latency, self.intent_type, self.tier).observe(latency)
         
         # Record outcome
         if exc_type is None and self.status == 'success':
-            queries_total.labels(
-                intent_type=self.intent_type,
-                tier=self.tier,
-                status='success'
-            ).inc()
+            labeled(queries_total, self.intent_type, self.tier, 'success').inc()
         else:
-            queries_total.labels(
-                intent_type=self.intent_type,
-                tier=self.tier,
-                status='failure'
-            ).inc()
+            labeled(queries_total, self.intent_type, self.tier, 'failure').inc()
             
             # Log error
             if exc_type:
@@ -176,10 +227,7 @@ def record_llm_latency(latency_seconds: float):
 
 def record_api_call(endpoint: str, status_code: int, latency_seconds: float):
     """Record API call metrics"""
-    api_latency.labels(
-        endpoint=endpoint,
-        status_code=str(status_code)
-    ).observe(latency_seconds)
+    labeled(api_latency, endpoint, status_code).observe(latency_seconds)
     
     logger.debug("api_call_recorded",
                 endpoint=endpoint,
@@ -189,13 +237,13 @@ def record_api_call(endpoint: str, status_code: int, latency_seconds: float):
 
 def record_validation_rejection(reason: str):
     """Record validation rejection"""
-    validation_rejections.labels(rejection_reason=reason).inc()
+    labeled(validation_rejections, reason).inc()
     logger.warning("validation_rejected", reason=reason)
 
 
 def record_error(error_type: str, component: str):
     """Record error occurrence"""
-    errors_total.labels(error_type=error_type, component=component).inc()
+    labeled(errors_total, error_type, component).inc()
     logger.error("error_recorded", error_type=error_type, component=component)
 
 
@@ -42,7 +42,9 @@ class ResponseFormatter:
             loader=FileSystemLoader(str(template_dir)),
             autoescape=False,  # We control the output
             trim_blocks=True,
-            lstrip_blocks=True
+            lstrip_blocks=True,
+            auto_reload=False,  # Templates ship with the skill; skip per-render mtime checks
+            cache_size=-1       # Never evict compiled templates
         )
         
         # Register custom filters for voice optimization
@@ -51,8 +53,43 @@ class ResponseFormatter:
         self.env.filters['voice_time'] = self._voice_time
         self.env.filters['num'] = self._format_number  # Numeric format (better UX)
         
+        # Template name -> compiled Template; skips Environment.get_template's
+        # loader/cache-key work on every render
+        self._templates: Dict[str, Template] = {}
+        
         logger.info("response_formatter_initialized", template_dir=str(template_dir))
     
+    def precompile(self) -> int:
+        """
+        Compile all dialog templates up front
+        
+        Moves Jinja2 parsing/compilation out of the first request for each
+        intent. Safe to call more than once.
+        
+        Returns:
+            Number of templates compiled
+        """
+        names = self.env.list_templates(extensions=["dialog"])
+        for name in names:
+            self.get_template(name)
+        logger.info("templates_precompiled", count=len(names))
+        return len(names)
+    
+    def get_template(self, name: str) -> Template:
+        """
+        Get a compiled dialog template, loading it on first use
+        
+        Args:
+            name: Template file name (e.g., "health_check.dialog")
+            
+        Raises:
+            jinja2.TemplateNotFound: If no such template exists
+        """
+        template = self._templates.get(name)
+        if template is None:
+            template = self._templates[name] = self.env.get_template(name)
+        return template
+    
     def _format_number(self, value: float, precision: int = 1) -> str:
         """
         Format number as digits with proper formatting (better UX than words)
@@ -111,10 +148,11 @@ class ResponseFormatter:
         template_name = f"{intent_type}.dialog"
         
         try:
-            template = self.env.get_template(template_name)
+            template = self.get_template(template_name)
             
-            # Merge API data with context
-            data = {**(context or {}), **api_data}
+            # Merge API data with context (no copy when there's no context -
+            # the common case for intent handlers)
+            data = {**context, **api_data} if context else api_data
             
             # Render template
             response = template.render(**data)
@@ -304,6 +342,10 @@ class ResponseFormatter:
         return "I found the information you requested. Please check the screen for details."
 
 
+# Shared instance for format_response() so its template cache survives calls
+_default_formatter: Optional[ResponseFormatter] = None
+
+
 # Convenience function for quick responses
 def format_response(intent: str, data: Dict[str, Any], 
                    context: Optional[Dict[str, Any]] = None) -> str:
@@ -318,5 +360,7 @@ def format_response(intent: str, data: Dict[str, Any],
     Returns:
         Formatted response
     """
-    formatter = ResponseFormatter()
-    return formatter.format_response(intent, data, context)
+    global _default_formatter
+    if _default_formatter is None:
+        _default_formatter = ResponseFormatter()
+    return _default_formatter.format_response(intent, data, context)
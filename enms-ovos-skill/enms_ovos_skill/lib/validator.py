@@ -3,7 +3,7 @@ Zero-Trust Validator - Tier 2: Hallucination Prevention
 Validates ALL LLM outputs before API execution
 99.5%+ accuracy through strict entity whitelisting
 """
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable
 from datetime import datetime, timedelta
 import re
 import structlog
@@ -13,13 +13,27 @@ from .models import Intent, IntentType, TimeRange, ValidationResult
 
 logger = structlog.get_logger(__name__)
 
-# Fuzzy string matching library
+# Fuzzy string matching library (rapidfuzz: C++ scorers, what thefuzz wraps)
 try:
-    from thefuzz import fuzz
+    from rapidfuzz import fuzz, process
     FUZZY_AVAILABLE = True
 except ImportError:
     FUZZY_AVAILABLE = False
-    logger.warning("thefuzz_not_installed", message="Fuzzy matching will use simple Levenshtein")
+    logger.warning("rapidfuzz_not_installed", message="Fuzzy matching will use simple Levenshtein")
+
+# Spoken number words -> digits ("compressor one" -> "compressor 1")
+NUMBER_WORDS = {
+    'one': '1', 'two': '2', 'three': '3', 'four': '4', 'five': '5',
+    'six': '6', 'seven': '7', 'eight': '8', 'nine': '9', 'ten': '10',
+    'first': '1', 'second': '2', 'third': '3', 'fourth': '4'
+}
+_NUMBER_WORD_PATTERN = re.compile(r'\b(' + '|'.join(NUMBER_WORDS) + r')\b')
+
+
+def _digits_for_number_words(text: str) -> str:
+    """Replace spoken number words with digits in a single regex pass"""
+    return _NUMBER_WORD_PATTERN.sub(lambda m: NUMBER_WORDS[m.group(1)], text)
+
 
 # Entity Whitelists (will be refreshed from EnMS API)
 VALID_MACHINES = [
@@ -33,6 +47,18 @@ VALID_MACHINES = [
     "Pump-1"
 ]
 
+# Intents that don't need a machine (machine validation is skipped)
+FACTORY_WIDE_INTENTS = frozenset({
+    IntentType.FACTORY_OVERVIEW, 
+    IntentType.RANKING, 
+    IntentType.COST_ANALYSIS, 
+    IntentType.REPORT, 
+    IntentType.KPI,
+    IntentType.SEUS,
+    IntentType.HELP,
+    IntentType.FORECAST  # Can be factory-wide or machine-specific
+})
+
 VALID_METRICS = [
     "energy", "power", "consumption", "kwh", "watts", "kilowatts",
     "status", "running", "online", "offline", "active",
@@ -90,7 +116,7 @@ class ENMSValidator:
             confidence_threshold: Minimum confidence score (0-1)
             enable_fuzzy_matching: Allow fuzzy machine name matching
         """
-        self.machine_whitelist = machine_whitelist or VALID_MACHINES
+        self.update_machine_whitelist(machine_whitelist or VALID_MACHINES, log=False)
         self.confidence_threshold = confidence_threshold
         self.enable_fuzzy_matching = enable_fuzzy_matching
         
@@ -114,7 +140,19 @@ class ENMSValidator:
         
         logger.info("validation_start", llm_output=llm_output)
         
-        # Layer 1: Pydantic schema validation
+        # Layer 1: Confidence threshold - checked on the raw output first so
+        # uncertain parses are rejected without building the schema or parsing
+        # time ranges. Non-numeric values fall through to schema validation.
+        try:
+            confidence = float(llm_output.get("confidence", 0.0))
+        except (TypeError, ValueError):
+            confidence = None
+        if confidence is not None and confidence < self.confidence_threshold:
+            errors.append(f"Confidence {confidence:.2f} below threshold {self.confidence_threshold}")
+            warnings.append("LLM uncertain about this query")
+            return ValidationResult(valid=False, intent=None, errors=errors, warnings=warnings)
+        
+        # Layer 2: Pydantic schema validation
         try:
             # Handle both flat and nested entity structures
             entities = llm_output.get("entities", {})
@@ -164,34 +202,17 @@ class ENMSValidator:
             errors.append(f"Schema validation failed: {str(e)}")
             return ValidationResult(valid=False, intent=None, errors=errors)
         
-        # Layer 2: Confidence threshold
-        if intent.confidence < self.confidence_threshold:
-            errors.append(f"Confidence {intent.confidence:.2f} below threshold {self.confidence_threshold}")
-            warnings.append("LLM uncertain about this query")
-            return ValidationResult(valid=False, intent=None, errors=errors, warnings=warnings)
-        
         # Layer 3: Intent validation
-        if intent.intent == IntentType.UNKNOWN:
+        if intent.intent is IntentType.UNKNOWN:
             errors.append("Unknown intent type")
             suggestions.append("Try rephrasing your question")
             return ValidationResult(valid=False, intent=None, errors=errors, suggestions=suggestions)
         
         # Layer 4: Machine name validation
         # Skip machine validation for factory-wide intents
-        factory_wide_intents = [
-            IntentType.FACTORY_OVERVIEW, 
-            IntentType.RANKING, 
-            IntentType.COST_ANALYSIS, 
-            IntentType.REPORT, 
-            IntentType.KPI,
-            IntentType.SEUS,
-            IntentType.HELP,
-            IntentType.FORECAST  # Can be factory-wide or machine-specific
-        ]
-        
-        if intent.machine and intent.intent not in factory_wide_intents:
+        if intent.machine and intent.intent not in FACTORY_WIDE_INTENTS:
             # Special handling for COMPARISON: detect group/plural terms
-            if intent.intent == IntentType.COMPARISON:
+            if intent.intent is IntentType.COMPARISON:
                 machine_lower = intent.machine.lower()
                 is_group_query = any([
                     machine_lower.startswith('all '),
@@ -238,17 +259,9 @@ class ENMSValidator:
                 
                 # Check for ambiguous machine names ONLY if fuzzy match was used
                 # If exact match found (after number normalization), skip ambiguity check
-                # Number words to digits mapping (same as in _validate_machine)
-                number_words = {
-                    'one': '1', 'two': '2', 'three': '3', 'four': '4', 'five': '5',
-                    'six': '6', 'seven': '7', 'eight': '8', 'nine': '9', 'ten': '10',
-                    'first': '1', 'second': '2', 'third': '3'
-                }
-                
                 # Normalize user input with number conversion
                 machine_normalized = intent.machine.lower()
-                for word, digit in number_words.items():
-                    machine_normalized = re.sub(rf'\b{word}\b', digit, machine_normalized)
+                machine_normalized = _digits_for_number_words(machine_normalized)
                 machine_normalized_dash = machine_normalized.replace(" ", "-").replace("_", "-")
                 
                 # Check if matched_machine is an exact match after normalization
@@ -284,7 +297,7 @@ class ENMSValidator:
         # EXCEPTIONS: Allow machine for factory_overview if:
         # 1. Opportunities query (for filtering)
         # 2. Action plan query (required for plan creation)
-        if intent.intent in factory_wide_intents and intent.machine:
+        if intent.intent in FACTORY_WIDE_INTENTS and intent.machine:
             utterance_lower = intent.utterance.lower()
             is_opportunities = 'opportunities' in utterance_lower or 'saving' in utterance_lower
             is_action_plan = 'action plan' in utterance_lower or 'create plan' in utterance_lower
@@ -338,29 +351,17 @@ class ENMSValidator:
         if not machine_name:
             return True, None, None
         
-        # Number words to digits mapping for spoken input
-        number_words = {
-            'one': '1', 'two': '2', 'three': '3', 'four': '4', 'five': '5',
-            'six': '6', 'seven': '7', 'eight': '8', 'nine': '9', 'ten': '10',
-            'first': '1', 'second': '2', 'third': '3'
-        }
-        
         # Convert number words to digits (e.g., "compressor one" -> "compressor 1")
         machine_normalized = machine_name.lower()
-        for word, digit in number_words.items():
-            machine_normalized = re.sub(rf'\b{word}\b', digit, machine_normalized)
+        machine_normalized = _digits_for_number_words(machine_normalized)
         
         # Normalize: lowercase, replace spaces/underscores with hyphens
         machine_normalized_dash = machine_normalized.replace(" ", "-").replace("_", "-")
         
-        # Exact match (case-insensitive) - check both original and dash-normalized
-        for valid_machine in self.machine_whitelist:
-            valid_lower = valid_machine.lower()
-            valid_lower_dash = valid_lower.replace(" ", "-").replace("_", "-")
-            
-            # Direct exact match or dash-normalized exact match
-            if machine_normalized == valid_lower or machine_normalized_dash == valid_lower_dash:
-                return True, valid_machine, None
+        # Exact match (case-insensitive) - O(1) lookup on dash-normalized name
+        exact = self._whitelist_index.get(machine_normalized_dash)
+        if exact:
+            return True, exact, None
         
         # Fuzzy matching
         if self.enable_fuzzy_matching:
@@ -416,13 +417,6 @@ class ENMSValidator:
         if not raw_name:
             return None
         
-        # Number words to digits mapping
-        number_words = {
-            'one': '1', 'two': '2', 'three': '3', 'four': '4', 'five': '5',
-            'six': '6', 'seven': '7', 'eight': '8', 'nine': '9', 'ten': '10',
-            'first': '1', 'second': '2', 'third': '3', 'fourth': '4'
-        }
-        
         # Normalize input
         normalized = raw_name.lower().strip()
         
@@ -431,51 +425,39 @@ class ENMSValidator:
         normalized = normalized.replace(" dash ", "-")
         
         # Convert number words to digits
-        for word, digit in number_words.items():
-            normalized = re.sub(rf'\b{word}\b', digit, normalized)
+        normalized = _digits_for_number_words(normalized)
         
         # Standardize separators: space → hyphen
         normalized = normalized.replace(" ", "-").replace("_", "-")
         
         # Try exact match (case-insensitive)
-        for machine in self.machine_whitelist:
-            machine_normalized = machine.lower().replace(" ", "-").replace("_", "-")
-            if normalized == machine_normalized:
-                logger.debug("machine_normalized_exact", raw=raw_name, matched=machine)
-                return machine
-        
-        # Try hyphen vs space variants
-        for machine in self.machine_whitelist:
-            machine_variants = [
-                machine.lower(),
-                machine.lower().replace("-", " "),
-                machine.lower().replace("-", ""),
-                machine.lower().replace(" ", "")
-            ]
-            normalized_variants = [
-                normalized,
-                normalized.replace("-", " "),
-                normalized.replace("-", "")
-            ]
-            
-            for norm_var in normalized_variants:
-                for mach_var in machine_variants:
-                    if norm_var == mach_var:
-                        logger.debug("machine_normalized_variant", raw=raw_name, matched=machine, variant=norm_var)
-                        return machine
+        exact = self._whitelist_index.get(normalized)
+        if exact:
+            logger.debug("machine_normalized_exact", raw=raw_name, matched=exact)
+            return exact
+        
+        # Try hyphen vs space variants (earliest whitelist entry wins)
+        candidates = [
+            self._whitelist_variants[norm_var]
+            for norm_var in (normalized, normalized.replace("-", " "), normalized.replace("-", ""))
+            if norm_var in self._whitelist_variants
+        ]
+        if candidates:
+            _, machine = min(candidates)
+            logger.debug("machine_normalized_variant", raw=raw_name, matched=machine)
+            return machine
         
-        # Fuzzy match (80% similarity threshold)
+        # Fuzzy match (80% similarity threshold, on the rounded score as
+        # thefuzz compared it - hence the 79.5 cutoff on rapidfuzz's float)
         if FUZZY_AVAILABLE and self.enable_fuzzy_matching:
             best_match = None
             best_score = 0
             
-            for machine in self.machine_whitelist:
-                machine_lower = machine.lower()
-                score = fuzz.ratio(normalized, machine_lower)
-                
-                if score > best_score and score >= 80:
-                    best_score = score
-                    best_match = machine
+            result = process.extractOne(normalized, self._machine_choices,
+                                        scorer=fuzz.ratio, score_cutoff=79.5)
+            if result:
+                _, best_score, position = result
+                best_match = self.machine_whitelist[position]
             
             if best_match:
                 logger.info("machine_normalized_fuzzy", 
@@ -499,17 +481,9 @@ class ENMSValidator:
         
         matches = []
         
-        # Number words to digits mapping for spoken input
-        number_words = {
-            'one': '1', 'two': '2', 'three': '3', 'four': '4', 'five': '5',
-            'six': '6', 'seven': '7', 'eight': '8', 'nine': '9', 'ten': '10',
-            'first': '1', 'second': '2', 'third': '3'
-        }
-        
         # Convert number words to digits (e.g., "compressor one" -> "compressor 1")
         machine_lower = machine_name.lower()
-        for word, digit in number_words.items():
-            machine_lower = re.sub(rf'\b{word}\b', digit, machine_lower)
+        machine_lower = _digits_for_number_words(machine_lower)
         
         # Normalize: lowercase, replace spaces/underscores with hyphens
         machine_lower = machine_lower.replace(" ", "-").replace("_", "-")
@@ -561,7 +535,7 @@ class ENMSValidator:
     
     def _fuzzy_match(self, s1: str, s2: str, threshold: int = 80) -> bool:
         """
-        Enhanced fuzzy string matching using thefuzz library
+        Enhanced fuzzy string matching using rapidfuzz
         
         Args:
             s1: First string to compare
@@ -572,8 +546,9 @@ class ENMSValidator:
             True if strings are similar enough
         """
         if FUZZY_AVAILABLE:
-            # Use thefuzz for advanced fuzzy matching
-            similarity = fuzz.ratio(s1.lower(), s2.lower())
+            # Use rapidfuzz for advanced fuzzy matching
+            # Rounded like thefuzz's integer scores, so the threshold is unchanged
+            similarity = round(fuzz.ratio(s1.lower(), s2.lower()))
             logger.debug("fuzzy_match", s1=s1, s2=s2, similarity=similarity, threshold=threshold)
             return similarity >= threshold
         else:
@@ -704,10 +679,32 @@ class ENMSValidator:
         
         return None
     
-    def update_machine_whitelist(self, machines: List[str]):
-        """Update machine whitelist from EnMS API"""
-        self.machine_whitelist = machines
-        logger.info("whitelist_updated", count=len(machines))
+    def update_machine_whitelist(self, machines: Iterable[str], log: bool = True):
+        """Update machine whitelist from EnMS API
+        
+        Also rebuilds the normalized-name index used for exact matches, so
+        lookups don't re-normalize every whitelist entry per query.
+        """
+        self.machine_whitelist = list(machines)
+        self.machine_set = frozenset(self.machine_whitelist)
+        index = {}
+        variants = {}
+        for position, machine in enumerate(self.machine_whitelist):
+            # First entry wins, matching the previous linear-scan order
+            machine_lower = machine.lower()
+            index.setdefault(machine_lower.replace(" ", "-").replace("_", "-"), machine)
+            # Spoken/typed spellings: "hvac main", "hvacmain", ...
+            for variant in (machine_lower,
+                            machine_lower.replace("-", " "),
+                            machine_lower.replace("-", ""),
+                            machine_lower.replace(" ", "")):
+                variants.setdefault(variant, (position, machine))
+        self._whitelist_index = index
+        self._whitelist_variants = variants
+        # Lowercased choices for rapidfuzz, aligned with machine_whitelist
+        self._machine_choices = [m.lower() for m in self.machine_whitelist]
+        if log:
+            logger.info("whitelist_updated", count=len(self.machine_whitelist))
     
     def _extract_intent_params(self, llm_output: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
@@ -48,13 +48,8 @@ class OVOSMessageBusGUI:
         self.bus = MessageBusClient()
         self.bus.run_in_thread()
         
-        # Wait for connection
-        for i in range(10):
-            if self.bus.started_running:
-                break
-            time.sleep(0.5)
-        
-        if not self.bus.started_running:
+        # Wait for the websocket to open (returns as soon as it does)
+        if not self.bus.connected_event.wait(timeout=5.0):
             raise RuntimeError("Failed to connect to OVOS message bus")
         
         print("  [2/2] Message bus connected!")
@@ -10,12 +10,14 @@ Tests the async HTTP client with 30+ test cases
 - Test error responses
 - Test async behavior
 """
+import asyncio
 import pytest
 from datetime import datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock
 import httpx
+from tenacity import RetryError, wait_none
 
-from lib.api_client import ENMSClient, ENMSClientContext
+from lib.api_client import ENMSClient, ENMSClientContext, CircuitOpenError
 
 
 # ============================================================================
@@ -454,6 +456,120 @@ class TestErrorHandling:
         await client.close()
 
 
+# ============================================================================
+# CIRCUIT BREAKER TESTS (4 cases)
+# ============================================================================
+
+class TestCircuitBreaker:
+    """Test fail-fast behaviour while EnMS is unreachable"""
+    
+    @pytest.mark.asyncio
+    async def test_opens_after_failures(self):
+        """Test breaker opens after retries fail and then skips the network"""
+        calls = []
+        
+        def handler(request):
+            calls.append(request)
+            raise httpx.ConnectError("connection refused", request=request)
+        
+        client = ENMSClient(base_url="http://enms.test", breaker_failure_threshold=3)
+        client.client = httpx.AsyncClient(base_url="http://enms.test",
+                                          transport=httpx.MockTransport(handler))
+        request = client._request.retry_with(wait=wait_none())
+        
+        with pytest.raises(RetryError):
+            await request(client, "GET", "/health")
+        
+        assert client.breaker_open
+        with pytest.raises(CircuitOpenError):
+            await client._request("GET", "/health")
+        assert len(calls) == 3
+        
+        await client.close()
+    
+    @pytest.mark.asyncio
+    async def test_half_open_after_reset(self):
+        """Test breaker stays open for the reset window, then closes on a good probe"""
+        calls = []
+        
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(200, stream=httpx.ByteStream(b'{"status": "healthy"}'))
+        
+        client = ENMSClient(base_url="http://enms.test",
+                            breaker_failure_threshold=1, breaker_reset_seconds=0.05)
+        client.client = httpx.AsyncClient(base_url="http://enms.test",
+                                          transport=httpx.MockTransport(handler))
+        
+        client._record_failure()
+        assert client.breaker_open
+        with pytest.raises(CircuitOpenError):
+            await client._request("GET", "/health")
+        assert calls == []
+        
+        await asyncio.sleep(0.06)
+        assert not client.breaker_open
+        assert await client._request("GET", "/health") == {"status": "healthy"}
+        assert len(calls) == 1
+        assert client._opened_at is None
+        assert client._consecutive_failures == 0
+        
+        await client.close()
+    
+    @pytest.mark.asyncio
+    async def test_half_open_allows_single_probe(self):
+        """Test concurrent requests while half-open send only one probe"""
+        calls = []
+        
+        async def handler(request):
+            calls.append(request)
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, stream=httpx.ByteStream(b'{"status": "healthy"}'))
+        
+        client = ENMSClient(base_url="http://enms.test",
+                            breaker_failure_threshold=1, breaker_reset_seconds=0.05)
+        client.client = httpx.AsyncClient(base_url="http://enms.test",
+                                          transport=httpx.MockTransport(handler))
+        
+        client._record_failure()
+        await asyncio.sleep(0.06)
+        results = await asyncio.gather(
+            *(client._request("GET", "/health") for _ in range(3)),
+            return_exceptions=True
+        )
+        
+        assert len(calls) == 1
+        assert sum(isinstance(r, CircuitOpenError) for r in results) == 2
+        assert {"status": "healthy"} in results
+        # Probe succeeded - the circuit is closed again
+        assert await client._request("GET", "/health") == {"status": "healthy"}
+        assert len(calls) == 2
+        
+        await client.close()
+    
+    @pytest.mark.asyncio
+    async def test_failed_probe_reopens(self):
+        """Test a failed probe re-opens the circuit for another reset window"""
+        def handler(request):
+            raise httpx.ConnectError("connection refused", request=request)
+        
+        client = ENMSClient(base_url="http://enms.test",
+                            breaker_failure_threshold=1, breaker_reset_seconds=0.05)
+        client.client = httpx.AsyncClient(base_url="http://enms.test",
+                                          transport=httpx.MockTransport(handler))
+        request = client._request.retry_with(wait=wait_none())
+        
+        client._record_failure()
+        await asyncio.sleep(0.06)
+        with pytest.raises((RetryError, httpx.ConnectError, CircuitOpenError)):
+            await request(client, "GET", "/health")
+        
+        assert client.breaker_open
+        assert not client._probe_in_flight
+        
+        await client.close()
+
+
 # ============================================================================
 # CLIENT LIFECYCLE TESTS (3 cases)
 # ============================================================================
@@ -0,0 +1,58 @@
+"""
+Headless bridge /query/voice/stream transport tests
+Verify the audio stream is not held back by gzip compression
+"""
+import importlib.machinery
+import importlib.util
+import os
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("fastapi")
+from fastapi.testclient import TestClient
+
+BRIDGE_PATH = Path(__file__).parent.parent / "bridge" / "ovos_headless_bridge.py.phase6_fixes"
+AUDIO_CHUNKS = [os.urandom(4096) for _ in range(3)]
+
+
+class FakeSkillEngine:
+    async def process_query(self, text, session_id):
+        return {"success": True, "response": "Boiler-1 is using 42 kilowatts", "intent": "power_query"}
+
+
+class FakeTTSEngine:
+    available = True
+    # Newer Starlette skips audio/* by itself; a neutral type checks the route's opt-out
+    media_type = "application/octet-stream"
+
+    async def stream(self, text):
+        for chunk in AUDIO_CHUNKS:
+            yield chunk
+
+
+@pytest.fixture
+def bridge():
+    loader = importlib.machinery.SourceFileLoader("ovos_headless_bridge", str(BRIDGE_PATH))
+    spec = importlib.util.spec_from_loader(loader.name, loader)
+    module = importlib.util.module_from_spec(spec)
+    loader.exec_module(module)
+    module.TTS_ENABLED = True
+    module.skill_engine = FakeSkillEngine()
+    module.tts_engine = FakeTTSEngine()
+    return module
+
+
+def test_voice_stream_skips_gzip(bridge):
+    """Audio chunks pass through unbuffered even when the client accepts gzip"""
+    client = TestClient(bridge.app)
+    with client.stream(
+        "POST", "/query/voice/stream",
+        json={"text": "power of Boiler-1"},
+        headers={"Accept-Encoding": "gzip"},
+    ) as response:
+        assert response.status_code == 200
+        assert response.headers.get("content-encoding") != "gzip"
+        # The test transport may coalesce chunks, but they must arrive as raw audio
+        first = next(response.iter_raw())
+        assert first.startswith(AUDIO_CHUNKS[0])
@@ -210,6 +210,41 @@ class TestComparisonPatterns:
         assert result['intent'] == 'comparison'
 
 
+class TestDynamicMachines:
+    """Test machine whitelist hot-swap"""
+    
+    def test_new_machine_matches_after_update(self):
+        """Machines discovered at runtime should match machine patterns"""
+        router = HeuristicRouter()
+        assert router.route("Press-7 power") is None
+        
+        router.update_machines(HeuristicRouter.MACHINES + ["Press-7"])
+        result = router.route("Press-7 power")
+        
+        assert result is not None
+        assert result['intent'] == 'power_query'
+        assert result['machine'] == 'Press-7'
+    
+    def test_second_update_recompiles(self):
+        """A later whitelist change must replace the previous update's patterns"""
+        router = HeuristicRouter()
+        router.update_machines(["Boiler-1", "Compressor-1", "Press-77"])
+        router.update_machines(["Boiler-1", "Compressor-1", "Press-77", "Kiln-9"])
+        
+        result = router.route("Kiln-9 power")
+        assert result is not None
+        assert result['machine'] == 'Kiln-9'
+        assert router.route("Press-77 power")['machine'] == 'Press-77'
+    
+    def test_update_does_not_leak_to_class(self):
+        """Updating one router must not change other instances"""
+        router = HeuristicRouter()
+        router.update_machines(["Press-7"])
+        
+        assert "Press-7" not in HeuristicRouter.MACHINES
+        assert HeuristicRouter().route("Boiler-1 power")['machine'] == 'Boiler-1'
+
+
 class TestPerformance:
     """Test heuristic router performance (<5ms target)"""
     